@@ -1,6 +1,19 @@
+import os
+import sys
+
 import pandas as pd
 
-# Recriando o DataFrame com os dados consolidados (2017-2023)
+# Armazém e esquemas ficam no pacote observatorio (dados-py)
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(RAIZ, "dados-py"))
+
+from observatorio.armazem import Armazem
+from observatorio.conjuntos.enem import CONJUNTO_ENEM
+
+# Recriando o DataFrame com os dados consolidados (2017-2023).
+# Para recalcular a partir dos microdados do INEP (sem digitar nada):
+#   cd dados-py && python -m observatorio.microdados_enem MICRODADOS_ENEM_<ano>.zip [...] \
+#       --excel ../Dados_ENEM_SJM_2017_2023.xlsx
 data = []
 
 # --- DADOS: GÊNERO ---
@@ -44,16 +57,10 @@ for row in admin_data:
 
 df = pd.DataFrame(data, columns=['Ano', 'Categoria', 'Segmento', 'Matemática', 'Linguagens', 'Ciências Humanas', 'Ciências Sociais'])
 
-# Salvando
-file_path = 'Dados_ENEM_SJM_2017_2023.xlsx'
-df.to_excel(file_path, index=False)
-
-file_path
-
-# ... (todo o código de criação do dataframe acima) ...
-
-# Caminho completo (use 'r' antes das aspas para o Windows reconhecer as barras invertidas)
-caminho_final = r"C:\Users\user\Desktop\Observatório de Dados\dados-criados\Dados_ENEM_SJM_2017_2023.xlsx"
+# Salvando: no armazém (partições por ano) e uma única exportação para Excel
+armazem = Armazem()
+armazem.gravar(CONJUNTO_ENEM, df)
 
-# Salvar
-df.to_excel(caminho_final, index=False)
\ No newline at end of file
+file_path = os.path.join(RAIZ, 'Dados_ENEM_SJM_2017_2023.xlsx')
+armazem.exportar_excel([CONJUNTO_ENEM], file_path)
+print(f"✅ Arquivo salvo em: {file_path}")
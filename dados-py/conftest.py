@@ -0,0 +1,2 @@
+# Pasta dados-py no sys.path: os testes importam o pacote observatorio
+# rodando o pytest daqui ou da raiz do repositório.
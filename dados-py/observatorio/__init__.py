@@ -0,0 +1,9 @@
+"""
+Código compartilhado pelos scripts de coleta do Observatório de Dados (dados-py).
+
+Os scripts convert-qedu-*.py rodam a partir da pasta dados-py, então este
+pacote é importado diretamente como `observatorio`.
+
+Ponto de entrada único: `python -m observatorio [trabalho ...]` (trabalhos
+definidos em observatorio/conjuntos).
+"""
@@ -0,0 +1,9 @@
+"""
+python -m observatorio [trabalho ...] [opções]
+
+Roda os trabalhos de coleta pedidos (padrão: todos) numa única sessão de
+navegador. `python -m observatorio --listar` mostra os disponíveis.
+"""
+from observatorio.executor import main
+
+main()
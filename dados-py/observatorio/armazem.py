@@ -0,0 +1,258 @@
+"""
+Armazém dos conjuntos de dados: Parquet particionado por conjunto e ano.
+
+    armazem/<conjunto>/ano=<ano>/dados.parquet
+
+Cada conjunto tem um esquema tipado (`Conjunto`): colunas e tipos, a chave
+que identifica uma linha e a coluna do ano. Na memória, os anos são
+inteiros, as medidas são números com nulo (Int64/Float64) e as dimensões
+("categoria": etapa, disciplina, filtro, nível...) são Categorical, um
+código por linha em vez de uma string; no Parquet elas continuam texto.
+Gravar um DataFrame:
+
+  - "upsert" (padrão): linhas com a mesma chave substituem as guardadas;
+  - "append": acrescenta sem olhar a chave;
+  - "substituir": a partição passa a ter só as linhas novas.
+
+Só as partições dos anos presentes no DataFrame são tocadas, e uma partição
+cujo conteúdo não mudou não é regravada: uma coleta incremental reescreve
+só o que mudou. A gravação é atômica (arquivo temporário + rename).
+
+O Excel deixou de ser a saída das coletas e virou uma exportação, feita a
+partir do armazém quando alguém pede (--excel nas coletas ou o comando
+`exportar` abaixo).
+
+Uso:
+    python -m observatorio.armazem listar
+    python -m observatorio.armazem exportar TRABALHO_OU_CONJUNTO [--destino ARQUIVO.xlsx]
+    python -m observatorio.armazem importar CONJUNTO ARQUIVO.xlsx [--aba NOME]
+"""
+import argparse
+import glob
+import os
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "armazem")
+ARQUIVO_PARTICAO = "dados.parquet"
+
+# Tipo declarado no esquema -> (tipo Arrow, dtype pandas com suporte a nulos)
+TIPOS = {
+    "inteiro": (pa.int64(), "Int64"),
+    "decimal": (pa.float64(), "Float64"),
+    "texto": (pa.string(), "string"),
+    "categoria": (pa.string(), "category"),
+}
+_DTYPE_DO_ARROW = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.float64(): pd.Float64Dtype(),
+    pa.string(): pd.StringDtype(),
+}
+
+
+@dataclass(frozen=True)
+class Conjunto:
+    nome: str
+    colunas: tuple                   # ((coluna, tipo em TIPOS), ...) na ordem da planilha
+    chave: tuple                     # colunas que identificam uma linha (upsert)
+    coluna_ano: str
+    aba: str = "Sheet1"              # aba na exportação para Excel
+    ordenar: Optional[Callable] = None  # df -> df, aplicado só na exportação
+
+    @property
+    def esquema(self):
+        return pa.schema([(coluna, TIPOS[tipo][0]) for coluna, tipo in self.colunas])
+
+
+def tipar(df, conjunto):
+    """ DataFrame nas colunas e tipos do esquema (texto numérico vira número) """
+    nomes = [coluna for coluna, _ in conjunto.colunas]
+    sobrando = set(df.columns) - set(nomes)
+    if sobrando:
+        raise ValueError(f"{conjunto.nome}: colunas fora do esquema: {', '.join(sorted(sobrando))}")
+
+    tipado = pd.DataFrame(index=df.index)
+    for coluna, tipo in conjunto.colunas:
+        valores = df[coluna] if coluna in df.columns else pd.Series(pd.NA, index=df.index)
+        if tipo == "texto":
+            tipado[coluna] = valores.astype("string")
+        elif tipo == "categoria":
+            tipado[coluna] = valores.astype("string").astype("category")
+        else:
+            if valores.dtype == object or pd.api.types.is_string_dtype(valores):
+                # "45,3" (vírgula decimal) e marcadores como "N/D" viram número / nulo
+                valores = valores.astype("string").str.replace(",", ".", regex=False)
+            numeros = pd.to_numeric(valores, errors="coerce")
+            if tipo == "inteiro":
+                numeros = numeros.round()
+            tipado[coluna] = numeros.astype(TIPOS[tipo][1])
+    return tipado.reset_index(drop=True)
+
+
+def categorizar(df, conjunto):
+    """
+    Colunas "categoria" como Categorical. As categorias saem em ordem
+    alfabética dos valores, então duas leituras dos mesmos dados comparam iguais.
+    """
+    for coluna, tipo in conjunto.colunas:
+        if tipo == "categoria":
+            df[coluna] = df[coluna].astype("string").astype("category")
+    return df
+
+
+def em_ordem(serie, ordem):
+    """
+    Dimensão como Categorical ordenado na `ordem` dada (valores fora dela vão
+    para o fim, em ordem alfabética): ordenar por ela dispensa colunas de rank.
+    """
+    valores = serie.astype("string")
+    extras = sorted(set(valores.dropna()) - set(ordem))
+    return valores.astype(pd.CategoricalDtype(list(ordem) + extras, ordered=True))
+
+
+class Armazem:
+    """ Leitura e gravação dos conjuntos particionados por ano """
+
+    def __init__(self, pasta=PASTA_PADRAO):
+        self.pasta = pasta
+
+    def caminho(self, conjunto, ano):
+        return os.path.join(self.pasta, conjunto.nome, f"ano={ano}", ARQUIVO_PARTICAO)
+
+    def anos(self, conjunto):
+        """ Anos com partição gravada, em ordem crescente """
+        padrao = os.path.join(self.pasta, conjunto.nome, "ano=*", ARQUIVO_PARTICAO)
+        return sorted(int(os.path.basename(os.path.dirname(c)).split("=", 1)[1]) for c in glob.glob(padrao))
+
+    def _ler_particao(self, conjunto, ano):
+        caminho = self.caminho(conjunto, ano)
+        if not os.path.exists(caminho):
+            return None
+        tabela = pq.read_table(caminho, schema=conjunto.esquema)
+        return categorizar(tabela.to_pandas(types_mapper=_DTYPE_DO_ARROW.get), conjunto)
+
+    def ler(self, conjunto, anos=None):
+        """ Conjunto inteiro (ou só os anos pedidos) como DataFrame tipado """
+        anos = self.anos(conjunto) if anos is None else anos
+        caminhos = [self.caminho(conjunto, ano) for ano in anos if os.path.exists(self.caminho(conjunto, ano))]
+        if not caminhos:
+            return tipar(pd.DataFrame(columns=[coluna for coluna, _ in conjunto.colunas]), conjunto)
+        tabela = pa.concat_tables(pq.read_table(c, schema=conjunto.esquema) for c in caminhos)
+        return categorizar(tabela.to_pandas(types_mapper=_DTYPE_DO_ARROW.get), conjunto)
+
+    def _gravar_particao(self, conjunto, ano, df):
+        caminho = self.caminho(conjunto, ano)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        tabela = pa.Table.from_pandas(df, schema=conjunto.esquema, preserve_index=False)
+        pq.write_table(tabela, temporario, compression="zstd")
+        os.replace(temporario, caminho)
+
+    def gravar(self, conjunto, df, modo="upsert"):
+        """
+        Grava as linhas nas partições dos seus anos.
+        Devolve {ano: "nova" | "atualizada" | "igual"}.
+        """
+        if modo not in ("upsert", "append", "substituir"):
+            raise ValueError(f"Modo de gravação desconhecido: {modo}")
+        novo = tipar(df, conjunto)
+        sem_ano = novo[conjunto.coluna_ano].isna()
+        if sem_ano.any():
+            print(f"   ⚠️ {conjunto.nome}: {int(sem_ano.sum())} linhas sem {conjunto.coluna_ano} ignoradas.")
+            novo = novo[~sem_ano]
+
+        situacao = {}
+        for ano, linhas in novo.groupby(conjunto.coluna_ano, sort=True):
+            ano = int(ano)
+            guardado = self._ler_particao(conjunto, ano)
+            if guardado is None or modo == "substituir":
+                particao = linhas
+            elif modo == "append":
+                particao = pd.concat([guardado, linhas], ignore_index=True)
+            else:
+                particao = pd.concat([guardado, linhas], ignore_index=True).drop_duplicates(
+                    subset=list(conjunto.chave), keep="last"
+                )
+            # concat de Categoricals com categorias diferentes vira object: recategoriza
+            particao = categorizar(particao.reset_index(drop=True), conjunto)
+
+            if guardado is not None and particao.equals(guardado):
+                situacao[ano] = "igual"
+                continue
+            self._gravar_particao(conjunto, ano, particao)
+            situacao[ano] = "nova" if guardado is None else "atualizada"
+        return situacao
+
+    def exportar_excel(self, conjuntos, arquivo):
+        """ Uma aba por conjunto, com tudo que está no armazém. False se não houver dados """
+        tabelas = [(conjunto, self.ler(conjunto)) for conjunto in conjuntos]
+        tabelas = [(conjunto, df) for conjunto, df in tabelas if not df.empty]
+        if not tabelas:
+            return False
+        with pd.ExcelWriter(arquivo, engine="openpyxl") as writer:
+            for conjunto, df in tabelas:
+                if conjunto.ordenar is not None:
+                    df = conjunto.ordenar(df)
+                df.to_excel(writer, sheet_name=conjunto.aba, index=False)
+        return True
+
+
+def resumo_gravacao(conjunto, situacao):
+    """ Linha de log de uma gravação """
+    contagem = {estado: sum(1 for s in situacao.values() if s == estado) for estado in ("nova", "atualizada", "igual")}
+    return (f"🗄️ {conjunto.nome}: {contagem['nova']} partições novas, {contagem['atualizada']} atualizadas, "
+            f"{contagem['igual']} sem mudança")
+
+
+def main():
+    from observatorio.conjuntos import CONJUNTOS, TRABALHOS
+    from observatorio.trabalhos import caminho_saida
+
+    parser = argparse.ArgumentParser(description="Armazém Parquet dos conjuntos de dados do Observatório.")
+    parser.add_argument("--pasta", default=PASTA_PADRAO, help="Pasta do armazém")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    sub.add_parser("listar", help="Mostra os conjuntos e os anos guardados")
+
+    p_exportar = sub.add_parser("exportar", help="Gera o Excel de um trabalho ou conjunto")
+    p_exportar.add_argument("nome", choices=sorted(set(TRABALHOS) | set(CONJUNTOS)))
+    p_exportar.add_argument("--destino", help="Arquivo .xlsx (padrão: o arquivo do trabalho em dados-py)")
+
+    p_importar = sub.add_parser("importar", help="Carrega uma planilha existente no armazém")
+    p_importar.add_argument("conjunto", choices=sorted(CONJUNTOS))
+    p_importar.add_argument("arquivo")
+    p_importar.add_argument("--aba", help="Aba da planilha (padrão: a do conjunto)")
+
+    args = parser.parse_args()
+    armazem = Armazem(args.pasta)
+
+    if args.comando == "listar":
+        for nome, conjunto in sorted(CONJUNTOS.items()):
+            anos = armazem.anos(conjunto)
+            faixa = f"{anos[0]}–{anos[-1]} ({len(anos)} anos)" if anos else "vazio"
+            print(f"   {nome:30s} {faixa}")
+
+    elif args.comando == "exportar":
+        if args.nome in TRABALHOS:
+            trabalho = TRABALHOS[args.nome]
+            conjuntos, destino = trabalho.conjuntos, args.destino or caminho_saida(trabalho.arquivo_saida)
+        else:
+            conjuntos, destino = [CONJUNTOS[args.nome]], args.destino or caminho_saida(f"{args.nome}.xlsx")
+        if armazem.exportar_excel(conjuntos, destino):
+            print(f"✅ Arquivo salvo em: {destino}")
+        else:
+            print("❌ Nada guardado no armazém para exportar.")
+
+    else:
+        conjunto = CONJUNTOS[args.conjunto]
+        aba = args.aba or conjunto.aba
+        df = pd.read_excel(args.arquivo, sheet_name=aba)
+        print(resumo_gravacao(conjunto, armazem.gravar(conjunto, df)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+Benchmark dos extratores sobre um corpus de telas gravadas do QEdu (offline).
+
+    benchmark/
+        corpus/corpus.json           <- uma entrada por tela: trabalhos, célula, filtros, arquivo, origem
+        corpus/<tela>/<hash>.html.gz <- a captura (page_source)
+        ouro.json                    <- resultado esperado de cada trabalho em cada célula
+        resultados/<data>-<commit>.json
+
+  1. `gravar`: monta o corpus a partir da cache de telas (as capturas de
+     todas as células de todas as grades que estiverem lá: cada ano, etapa,
+     disciplina e filtro) e mostra o que falta para cobrir as grades;
+  2. `ouro`: grava os resultados atuais como registros de referência
+     (conferir à mão antes de versionar);
+  3. `medir`: para cada trabalho mede extrações/s, leitura do HTML
+     (parse, com o backend em uso) em páginas/s, memória de pico e acertos
+     contra o ouro; grava o resultado e compara com a medição anterior.
+     Sai com código 1 se algum trabalho ficou mais lento que a tolerância
+     ou passou a errar, para acusar a regressão entre versões.
+
+Com `medir --navegador`, o caminho ao vivo também é medido: cada tela do
+corpus é aberta num Chrome headless (file://) e cada trabalho roda
+`extrair_ao_vivo` sobre ela, como no executor (os cards do Censo pelo
+JS_LER_CARDS e o texto do #main; nos outros trabalhos, extrair_html sobre o
+page_source). Os acertos são conferidos contra o mesmo ouro, então uma
+divergência entre o script da página e a leitura do HTML aparece aqui. Sem
+Chrome, o caminho ao vivo fica de fora com um aviso.
+
+O corpus versionado em benchmark/ cobre todas as células das duas grades
+do QEdu (ano, etapa, disciplina e filtro) com HTML montado no layout que os
+extratores leem (origem "sintetico"), e não capturado do site: a vazão e os
+acertos medidos nele não valem como números do QEdu real, e o relatório e o
+resultado gravado dizem isso. `gravar` seguido de `ouro` o troca por
+capturas reais (origem "captura").
+
+Nada acessa a rede: só o corpus e os extratores de cada trabalho.
+
+Uso:
+    python -m observatorio.benchmark gravar [--pasta-cache PASTA]
+    python -m observatorio.benchmark ouro
+    python -m observatorio.benchmark medir [--repeticoes 5] [--tolerancia 0.15] [--contra ARQUIVO] [--navegador]
+"""
+import argparse
+import contextlib
+import glob
+import gzip
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from observatorio.cache_telas import PASTA_PADRAO as PASTA_CACHE
+from observatorio.cache_telas import CacheTelas
+from observatorio.parsers import extrair_texto, parser_padrao
+
+PASTA_BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmark")
+TOLERANCIA_PADRAO = 0.15   # 15% mais lento já conta como regressão
+
+
+def _pastas(pasta):
+    return os.path.join(pasta, "corpus"), os.path.join(pasta, "ouro.json"), os.path.join(pasta, "resultados")
+
+
+def chave_celula(celula):
+    return json.dumps(list(celula), ensure_ascii=False)
+
+
+def normalizar(resultado):
+    """ Resultado em JSON canônico (para comparar com o ouro) """
+    return json.loads(json.dumps(resultado, ensure_ascii=False, sort_keys=True, default=str))
+
+
+@contextlib.contextmanager
+def _silencioso():
+    """ Cala os prints dos extratores (não entram na medição nem poluem o relatório) """
+    with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+        yield
+
+
+def _gravar_json(caminho, dados):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+# --- CORPUS ---
+
+def gravar_corpus(trabalhos, pasta_cache=PASTA_CACHE, pasta=PASTA_BENCHMARK):
+    """ Copia da cache de telas as capturas de todas as células das grades """
+    from observatorio.executor import agrupar_por_tela
+
+    pasta_corpus, _, _ = _pastas(pasta)
+    cache = CacheTelas(pasta_cache)
+    entradas, cobertura = [], {}
+    try:
+        for tela, do_grupo in agrupar_por_tela(trabalhos):
+            grade = tela.montar_grade()
+            achadas = 0
+            for celula in grade:
+                conteudo = cache.obter(tela.url_base, tela.filtros_da_celula(celula), ignorar_ttl=True)
+                if conteudo is None:
+                    continue
+                dados = conteudo.encode("utf-8")
+                nome_tela = tela.nome.lower().replace(" ", "_")
+                arquivo = os.path.join(nome_tela, hashlib.sha256(dados).hexdigest()[:16] + ".html.gz")
+                caminho = os.path.join(pasta_corpus, arquivo)
+                if not os.path.exists(caminho):
+                    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+                    with gzip.open(caminho, "wb") as f:
+                        f.write(dados)
+                entradas.append({
+                    "tela": tela.nome,
+                    "trabalhos": [t.nome for t in do_grupo],
+                    "celula": list(celula),
+                    "filtros": tela.filtros_da_celula(celula),
+                    "arquivo": arquivo,
+                    "origem": "captura",
+                })
+                achadas += 1
+            cobertura[tela.nome] = (achadas, len(grade))
+    finally:
+        cache.fechar()
+    _gravar_json(os.path.join(pasta_corpus, "corpus.json"), entradas)
+    return entradas, cobertura
+
+
+def carregar_corpus(pasta=PASTA_BENCHMARK):
+    """ [(entrada, html), ...] """
+    pasta_corpus, _, _ = _pastas(pasta)
+    caminho = os.path.join(pasta_corpus, "corpus.json")
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        entradas = json.load(f)
+    corpus = []
+    for entrada in entradas:
+        with gzip.open(os.path.join(pasta_corpus, entrada["arquivo"]), "rb") as f:
+            corpus.append((entrada, f.read().decode("utf-8")))
+    return corpus
+
+
+def telas_sinteticas(corpus):
+    """ Quantas telas do corpus foram montadas à mão (e não capturadas do site) """
+    return sum(1 for entrada, _ in corpus if entrada.get("origem") == "sintetico")
+
+
+def paginas_do_trabalho(corpus, nome):
+    """ [(célula, html), ...] do trabalho """
+    return [(tuple(e["celula"]), html) for e, html in corpus if nome in e["trabalhos"]]
+
+
+# --- OURO ---
+
+def gravar_ouro(trabalhos, corpus, pasta=PASTA_BENCHMARK):
+    """ Resultado atual de cada trabalho em cada célula do corpus """
+    with _silencioso():
+        ouro = {
+            trabalho.nome: {
+                chave_celula(celula): normalizar(trabalho.extrair_html(html, celula))
+                for celula, html in paginas_do_trabalho(corpus, trabalho.nome)
+            }
+            for trabalho in trabalhos
+        }
+    _gravar_json(_pastas(pasta)[1], ouro)
+    return ouro
+
+
+def carregar_ouro(pasta=PASTA_BENCHMARK):
+    caminho = _pastas(pasta)[1]
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# --- MEDIÇÃO ---
+
+def _vazao(funcao, paginas, repeticoes):
+    """ Mediana de itens/s em `repeticoes` passadas sobre as páginas """
+    vazoes = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for celula, html in paginas:
+            funcao(html, celula)
+        duracao = time.perf_counter() - inicio
+        if duracao:
+            vazoes.append(len(paginas) / duracao)
+    return round(statistics.median(vazoes), 1) if vazoes else None
+
+
+def medir_trabalho(trabalho, paginas, ouro, repeticoes=5):
+    """ Vazão, memória de pico e acertos de um trabalho no corpus """
+    # Acertos (e aquecimento: imports e regex compiladas ficam fora da medição)
+    divergencias = []
+    for celula, html in paginas:
+        chave = chave_celula(celula)
+        obtido = normalizar(trabalho.extrair_html(html, celula))
+        if chave in ouro and obtido != ouro[chave]:
+            divergencias.append(chave)
+    conferidas = sum(1 for celula, _ in paginas if chave_celula(celula) in ouro)
+
+    tracemalloc.start()
+    for celula, html in paginas:
+        trabalho.extrair_html(html, celula)
+    memoria_pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "paginas": len(paginas),
+        "extracoes_por_segundo": _vazao(trabalho.extrair_html, paginas, repeticoes),
+        "parse_paginas_por_segundo": _vazao(lambda html, _: extrair_texto(html), paginas, repeticoes),
+        "memoria_pico_kb": round(memoria_pico / 1024, 1),
+        "conferidas": conferidas,
+        "acertos": conferidas - len(divergencias),
+        "divergencias": divergencias[:20],
+    }
+
+
+def medir_navegador(trabalhos, corpus, ouro, repeticoes=3):
+    """
+    Vazão e acertos de `extrair_ao_vivo` com cada tela do corpus aberta num
+    Chrome headless. A carga da página fica fora da medição; a extração
+    repete `repeticoes` vezes sobre a mesma página e vale a mediana.
+    """
+    # Import local: o Selenium só é necessário neste modo
+    from observatorio.navegador import abrir_navegador
+
+    medidos = {trabalho.nome: {"duracoes": [], "divergencias": [], "conferidas": 0} for trabalho in trabalhos}
+    with tempfile.TemporaryDirectory() as pasta, abrir_navegador(headless=True) as driver:
+        for entrada, html in corpus:
+            da_tela = [trabalho for trabalho in trabalhos if trabalho.nome in entrada["trabalhos"]]
+            if not da_tela:
+                continue
+            caminho = os.path.join(pasta, os.path.basename(entrada["arquivo"]).replace(".gz", ""))
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(html)
+            driver.get(Path(caminho).as_uri())
+            # Uma captura para todos os trabalhos, como no executor
+            capturado = driver.page_source
+            celula = tuple(entrada["celula"])
+
+            for trabalho in da_tela:
+                duracoes = []
+                for _ in range(repeticoes):
+                    inicio = time.perf_counter()
+                    obtido = trabalho.extrair_ao_vivo(driver, capturado, celula)
+                    duracoes.append(time.perf_counter() - inicio)
+                medido = medidos[trabalho.nome]
+                medido["duracoes"].append(statistics.median(duracoes))
+                chave = chave_celula(celula)
+                referencia = ouro.get(trabalho.nome, {})
+                if chave in referencia:
+                    medido["conferidas"] += 1
+                    if normalizar(obtido) != referencia[chave]:
+                        medido["divergencias"].append(chave)
+
+    return {
+        nome: {
+            "ao_vivo_extracoes_por_segundo": round(len(medido["duracoes"]) / sum(medido["duracoes"]), 1)
+            if sum(medido["duracoes"]) else None,
+            "ao_vivo_conferidas": medido["conferidas"],
+            "ao_vivo_acertos": medido["conferidas"] - len(medido["divergencias"]),
+            "ao_vivo_divergencias": medido["divergencias"][:20],
+        }
+        for nome, medido in medidos.items()
+        if medido["duracoes"]
+    }
+
+
+def versao_codigo():
+    """ Commit atual (com * se houver alterações não commitadas) """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+        sujo = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+        return commit + ("*" if sujo else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "sem-git"
+
+
+def medir(trabalhos, corpus, ouro, repeticoes=5, navegador=False):
+    with _silencioso():
+        medicoes = {
+            trabalho.nome: medir_trabalho(trabalho, paginas, ouro.get(trabalho.nome, {}), repeticoes)
+            for trabalho in trabalhos
+            if (paginas := paginas_do_trabalho(corpus, trabalho.nome))
+        }
+    if navegador:
+        try:
+            with _silencioso():
+                ao_vivo = medir_navegador(trabalhos, corpus, ouro, repeticoes)
+        except Exception as e:
+            print(f"⚠️ Chrome indisponível ({type(e).__name__}): caminho ao vivo não medido.")
+        else:
+            for nome, medicao in ao_vivo.items():
+                medicoes[nome].update(medicao)
+    return {
+        "versao": versao_codigo(),
+        "em": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "parser": parser_padrao(),
+        "python": sys.version.split()[0],
+        "corpus": {"telas": len(corpus), "sinteticas": telas_sinteticas(corpus)},
+        "trabalhos": medicoes,
+    }
+
+
+def ultimo_resultado(pasta=PASTA_BENCHMARK):
+    arquivos = sorted(glob.glob(os.path.join(_pastas(pasta)[2], "*.json")))
+    return arquivos[-1] if arquivos else None
+
+
+def gravar_resultado(resultado, pasta=PASTA_BENCHMARK):
+    versao = resultado["versao"].replace("*", "-sujo")
+    caminho = os.path.join(_pastas(pasta)[2], f"{time.strftime('%Y%m%d-%H%M%S')}-{versao}.json")
+    _gravar_json(caminho, resultado)
+    return caminho
+
+
+def comparar(atual, anterior, tolerancia=TOLERANCIA_PADRAO):
+    """ Linhas do relatório e lista de regressões (vazão abaixo da tolerância ou menos acertos) """
+    linhas, regressoes = [], []
+    for nome, medicao in atual["trabalhos"].items():
+        antes = anterior["trabalhos"].get(nome) if anterior else None
+        for metrica in ("extracoes_por_segundo", "parse_paginas_por_segundo", "ao_vivo_extracoes_por_segundo"):
+            if metrica not in medicao:
+                continue
+            valor, referencia = medicao[metrica], (antes or {}).get(metrica)
+            if valor and referencia:
+                variacao = valor / referencia - 1
+                marca = "🐢" if variacao < -tolerancia else ("🚀" if variacao > tolerancia else "  ")
+                linhas.append(f"   {marca} {nome:22s} {metrica:26s} {referencia:>9} -> {valor:>9} ({variacao:+.0%})")
+                if variacao < -tolerancia:
+                    regressoes.append(f"{nome}: {metrica} {variacao:+.0%}")
+            else:
+                linhas.append(f"      {nome:22s} {metrica:26s} {'—' if valor is None else valor:>9}")
+        linhas.append(f"      {nome:22s} {'memoria_pico_kb':26s} {medicao['memoria_pico_kb']:>9}")
+        linhas.append(f"      {nome:22s} {'acertos':26s} {medicao['acertos']}/{medicao['conferidas']}")
+        if medicao["acertos"] < medicao["conferidas"]:
+            regressoes.append(f"{nome}: {medicao['conferidas'] - medicao['acertos']} células diferentes do ouro")
+        if "ao_vivo_acertos" in medicao:
+            linhas.append(f"      {nome:22s} {'ao_vivo_acertos':26s} "
+                          f"{medicao['ao_vivo_acertos']}/{medicao['ao_vivo_conferidas']}")
+            if medicao["ao_vivo_acertos"] < medicao["ao_vivo_conferidas"]:
+                regressoes.append(f"{nome}: {medicao['ao_vivo_conferidas'] - medicao['ao_vivo_acertos']} "
+                                  f"células ao vivo diferentes do ouro")
+    return linhas, regressoes
+
+
+def main():
+    from observatorio.conjuntos import TRABALHOS
+
+    parser = argparse.ArgumentParser(description="Benchmark offline dos extratores sobre telas gravadas do QEdu.")
+    parser.add_argument("--pasta", default=PASTA_BENCHMARK, help="Pasta do benchmark (corpus, ouro, resultados)")
+    parser.add_argument("--trabalhos", nargs="+", choices=sorted(TRABALHOS), help="Padrão: todos")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_gravar = sub.add_parser("gravar", help="Monta o corpus a partir da cache de telas")
+    p_gravar.add_argument("--pasta-cache", default=PASTA_CACHE)
+
+    sub.add_parser("ouro", help="Grava os resultados atuais como referência")
+
+    p_medir = sub.add_parser("medir", help="Mede e compara com a medição anterior")
+    p_medir.add_argument("--repeticoes", type=int, default=5)
+    p_medir.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                         help="Queda de vazão tolerada antes de acusar regressão (0.15 = 15%%)")
+    p_medir.add_argument("--contra", help="Resultado a comparar (padrão: o último gravado)")
+    p_medir.add_argument("--sem-gravar", action="store_true", help="Só mede e compara, sem gravar o resultado")
+    p_medir.add_argument("--navegador", action="store_true",
+                         help="Mede também o caminho ao vivo (extrair_ao_vivo num Chrome headless)")
+
+    args = parser.parse_args()
+    trabalhos = [TRABALHOS[nome] for nome in (args.trabalhos or TRABALHOS)]
+
+    if args.comando == "gravar":
+        entradas, cobertura = gravar_corpus(trabalhos, args.pasta_cache, args.pasta)
+        for tela, (achadas, total) in cobertura.items():
+            marca = "✅" if achadas == total else "⚠️"
+            print(f"   {marca} {tela}: {achadas}/{total} células da grade no corpus")
+        print(f"💾 Corpus com {len(entradas)} telas em {_pastas(args.pasta)[0]}")
+        return
+
+    corpus = carregar_corpus(args.pasta)
+    if not corpus:
+        print(f"❌ Corpus vazio em {_pastas(args.pasta)[0]}. Rode `gravar` depois de uma coleta.")
+        sys.exit(1)
+
+    if args.comando == "ouro":
+        ouro = gravar_ouro(trabalhos, corpus, args.pasta)
+        for nome, registros in ouro.items():
+            print(f"   🥇 {nome}: {len(registros)} registros")
+        print(f"💾 Ouro em {_pastas(args.pasta)[1]} (confira antes de versionar)")
+        return
+
+    anterior_caminho = args.contra or ultimo_resultado(args.pasta)
+    anterior = None
+    if anterior_caminho:
+        with open(anterior_caminho, encoding="utf-8") as f:
+            anterior = json.load(f)
+
+    sinteticas = telas_sinteticas(corpus)
+    print(f"⏱️ Medindo {len(corpus)} telas ({args.repeticoes} repetições, parser {parser_padrao()})...")
+    if sinteticas:
+        print(f"⚠️ Corpus sintético: {sinteticas}/{len(corpus)} telas montadas à mão, não capturadas do site. "
+              f"Os números abaixo não valem pelo QEdu real.")
+    resultado = medir(trabalhos, corpus, carregar_ouro(args.pasta), args.repeticoes, args.navegador)
+    linhas, regressoes = comparar(resultado, anterior, args.tolerancia)
+    if anterior:
+        print(f"   comparando com {anterior['versao']} ({anterior['em']})")
+    print("\n".join(linhas))
+    if sinteticas:
+        print(f"⚠️ Resultado medido em corpus sintético ({sinteticas}/{len(corpus)} telas).")
+    if not args.sem_gravar:
+        print(f"💾 Resultado em {gravar_resultado(resultado, args.pasta)}")
+
+    if regressoes:
+        print("❌ Regressões:\n   " + "\n   ".join(regressoes))
+        sys.exit(1)
+    print("✅ Sem regressões.")
+
+
+if __name__ == "__main__":
+    main()
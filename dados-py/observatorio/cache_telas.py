@@ -0,0 +1,147 @@
+"""
+Cache de telas capturadas (page_source) para re-extração sem navegador.
+
+Cada captura é indexada pela URL + estado dos filtros (ano, rede,
+modalidade, etapa, disciplina). O conteúdo é guardado por hash (telas
+idênticas ocupam espaço uma vez só), comprimido com gzip.
+
+  - TTL: capturas mais velhas que `ttl` segundos não são usadas numa
+    coleta normal (mas continuam valendo no modo offline).
+  - Tamanho: passando de `tamanho_max` bytes, as capturas menos usadas
+    recentemente são removidas (LRU).
+
+O índice é um SQLite na própria pasta, seguro para vários workers.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache_telas")
+TTL_PADRAO = 7 * 24 * 3600            # 7 dias
+TAMANHO_MAX_PADRAO = 500 * 1024 ** 2  # 500 MB comprimidos
+
+
+def chave_tela(url, filtros):
+    """ Chave estável de uma tela: URL + filtros em JSON canônico """
+    estado = json.dumps({"url": url, "filtros": filtros}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(estado.encode("utf-8")).hexdigest()
+
+
+class CacheTelas:
+    """ Armazém de capturas com TTL e despejo LRU por tamanho """
+
+    def __init__(self, pasta=PASTA_PADRAO, ttl=TTL_PADRAO, tamanho_max=TAMANHO_MAX_PADRAO):
+        self.pasta = pasta
+        self.ttl = ttl
+        self.tamanho_max = tamanho_max
+        os.makedirs(os.path.join(pasta, "objetos"), exist_ok=True)
+
+        self.conexao = sqlite3.connect(os.path.join(pasta, "indice.sqlite"), timeout=30)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("""
+            CREATE TABLE IF NOT EXISTS telas (
+                chave TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                filtros TEXT NOT NULL,
+                conteudo TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                criado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            )
+        """)
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_telas_acesso ON telas (acessado_em)")
+        self.conexao.commit()
+
+    def _caminho_objeto(self, hash_conteudo):
+        return os.path.join(self.pasta, "objetos", hash_conteudo[:2], hash_conteudo + ".gz")
+
+    def guardar(self, url, filtros, conteudo):
+        """ Guarda a captura e devolve o hash do conteúdo """
+        dados = conteudo.encode("utf-8")
+        hash_conteudo = hashlib.sha256(dados).hexdigest()
+        caminho = self._caminho_objeto(hash_conteudo)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with gzip.open(temporario, "wb", compresslevel=6) as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+
+        agora = time.time()
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO telas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (chave_tela(url, filtros), url, json.dumps(filtros, sort_keys=True, ensure_ascii=False),
+                 hash_conteudo, os.path.getsize(caminho), agora, agora),
+            )
+        self._despejar()
+        return hash_conteudo
+
+    def obter(self, url, filtros, ignorar_ttl=False):
+        """ Conteúdo da captura, ou None se não existir / estiver vencida """
+        chave = chave_tela(url, filtros)
+        linha = self.conexao.execute(
+            "SELECT conteudo, criado_em FROM telas WHERE chave = ?", (chave,)
+        ).fetchone()
+        if linha is None:
+            return None
+
+        hash_conteudo, criado_em = linha
+        if not ignorar_ttl and time.time() - criado_em > self.ttl:
+            return None
+
+        try:
+            with gzip.open(self._caminho_objeto(hash_conteudo), "rb") as f:
+                conteudo = f.read().decode("utf-8")
+        except FileNotFoundError:
+            with self.conexao:
+                self.conexao.execute("DELETE FROM telas WHERE chave = ?", (chave,))
+            return None
+
+        with self.conexao:
+            self.conexao.execute("UPDATE telas SET acessado_em = ? WHERE chave = ?", (time.time(), chave))
+        return conteudo
+
+    def _despejar(self):
+        """ Remove as capturas menos usadas até caber em tamanho_max """
+        # Cada objeto conta uma vez, mesmo se várias telas apontarem para ele
+        total = self.conexao.execute(
+            "SELECT COALESCE(SUM(tamanho), 0) FROM (SELECT DISTINCT conteudo, tamanho FROM telas)"
+        ).fetchone()[0]
+        if total <= self.tamanho_max:
+            return
+
+        for chave, hash_conteudo, tamanho in self.conexao.execute(
+            "SELECT chave, conteudo, tamanho FROM telas ORDER BY acessado_em"
+        ).fetchall():
+            with self.conexao:
+                self.conexao.execute("DELETE FROM telas WHERE chave = ?", (chave,))
+            ainda_usado = self.conexao.execute(
+                "SELECT 1 FROM telas WHERE conteudo = ? LIMIT 1", (hash_conteudo,)
+            ).fetchone()
+            if not ainda_usado:
+                try:
+                    os.remove(self._caminho_objeto(hash_conteudo))
+                except FileNotFoundError:
+                    pass
+                total -= tamanho
+            if total <= self.tamanho_max:
+                break
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def resolver_do_cache(celulas, cache, url, filtros_da_celula, extrair, ignorar_ttl=False):
+    """
+    Re-extrai da cache as células que têm captura.
+    Devolve os resultados na ordem da grade, com None onde não havia captura.
+    """
+    resultados = []
+    for celula in celulas:
+        conteudo = cache.obter(url, filtros_da_celula(celula), ignorar_ttl)
+        resultados.append((extrair(conteudo, celula) or None) if conteudo is not None else None)
+    return resultados
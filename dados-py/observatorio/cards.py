@@ -0,0 +1,157 @@
+"""
+Leitura em lote dos cards do Censo Escolar (QEdu).
+
+Em vez de um find_element + get_attribute por card (uma ida e volta ao
+navegador para cada), um único script roda na página e devolve, para todos
+os cards pedidos de uma vez, o rótulo casado, o texto bruto e os números já
+convertidos para inteiro.
+
+Cada card é achado pelo rótulo, não pela posição: procura-se o nó de texto
+igual a um dos rótulos aceitos (sem diferenciar acento/maiúscula) e sobe-se
+até o primeiro elemento que já tenha algum número, sem engolir o rótulo de
+outro card nem chegar na região inteira. Se o rótulo não existir na tela, vale o XPath fixo do card
+(posição antiga), então a troca de ordem dos cards não quebra a coleta.
+
+`ler_cards_html` faz a mesma leitura sobre um HTML salvo (cache de telas)
+e `ler_cards_json` sobre os payloads JSON da tela (motor HTTP), casando os
+mesmos rótulos com os pares de observatorio.payloads.
+"""
+import re
+import unicodedata
+
+from observatorio.parsers import criar_arvore, parser_padrao, texto_por_xpath
+from observatorio.payloads import formatar_inteiro, pares_dos_payloads
+
+RE_NUMERO = re.compile(r"(?<![\d.])\d{1,3}(?:\.\d{3})*(?!\d|\.\d)")
+IGNORAR = {"select", "option", "script", "style"}
+
+JS_LER_CARDS = r"""
+const [seletor, cards] = arguments;
+const raiz = document.querySelector(seletor) || document.body;
+const normalizar = t => (t || '').normalize('NFD').replace(/[\u0300-\u036f]/g, '')
+    .replace(/\s+/g, ' ').trim().replace(/\s*:$/, '').toLowerCase();
+const numeros = t => ((t || '').match(/(?<![\d.])\d{1,3}(?:\.\d{3})*(?!\d|\.\d)/g) || [])
+    .map(n => parseInt(n.replace(/\./g, ''), 10));
+// textContent com espaço entre os nós (senão "2023" e "5.432" viram "20235.432")
+const textoDe = el => {
+    const partes = [], w = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (w.nextNode()) partes.push(w.currentNode.nodeValue);
+    return partes.join(' ');
+};
+
+const alvos = {};
+for (const card of cards) for (const rotulo of card.rotulos) alvos[normalizar(rotulo)] = card.nome;
+
+// Primeiro nó de texto de cada rótulo dentro da região (fora dos dropdowns)
+const rotulos = {}, casados = {};
+const walker = document.createTreeWalker(raiz, NodeFilter.SHOW_TEXT);
+while (walker.nextNode()) {
+    if (walker.currentNode.parentElement.closest('select, option, script, style')) continue;
+    const texto = normalizar(walker.currentNode.nodeValue);
+    const nome = alvos[texto];
+    if (nome && !rotulos[nome]) {
+        rotulos[nome] = walker.currentNode.parentElement;
+        casados[nome] = walker.currentNode.nodeValue.trim();
+    }
+}
+const elementosRotulo = Object.values(rotulos);
+
+const resultado = {};
+for (const card of cards) {
+    let el = rotulos[card.nome], via = el ? 'rotulo' : null;
+    if (el) {
+        // Sobe até achar o valor, parando antes de encostar em outro card
+        while (!/\d/.test(el.textContent) && el.parentElement && el.parentElement !== raiz) {
+            const pai = el.parentElement;
+            if (elementosRotulo.some(outro => outro !== rotulos[card.nome] && pai.contains(outro))) break;
+            el = pai;
+        }
+    } else if (card.xpath) {
+        el = document.evaluate(card.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+            .singleNodeValue;
+        via = el ? 'xpath' : null;
+    }
+    const texto = el ? textoDe(el) : null;
+    resultado[card.nome] = {via: via, rotulo: casados[card.nome] || null, texto: texto, numeros: numeros(texto)};
+}
+return resultado;
+"""
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize("NFKD", texto or "").encode("ascii", "ignore").decode()
+    return re.sub(r"\s*:$", "", " ".join(texto.split())).lower()
+
+
+def numeros_do_texto(texto):
+    """ Inteiros do texto ("1.234" -> 1234) """
+    return [int(n.replace(".", "")) for n in RE_NUMERO.findall(texto or "")]
+
+
+def card(nome, rotulos, xpath=None):
+    """ Especificação de um card: nome na saída, rótulos aceitos e XPath de reserva """
+    return {"nome": nome, "rotulos": list(rotulos), "xpath": xpath}
+
+
+def ler_cards(driver, cards, seletor="#main"):
+    """
+    Lê todos os cards numa única chamada ao navegador.
+    Devolve {nome: {"via": "rotulo"|"xpath"|None, "rotulo", "texto", "numeros"}}.
+    """
+    return driver.execute_script(JS_LER_CARDS, seletor, cards)
+
+
+def ler_cards_html(html, cards, regiao="main"):
+    """ Mesma leitura de `ler_cards`, sobre um HTML já baixado """
+    parser = parser_padrao()
+    arvore = criar_arvore(html, parser if parser in ("lxml", "html.parser") else "html.parser", regiao)
+    raiz = arvore.find(id=regiao) or arvore
+
+    alvos = {_normalizar(rotulo): c["nome"] for c in cards for rotulo in c["rotulos"]}
+    rotulos, casados = {}, {}
+    for no in raiz.find_all(string=True):
+        nome = alvos.get(_normalizar(no))
+        if not nome or nome in rotulos or no.parent is None:
+            continue
+        if any(pai.name in IGNORAR for pai in no.parents):
+            continue  # Opção de dropdown, não rótulo de card
+        rotulos[nome] = no.parent
+        casados[nome] = no.strip()
+
+    resultado = {}
+    for c in cards:
+        el = rotulos.get(c["nome"])
+        via = "rotulo" if el is not None else None
+        if el is not None:
+            while not re.search(r"\d", el.get_text()) and el.parent is not None and el.parent is not raiz:
+                pai = el.parent
+                if any(outro is not rotulos[c["nome"]] and any(p is pai for p in outro.parents)
+                       for outro in rotulos.values()):
+                    break
+                el = pai
+            texto = el.get_text(" ")
+        elif c.get("xpath"):
+            texto = texto_por_xpath(html, c["xpath"])
+            via = "xpath" if texto is not None else None
+        else:
+            texto = None
+        resultado[c["nome"]] = {
+            "via": via, "rotulo": casados.get(c["nome"]), "texto": texto, "numeros": numeros_do_texto(texto),
+        }
+    return resultado
+
+
+def ler_cards_json(payloads, cards):
+    """ Mesma saída de `ler_cards`, a partir dos payloads JSON da célula (via "json") """
+    pares = [(_normalizar(rotulo), rotulo, numero) for rotulo, numero in pares_dos_payloads(payloads)]
+    resultado = {}
+    for c in cards:
+        aceitos = {_normalizar(rotulo) for rotulo in c["rotulos"]}
+        achado = next(((rotulo, numero) for normalizado, rotulo, numero in pares if normalizado in aceitos), None)
+        if achado is None:
+            resultado[c["nome"]] = {"via": None, "rotulo": None, "texto": None, "numeros": []}
+            continue
+        rotulo, numero = achado
+        texto = formatar_inteiro(numero)
+        resultado[c["nome"]] = {"via": "json", "rotulo": rotulo, "texto": texto, "numeros": numeros_do_texto(texto)}
+    return resultado
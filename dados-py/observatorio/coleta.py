@@ -0,0 +1,172 @@
+"""
+Orquestração comum da coleta de uma grade de filtros.
+
+Ordem de resolução de cada célula:
+  0. diário da execução anterior interrompida (células já concluídas);
+  1. captura guardada na cache de telas (re-extração, sem navegador);
+  2. motor escolhido (Selenium em paralelo, ou HTTP sobre os endpoints JSON
+     gravados, com fallback Selenium).
+No modo offline só os passos 0 e 1 rodam.
+"""
+import os
+from functools import partial
+
+from observatorio.cache_telas import PASTA_PADRAO as PASTA_CACHE_PADRAO
+from observatorio.cache_telas import CacheTelas, resolver_do_cache
+from observatorio.diario import PASTA_PADRAO as PASTA_DIARIOS
+from observatorio.diario import DiarioExecucao, chave_celula, limpar_diario
+from observatorio.endpoints import VARIAVEL_AMBIENTE as VARIAVEL_GRAVAR_ENDPOINTS
+from observatorio.link_direto import VARIAVEL_AMBIENTE as VARIAVEL_LINK_DIRETO
+from observatorio.paralelo import completar_resultados, executar_grade
+from observatorio.parsers import BACKENDS as BACKENDS_HTML
+from observatorio.perfis import EXTENSOES_POR_TIPO, PERFIS, montar_perfil
+from observatorio.telemetria import PASTA_PADRAO as PASTA_TELEMETRIA
+from observatorio.telemetria import iniciar_execucao, span
+
+
+def adicionar_argumentos_coleta(parser, nome_execucao):
+    """ Argumentos de linha de comando comuns a todos os scripts """
+    parser.add_argument("--workers", type=int, default=1, help="Quantidade de navegadores em paralelo")
+    parser.add_argument("--motor", choices=["selenium", "http"], default="selenium",
+                        help="http = baixa os endpoints JSON gravados sem navegador (Selenium só nas células que falharem)")
+    parser.add_argument("--base-url", help="Origem alternativa para o motor HTTP (ex.: servidor de replay)")
+    parser.add_argument("--pasta-cache", default=PASTA_CACHE_PADRAO, help="Pasta da cache de telas")
+    parser.add_argument("--sem-cache", action="store_true", help="Não lê nem grava capturas de tela")
+    parser.add_argument("--offline", action="store_true",
+                        help="Só re-extrai das capturas guardadas, sem abrir navegador")
+    parser.add_argument("--pasta-diario", default=os.path.join(PASTA_DIARIOS, nome_execucao),
+                        help="Pasta do diário que permite retomar uma coleta interrompida")
+    parser.add_argument("--sem-diario", action="store_true", help="Não grava diário de execução")
+    parser.add_argument("--recomecar", action="store_true",
+                        help="Descarta o diário de uma execução interrompida e começa do zero")
+    parser.add_argument("--parser", choices=BACKENDS_HTML,
+                        help="Backend de leitura do HTML (padrão: o mais rápido medido nas telas gravadas)")
+    parser.add_argument("--perfil", choices=list(PERFIS), default="padrao",
+                        help="Perfil do Chrome (rapido = headless, enxuto e com bloqueio de recursos)")
+    parser.add_argument("--bloquear-tipo", action="append", choices=list(EXTENSOES_POR_TIPO), default=[],
+                        help="Tipo de recurso a bloquear, além dos do perfil (repetível)")
+    parser.add_argument("--bloquear-dominio", action="append", default=[],
+                        help="Domínio a bloquear, além dos do perfil (repetível)")
+    parser.add_argument("--medir-rede", action="store_true",
+                        help="Informa bytes e tempo de carregamento de cada navegação")
+    parser.add_argument("--sem-descoberta", action="store_true",
+                        help="Não lê as opções da tela antes (células indisponíveis pagam a espera)")
+    parser.add_argument("--gravar-endpoints", action="store_true",
+                        help="Anota os endpoints JSON de cada célula navegada (usados depois pelo --motor http)")
+    parser.add_argument("--link-direto", action="store_true",
+                        help="Abre cada célula pelo endereço com os filtros (cliques só se a tela não conferir)")
+    parser.add_argument("--servico-navegador", metavar="URL",
+                        help="Arrenda Chromes aquecidos do serviço (python -m observatorio.servico_navegador)")
+    parser.add_argument("--pasta-telemetria", default=os.path.join(PASTA_TELEMETRIA, nome_execucao),
+                        help="Pasta dos spans por fase (uma subpasta por execução)")
+    parser.add_argument("--sem-telemetria", action="store_true", help="Não grava spans nem métricas")
+    parser.add_argument("--prometheus", metavar="ARQUIVO.prom",
+                        help="Grava o resumo também neste arquivo (textfile collector do node_exporter)")
+    return parser
+
+
+def opcoes_coleta(args):
+    """ Converte os argumentos da linha de comando nos parâmetros de coletar_grade """
+    pasta_diario = None if args.sem_diario else args.pasta_diario
+    if pasta_diario and args.recomecar:
+        limpar_diario(pasta_diario)
+    if getattr(args, "parser", None):
+        # Via ambiente para valer também nos processos dos workers
+        os.environ["OBSERVATORIO_PARSER"] = args.parser
+    if getattr(args, "link_direto", False):
+        os.environ[VARIAVEL_LINK_DIRETO] = "1"
+    gravar_endpoints = getattr(args, "gravar_endpoints", False)
+    if gravar_endpoints:
+        os.environ[VARIAVEL_GRAVAR_ENDPOINTS] = "1"
+    if getattr(args, "servico_navegador", None):
+        os.environ["OBSERVATORIO_SERVICO_NAVEGADOR"] = args.servico_navegador
+    if not getattr(args, "sem_telemetria", True):
+        # Também via ambiente: os workers gravam os spans na mesma pasta
+        iniciar_execucao(args.pasta_telemetria)
+    return {
+        "workers": args.workers,
+        "motor": args.motor,
+        "base_url": args.base_url,
+        "pasta_cache": None if args.sem_cache else args.pasta_cache,
+        "offline": args.offline,
+        "pasta_diario": pasta_diario,
+        "descoberta": not getattr(args, "sem_descoberta", False),
+        # Os endpoints saem do mesmo log de performance da medição de rede
+        "perfil": montar_perfil(args.perfil, args.bloquear_tipo, args.bloquear_dominio,
+                                medir=True if args.medir_rede or gravar_endpoints else None),
+    }
+
+
+def finalizar_coleta(pasta_diario=None, offline=False, **_):
+    """ Chamada depois de salvar a saída: o diário não é mais necessário """
+    # No modo offline nada foi coletado ao vivo; uma coleta interrompida continua retomável
+    if pasta_diario and not offline:
+        limpar_diario(pasta_diario)
+
+
+def coletar_grade(grade, processar_fatia, extrair_html, url_base, filtros_da_celula,
+                  workers=1, motor="selenium", base_url=None, pasta_cache=None, offline=False,
+                  pasta_diario=None, perfil=None, descobrir_opcoes=None, descoberta=True,
+                  endpoints_da_celula=None, extrair_json=None):
+    """
+    Resolve todas as células da grade e devolve os resultados na ordem dela.
+    `processar_fatia` precisa aceitar os parâmetros `headless`, `perfil`,
+    `pasta_cache` e `pasta_diario`. Com `descobrir_opcoes`, as células sem
+    opção na tela saem antes (observatorio.descoberta). O motor HTTP precisa
+    de `endpoints_da_celula` (célula -> URLs JSON) e `extrair_json`.
+    """
+    resultados = [None] * len(grade)
+
+    # 0. Execução anterior interrompida: o que já foi concluído não se refaz
+    if pasta_diario:
+        concluidas = DiarioExecucao(pasta_diario).concluidas()
+        resultados = [concluidas.get(chave_celula(celula)) for celula in grade]
+        retomadas = sum(1 for r in resultados if r is not None)
+        if retomadas:
+            print(f"♻️ Retomando coleta: {retomadas}/{len(grade)} células já concluídas no diário.")
+
+    # 1. Telas já capturadas (no modo offline vale qualquer idade)
+    if pasta_cache and any(r is None for r in resultados):
+        cache = CacheTelas(pasta_cache)
+        try:
+            antes = sum(1 for r in resultados if r is None)
+            with span("cache", celulas=antes):
+                completar_resultados(grade, resultados, lambda subgrade: resolver_do_cache(
+                    subgrade, cache, url_base, filtros_da_celula, extrair_html, ignorar_ttl=offline
+                ))
+        finally:
+            cache.fechar()
+        encontrados = antes - sum(1 for r in resultados if r is None)
+        print(f"🗃️ Cache: {encontrados}/{antes} células re-extraídas das capturas.")
+
+    faltando = sum(1 for r in resultados if r is None)
+    if offline:
+        if faltando:
+            print(f"⚠️ Modo offline: {faltando} células sem captura ficaram de fora.")
+        return resultados
+    if not faltando:
+        return resultados
+
+    # 2. O que faltou vai para a coleta ao vivo
+    if workers > 1:
+        print(f"⚡ Modo paralelo: {workers} navegadores headless")
+    processar = partial(processar_fatia, headless=workers > 1, perfil=perfil, pasta_cache=pasta_cache,
+                        pasta_diario=pasta_diario)
+
+    if motor == "http" and (endpoints_da_celula is None or extrair_json is None):
+        print("⚠️ Motor HTTP sem leitura dos payloads JSON desta tela: coletando pelo Selenium.")
+        motor = "selenium"
+    if motor == "http":
+        # Import local: o httpx só é necessário neste modo
+        from observatorio.coleta_http import executar_grade_hibrida
+        executar = partial(executar_grade_hibrida, endpoints_da_celula=endpoints_da_celula, extrair=extrair_json,
+                           processar_fatia=processar, n_workers=workers, base_url=base_url)
+    else:
+        executar = partial(executar_grade, processar_fatia=processar, n_workers=workers)
+        if descobrir_opcoes is not None and descoberta:
+            # Import local: a descoberta abre o navegador (o modo offline nem precisa do Selenium)
+            from observatorio.descoberta import so_disponiveis
+            executar = so_disponiveis(executar, url_base, filtros_da_celula, descobrir_opcoes,
+                                      headless=workers > 1, perfil=perfil, pasta_cache=pasta_cache)
+
+    return completar_resultados(grade, resultados, executar)
@@ -0,0 +1,144 @@
+"""
+Motor de coleta sem navegador.
+
+Em vez de abrir o Chrome e clicar, baixamos direto os payloads JSON que o
+front-end do QEdu pede para montar cada célula, com um cliente HTTP de
+conexões persistentes, várias ao mesmo tempo. Os endpoints não são
+adivinhados: são os gravados do log de rede do Chrome numa coleta com
+--gravar-endpoints (observatorio.endpoints). Cada trabalho lê os payloads
+com o seu `extrair_json`, que devolve os mesmos registros do extrator de
+HTML.
+
+Células sem endpoint gravado, que voltam sem dados ou cujos payloads são
+idênticos aos de outra célula (sinal de que o servidor ignorou os filtros)
+são refeitas pelo Selenium, que continua sendo o caminho garantido.
+
+Depende do httpx (pip install httpx).
+"""
+import asyncio
+import hashlib
+import json
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from observatorio.paralelo import completar_resultados, executar_grade
+from observatorio.telemetria import span
+
+# --- CONFIGURAÇÃO PADRÃO ---
+CONCORRENCIA_PADRAO = 8
+TIMEOUT_PADRAO = 20
+TENTATIVAS = 3
+CABECALHOS = {
+    "User-Agent": "Mozilla/5.0 (Observatorio de Dados SJM)",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "pt-BR,pt;q=0.9",
+}
+
+
+def trocar_origem(url, base_url):
+    """ Troca esquema+host da URL (ex.: para apontar para o servidor de replay) """
+    if not base_url:
+        return url
+    partes = urlsplit(url)
+    base = urlsplit(base_url)
+    return urlunsplit((base.scheme, base.netloc, partes.path, partes.query, partes.fragment))
+
+
+def criar_cliente(concorrencia=CONCORRENCIA_PADRAO, timeout=TIMEOUT_PADRAO):
+    """ Cliente assíncrono com pool de conexões keep-alive """
+    limites = httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia)
+    return httpx.AsyncClient(
+        headers=CABECALHOS, limits=limites, timeout=timeout, follow_redirects=True
+    )
+
+
+async def _baixar(cliente, semaforo, url):
+    with span("download_http", url=url) as medicao:
+        for tentativa in range(TENTATIVAS):
+            medicao.atributos["tentativas"] = tentativa + 1
+            try:
+                async with semaforo:
+                    resposta = await cliente.get(url)
+                if resposta.status_code == 200:
+                    return resposta.text
+                if resposta.status_code < 500:
+                    medicao.resultado, medicao.causa = "falha", f"http_{resposta.status_code}"
+                    return None
+            except httpx.HTTPError:
+                pass
+            if tentativa < TENTATIVAS - 1:
+                await asyncio.sleep(0.5 * 2 ** tentativa)
+        medicao.resultado, medicao.causa = "falha", "sem_resposta"
+        return None
+
+
+async def baixar_paginas_async(urls, concorrencia=CONCORRENCIA_PADRAO):
+    """ Baixa as URLs com no máximo `concorrencia` requisições simultâneas """
+    semaforo = asyncio.Semaphore(concorrencia)
+    async with criar_cliente(concorrencia) as cliente:
+        corpos = await asyncio.gather(*(_baixar(cliente, semaforo, url) for url in urls))
+    return dict(zip(urls, corpos))
+
+
+def baixar_paginas(urls, concorrencia=CONCORRENCIA_PADRAO):
+    """ Versão síncrona: {url: corpo ou None} """
+    return asyncio.run(baixar_paginas_async(list(urls), concorrencia))
+
+
+def _ler_json(corpo):
+    try:
+        return json.loads(corpo)
+    except (TypeError, ValueError):
+        return None
+
+
+def executar_grade_http(celulas, endpoints_da_celula, extrair, concorrencia=CONCORRENCIA_PADRAO, base_url=None):
+    """
+    Baixa os endpoints JSON de cada célula e aplica `extrair(payloads, celula)`.
+    Devolve os resultados na ordem da grade, com None onde não deu (inclusive
+    nas células sem endpoint gravado).
+    """
+    urls_por_celula = [[trocar_origem(url, base_url) for url in endpoints_da_celula(celula)] for celula in celulas]
+    corpos = baixar_paginas(sorted({url for urls in urls_por_celula for url in urls}), concorrencia)
+
+    # Payloads idênticos em células diferentes: o servidor ignorou o filtro,
+    # então não dá para saber a qual célula o dado pertence.
+    assinaturas = [
+        hashlib.sha1("\0".join(corpos[url] for url in urls).encode()).hexdigest()
+        if urls and all(corpos.get(url) is not None for url in urls) else None
+        for urls in urls_por_celula
+    ]
+    repetidas = {a for a, vezes in Counter(assinaturas).items() if a is not None and vezes > 1}
+
+    resultados = []
+    for celula, urls, assinatura in zip(celulas, urls_por_celula, assinaturas):
+        if assinatura is None or assinatura in repetidas:
+            resultados.append(None)
+            continue
+        payloads = [_ler_json(corpos[url]) for url in urls]
+        if any(payload is None for payload in payloads):
+            resultados.append(None)
+            continue
+        resultados.append(extrair(payloads, celula) or None)
+    return resultados
+
+
+def executar_grade_hibrida(celulas, endpoints_da_celula, extrair, processar_fatia, n_workers=1,
+                           concorrencia=CONCORRENCIA_PADRAO, base_url=None):
+    """
+    Tenta a grade inteira via HTTP e refaz no Selenium só as células que faltaram.
+    """
+    sem_endpoint = sum(1 for celula in celulas if not endpoints_da_celula(celula))
+    resultados = executar_grade_http(celulas, endpoints_da_celula, extrair, concorrencia, base_url)
+    faltando = sum(1 for resultado in resultados if resultado is None)
+    print(f"🌐 HTTP: {len(celulas) - faltando}/{len(celulas)} células resolvidas sem navegador.")
+    if sem_endpoint:
+        print(f"   ⚠️ {sem_endpoint} células sem endpoint gravado (colete uma vez com --gravar-endpoints).")
+
+    if faltando:
+        print(f"↩️ Refazendo {faltando} células pelo Selenium...")
+    return completar_resultados(
+        celulas, resultados, lambda subgrade: executar_grade(subgrade, processar_fatia, n_workers)
+    )
@@ -0,0 +1,28 @@
+"""
+Registro dos trabalhos de coleta disponíveis (nome na linha de comando -> definição)
+e dos conjuntos de dados do armazém (nome -> esquema), incluindo os
+consolidados de vários municípios (<conjunto>_municipios, observatorio.fila).
+"""
+from observatorio.conjuntos.censo_inep import CONJUNTO_ESCOLAS_REDE, CONJUNTO_MATRICULAS_REDE
+from observatorio.conjuntos.enem import CONJUNTO_ENEM
+from observatorio.conjuntos.ibge_sidra import CONJUNTO_SIDRA
+from observatorio.conjuntos.qedu_aprendizado import APRENDIZADO, PROFICIENCIA
+from observatorio.conjuntos.qedu_censo import CENSO_FILTROS, CENSO_MATRICULAS
+from observatorio.municipios import conjunto_por_municipio
+
+TRABALHOS = {
+    trabalho.nome: trabalho
+    for trabalho in (APRENDIZADO, PROFICIENCIA, CENSO_FILTROS, CENSO_MATRICULAS)
+}
+
+CONJUNTOS = {
+    conjunto.nome: conjunto
+    for conjunto in [c for trabalho in TRABALHOS.values() for c in trabalho.conjuntos] + [
+        CONJUNTO_ENEM, CONJUNTO_SIDRA, CONJUNTO_ESCOLAS_REDE, CONJUNTO_MATRICULAS_REDE,
+    ]
+}
+
+CONJUNTOS.update({
+    consolidado.nome: consolidado
+    for consolidado in (conjunto_por_municipio(c) for trabalho in TRABALHOS.values() for c in trabalho.conjuntos)
+})
@@ -0,0 +1,33 @@
+"""
+Escolas e matrículas do Censo Escolar calculadas dos microdados do INEP
+(observatorio.microdados_censo), por rede.
+
+Mesmas etapas e filtros da tela do QEdu (qedu_censo.py), mas para todas as
+redes de uma vez e sem navegador.
+"""
+from observatorio.armazem import Conjunto
+from observatorio.conjuntos.qedu_censo import mais_recentes_primeiro, ordenar_etapas
+
+
+def ordenar_redes(df):
+    """ Por rede e, dentro dela, na ordem da exportação do QEdu """
+    return ordenar_etapas(df).sort_values("Rede", kind="stable")
+
+CONJUNTO_ESCOLAS_REDE = Conjunto(
+    nome="censo_inep_escolas",
+    colunas=(("Ano", "inteiro"), ("Rede", "categoria"), ("Filtro Aplicado", "categoria"), ("Total Escolas", "inteiro")),
+    chave=("Ano", "Rede", "Filtro Aplicado"),
+    coluna_ano="Ano",
+    aba="Escolas_por_Rede",
+    ordenar=mais_recentes_primeiro,
+)
+
+CONJUNTO_MATRICULAS_REDE = Conjunto(
+    nome="censo_inep_matriculas_etapa",
+    colunas=(("Ano", "inteiro"), ("Rede", "categoria"), ("Filtro Geral", "categoria"), ("Etapa", "categoria"),
+             ("Matrículas", "inteiro")),
+    chave=("Ano", "Rede", "Filtro Geral", "Etapa"),
+    coluna_ano="Ano",
+    aba="Matriculas_por_Rede",
+    ordenar=ordenar_redes,
+)
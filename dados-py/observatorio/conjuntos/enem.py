@@ -0,0 +1,29 @@
+"""
+Médias do ENEM em São João de Meriti por segmento (gênero, localização e
+dependência administrativa da escola).
+
+Os números saem dos microdados do INEP (observatorio.microdados_enem); os
+consolidados à mão em dados-criados/educacao/enem.py ficam como carga
+inicial. Aqui fica só o esquema do conjunto no armazém.
+"""
+from observatorio.armazem import Conjunto, em_ordem
+
+# Ordem da planilha: categoria, e dentro dela do ano mais recente ao mais antigo
+ORDEM_CATEGORIAS = ["Gênero", "Localização", "Administração"]
+
+
+def ordenar_planilha(df):
+    return (df.assign(Categoria=em_ordem(df["Categoria"], ORDEM_CATEGORIAS))
+              .sort_values(by=["Categoria", "Ano"], ascending=[True, False], kind="stable"))
+
+CONJUNTO_ENEM = Conjunto(
+    nome="enem_medias",
+    colunas=(
+        ("Ano", "inteiro"), ("Categoria", "categoria"), ("Segmento", "categoria"),
+        ("Matemática", "inteiro"), ("Linguagens", "inteiro"),
+        ("Ciências Humanas", "inteiro"), ("Ciências Sociais", "inteiro"),
+    ),
+    chave=("Ano", "Categoria", "Segmento"),
+    coluna_ano="Ano",
+    ordenar=ordenar_planilha,
+)
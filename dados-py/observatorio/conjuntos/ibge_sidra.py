@@ -0,0 +1,47 @@
+"""
+Séries do SIDRA/IBGE usadas no painel de Educação (as mesmas que o
+educacao.js consultava no navegador), todas para São João de Meriti.
+
+Todas vão para um único conjunto, `sidra_series`, uma linha por
+(série, localidade, categoria, período). A coleta fica em observatorio/ibge.py.
+"""
+from urllib.parse import quote
+
+from observatorio.armazem import Conjunto
+
+CODIGO_MUNICIPIO = "3305109"
+URL_AGREGADOS = "https://servicodados.ibge.gov.br/api/v3/agregados"
+
+ANOS_IDEB = [2005, 2007, 2009, 2011, 2013, 2015, 2017, 2019, 2021, 2023]
+ANOS_CENSO = [2018, 2019, 2020, 2021, 2022]
+
+
+def url_agregado(agregado, periodos, variavel, classificacao=None, localidade=CODIGO_MUNICIPIO):
+    """ URL da API de agregados (v3) para um município """
+    url = (f"{URL_AGREGADOS}/{agregado}/periodos/{quote('|'.join(map(str, periodos)))}"
+           f"/variaveis/{variavel}?localidades={quote(f'N6[{localidade}]')}")
+    if classificacao:
+        url += f"&classificacao={quote(classificacao)}"
+    return url
+
+
+# Nome da série -> URL
+SERIES = {
+    "ideb_iniciais": url_agregado(5938, ANOS_IDEB, 63),
+    "ideb_finais": url_agregado(5938, ANOS_IDEB, 63, "12030[115175]"),
+    "matriculas": url_agregado(5930, ANOS_CENSO, 1000096),
+    "taxa_abandono": url_agregado(5935, ANOS_CENSO, 64),
+    "taxa_distorcao": url_agregado(5936, ANOS_CENSO, 1000096),
+    "mat_infantil": url_agregado(5929, ANOS_CENSO, 1000096),
+    "mat_fundamental": url_agregado(5930, ANOS_CENSO, 1000096),
+}
+
+CONJUNTO_SIDRA = Conjunto(
+    nome="sidra_series",
+    colunas=(
+        ("Série", "categoria"), ("Agregado", "inteiro"), ("Variável", "inteiro"), ("Localidade", "inteiro"),
+        ("Categoria", "categoria"), ("Período", "texto"), ("Ano", "inteiro"), ("Valor", "decimal"),
+    ),
+    chave=("Série", "Localidade", "Categoria", "Período"),
+    coluna_ano="Ano",
+)
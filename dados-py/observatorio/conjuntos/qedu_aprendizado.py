@@ -0,0 +1,325 @@
+"""
+Tela de Aprendizado do QEdu (SAEB) e os dois trabalhos tirados dela:
+  - aprendizado:  KPI de aprendizado adequado + níveis (conjunto qedu_aprendizado,
+                  exportado como Dados_QEdu_SJM_Historico.xlsx);
+  - proficiencia: distribuição nos níveis de proficiência (conjunto qedu_proficiencia,
+                  exportado como Dados_QEdu_Proficiencia.xlsx).
+
+Os dois usam a mesma grade (ano SAEB x ano escolar x disciplina) e a mesma
+navegação, então cada célula é clicada uma vez só para os dois. No motor
+HTTP, os mesmos registros saem dos payloads JSON gravados da tela.
+"""
+import pandas as pd
+
+from observatorio.armazem import Conjunto
+from observatorio.navegador import botao_marcado, forcar_clique, textos_presentes
+from observatorio.parsers import parser_padrao
+from observatorio.proficiencia import extrair_indicadores, extrair_indicadores_json
+from observatorio.trabalhos import Tela, Trabalho
+
+# --- CONFIGURAÇÃO ---
+URL_BASE = "https://qedu.org.br/municipio/3305109-sao-joao-de-meriti/aprendizado"
+
+# Lista de anos do SAEB para buscar
+ANOS_SAEB = ["2023", "2021", "2019", "2017", "2015"]
+
+# Botões de ano escolar
+# Estrutura: { "Texto do Botão": ("Nome da Etapa", "Nome do Ano") }
+MAPA_ANOS_ESCOLARES = {
+    "5º ano": ("Anos Iniciais", "5º ano"),
+    "9º ano": ("Anos Finais", "9º ano")
+}
+# Nome da etapa na planilha de proficiência
+MAPA_ETAPAS = {
+    "5º ano": "Anos Iniciais (5º ano)",
+    "9º ano": "Anos Finais (9º ano)"
+}
+
+DISCIPLINAS = ["Língua Portuguesa", "Matemática"]
+
+# Textos alternativos do botão de cada disciplina (o site já usou os dois)
+ROTULOS_DISCIPLINA = {"Língua Portuguesa": ["Língua Portuguesa", "Português"]}
+
+
+def mais_recentes_primeiro(df):
+    """ Ordem da exportação: anos SAEB do mais recente ao mais antigo (como a grade) """
+    return df.sort_values("Ano Calendário", ascending=False, kind="stable")
+
+
+# --- CONJUNTOS DE DADOS ---
+
+CONJUNTO_APRENDIZADO = Conjunto(
+    nome="qedu_aprendizado",
+    colunas=(
+        ("Ano Calendário", "inteiro"), ("Etapa de Ensino", "categoria"), ("Ano Escolar", "categoria"),
+        ("Disciplina", "categoria"), ("Indicador", "categoria"), ("Valor", "decimal"), ("Unidade", "categoria"),
+    ),
+    chave=("Ano Calendário", "Etapa de Ensino", "Ano Escolar", "Disciplina", "Indicador"),
+    coluna_ano="Ano Calendário",
+    ordenar=mais_recentes_primeiro,
+)
+
+CONJUNTO_PROFICIENCIA = Conjunto(
+    nome="qedu_proficiencia",
+    colunas=(
+        ("Ano Calendário", "inteiro"), ("Etapa", "categoria"), ("Disciplina", "categoria"),
+        ("Nível de Proficiência", "categoria"), ("Porcentagem", "decimal"),
+    ),
+    chave=("Ano Calendário", "Etapa", "Disciplina", "Nível de Proficiência"),
+    coluna_ano="Ano Calendário",
+    ordenar=mais_recentes_primeiro,
+)
+
+
+# --- TELA ---
+
+def montar_grade():
+    """ Grade completa: (ano SAEB, botão do ano escolar, disciplina) """
+    return [
+        (ano_saeb, botao_ano_escolar, disc)
+        for ano_saeb in ANOS_SAEB
+        for botao_ano_escolar in MAPA_ANOS_ESCOLARES
+        for disc in DISCIPLINAS
+    ]
+
+def clicar_disciplina(driver, disc, estado):
+    """ Clica na disciplina, começando pelo texto que funcionou da última vez """
+    rotulos = ROTULOS_DISCIPLINA.get(disc, [disc])
+    chave = f"rotulo_{disc}"
+    if estado.get(chave) in rotulos:
+        rotulos = [estado[chave]] + [r for r in rotulos if r != estado[chave]]
+    for rotulo in rotulos:
+        if forcar_clique(driver, rotulo):
+            estado[chave] = rotulo
+            return True
+    return False
+
+def navegar(driver, celula, estado):
+    """
+    Deixa a tela na célula. Só clica no ano/etapa/disciplina quando mudam em
+    relação à célula anterior (guardado em `estado`).
+    """
+    ano_saeb, botao_ano_escolar, disc = celula
+
+    # --- ANO DE CALENDÁRIO (2023, 2021...) ---
+    if ano_saeb != estado.get("ano"):
+        print(f"\n📅 [worker {estado['worker']}] TENTANDO SELECIONAR ANO: {ano_saeb}...")
+        estado["ano"], estado["etapa"], estado["disciplina"] = ano_saeb, None, None
+        # Tenta clicar no ano. Se não conseguir, assume que não tem dados ou botão não existe
+        estado["ano_ok"] = forcar_clique(driver, ano_saeb)
+        if not estado["ano_ok"]:
+            print(f"⚠️ Botão do ano {ano_saeb} não encontrado ou não clicável. Pulando.")
+    if not estado["ano_ok"]:
+        return False
+
+    # --- ETAPA ESCOLAR (5º ano / 9º ano) ---
+    if botao_ano_escolar != estado["etapa"]:
+        estado["etapa"], estado["disciplina"] = botao_ano_escolar, None
+        estado["etapa_ok"] = forcar_clique(driver, botao_ano_escolar)
+        if not estado["etapa_ok"]:
+            print(f"   ⚠️ Não consegui entrar em {botao_ano_escolar}")
+    if not estado["etapa_ok"]:
+        return False
+
+    # --- DISCIPLINA ---
+    # Obs: o site volta para a disciplina padrão ao mudar de ano ou de etapa
+    # (aí `estado["disciplina"]` foi zerado acima); fora isso ela continua marcada.
+    if disc != estado["disciplina"]:
+        if not clicar_disciplina(driver, disc, estado):
+            print(f"   ⚠️ Não consegui clicar em {disc}")
+            return False
+        estado["disciplina"] = disc
+
+    print(f"   🔍 Lendo: {descrever(celula)}...")
+    return True
+
+def descrever(celula):
+    ano_saeb, botao_ano_escolar, disc = celula
+    return f"{ano_saeb} | {botao_ano_escolar} | {disc}"
+
+def filtros_da_celula(celula):
+    """ Estado dos filtros da tela (chave da cache de telas) """
+    ano_saeb, botao_ano_escolar, disc = celula
+    return {"ano": ano_saeb, "etapa": botao_ano_escolar, "disciplina": disc}
+
+def filtros_na_tela(driver):
+    """ Botões marcados na tela (mesmas chaves de filtros_da_celula) """
+    rotulo = botao_marcado(driver, [r for disc in DISCIPLINAS for r in ROTULOS_DISCIPLINA.get(disc, [disc])])
+    return {
+        "ano": botao_marcado(driver, ANOS_SAEB),
+        "etapa": botao_marcado(driver, list(MAPA_ANOS_ESCOLARES)),
+        "disciplina": next((disc for disc in DISCIPLINAS if rotulo in ROTULOS_DISCIPLINA.get(disc, [disc])), None),
+    }
+
+def descobrir_opcoes(driver):
+    """ Anos, etapas e disciplinas com botão na tela (observatorio.descoberta) """
+    rotulos = textos_presentes(driver, [r for disc in DISCIPLINAS for r in ROTULOS_DISCIPLINA.get(disc, [disc])])
+    return {
+        "ano": textos_presentes(driver, ANOS_SAEB),
+        "etapa": textos_presentes(driver, list(MAPA_ANOS_ESCOLARES)),
+        "disciplina": [disc for disc in DISCIPLINAS if set(ROTULOS_DISCIPLINA.get(disc, [disc])) & set(rotulos)],
+    }
+
+
+# --- LEITURA DA CAPTURA ---
+
+# Última captura lida: (HTML ou payloads, backend, indicadores). Os dois
+# trabalhos da tela recebem o mesmo objeto da mesma célula, um depois do outro.
+_ultima_leitura = (None, None, None)
+
+def indicadores_da_captura(captura, payloads=False):
+    """ extrair_indicadores(_json) uma vez por captura, para aprendizado e proficiência """
+    global _ultima_leitura
+    # Backend de HTML escolhido em observatorio.parsers (--parser para forçar)
+    parser = None if payloads else parser_padrao()
+    anterior, parser_anterior, indicadores = _ultima_leitura
+    if anterior is not captura or parser_anterior != parser:
+        indicadores = extrair_indicadores_json(captura) if payloads else extrair_indicadores(captura, parser)
+        _ultima_leitura = (captura, parser, indicadores)
+    return indicadores
+
+
+# --- APRENDIZADO ADEQUADO ---
+
+def extrair_dados_do_html(html, ano_saeb, etapa_nome, ano_escolar, disciplina):
+    """ Extrai os números de um HTML (vindo do navegador ou da cache de telas) """
+    return registros_aprendizado(indicadores_da_captura(html), ano_saeb, etapa_nome, ano_escolar, disciplina)
+
+def registros_aprendizado(indicadores, ano_saeb, etapa_nome, ano_escolar, disciplina):
+    """
+    Registros de uma célula a partir dos indicadores (HTML ou JSON).
+    Gera no máximo um registro de Aprendizado Adequado e um por nível.
+    """
+    dados_list = []
+
+    base = {
+        "Ano Calendário": ano_saeb,
+        "Etapa de Ensino": etapa_nome,      # Ex: Anos Iniciais
+        "Ano Escolar": ano_escolar,         # Ex: 5º ano
+        "Disciplina": disciplina,
+    }
+
+    # --- 1. APRENDIZADO ADEQUADO (Valor Destaque) ---
+    valor_adequado = indicadores["adequado"]
+    if valor_adequado:
+        dados_list.append({**base, "Indicador": "Aprendizado Adequado", "Valor": valor_adequado, "Unidade": "%"})
+        print(f"      -> {ano_saeb} | {ano_escolar} | {disciplina}: {valor_adequado}% (Adequado)")
+
+    # --- 2. NÍVEIS DE PROFICIÊNCIA (Insuficiente, Básico...) ---
+    # O componente das barras é achado pela estrutura do HTML (observatorio.proficiencia)
+    for nivel, valor in indicadores["niveis"].items():
+        dados_list.append({**base, "Indicador": f"Nível - {nivel}", "Valor": valor, "Unidade": "%"})
+
+    return dados_list
+
+def extrair_aprendizado(html, celula):
+    ano_saeb, botao_ano_escolar, disc = celula
+    nome_etapa, nome_ano_escolar = MAPA_ANOS_ESCOLARES[botao_ano_escolar]
+    return extrair_dados_do_html(html, ano_saeb, nome_etapa, nome_ano_escolar, disc)
+
+def extrair_aprendizado_json(payloads, celula):
+    ano_saeb, botao_ano_escolar, disc = celula
+    nome_etapa, nome_ano_escolar = MAPA_ANOS_ESCOLARES[botao_ano_escolar]
+    return registros_aprendizado(indicadores_da_captura(payloads, payloads=True),
+                                 ano_saeb, nome_etapa, nome_ano_escolar, disc)
+
+def tabelas_aprendizado(resultados):
+    todos_dados = [registro for registros in resultados if registros for registro in registros]
+    df = pd.DataFrame(todos_dados)
+
+    if df.empty:
+        print("❌ Nenhum dado foi extraído. Verifique se o site abriu corretamente.")
+        return {}
+
+    # Remove duplicatas (caso o regex pegue o mesmo dado duas vezes)
+    # Os valores ("45,3") viram número no esquema do conjunto
+    df = df.drop_duplicates()
+
+    print(f"✅ SUCESSO! {len(df)} registros extraídos.")
+    return {CONJUNTO_APRENDIZADO.nome: df}
+
+
+# --- PROFICIÊNCIA ---
+
+def extrair_proficiencia_do_html(html, ano_saeb, etapa, disciplina):
+    """
+    Busca especificamente os dados de: Insuficiente, Básico, Proficiente e Avançado
+    """
+    # Componente das barras achado pela estrutura do HTML; os níveis são lidos
+    # numa única passada, ligando cada rótulo à porcentagem vizinha (a mesma
+    # leitura do aprendizado, feita uma vez por captura).
+    return registros_proficiencia(indicadores_da_captura(html)["niveis"], ano_saeb, etapa, disciplina)
+
+def registros_proficiencia(niveis, ano_saeb, etapa, disciplina):
+    """ Um registro por nível ({nível: "45,3"}, do HTML ou do JSON) """
+    dados = []
+
+    for nivel, valor in niveis.items():
+        dados.append({
+            "Ano Calendário": ano_saeb,
+            "Etapa": etapa,
+            "Disciplina": disciplina,
+            "Nível de Proficiência": nivel,
+            "Porcentagem": float(valor.replace(',', '.'))
+        })
+        print(f"      -> {nivel}: {valor}%")
+
+    if not niveis:
+        print("      ⚠️ Não achei dados de proficiência nesta tela.")
+
+    return dados
+
+def extrair_proficiencia(html, celula):
+    ano, btn_etapa, disc = celula
+    return extrair_proficiencia_do_html(html, ano, MAPA_ETAPAS[btn_etapa], disc)
+
+def extrair_proficiencia_json(payloads, celula):
+    ano, btn_etapa, disc = celula
+    niveis = indicadores_da_captura(payloads, payloads=True)["niveis"]
+    return registros_proficiencia(niveis, ano, MAPA_ETAPAS[btn_etapa], disc)
+
+def tabelas_proficiencia(resultados):
+    todos_dados = [registro for registros in resultados if registros for registro in registros]
+    df = pd.DataFrame(todos_dados)
+
+    if df.empty:
+        print("❌ Nenhum dado encontrado.")
+        return {}
+
+    return {CONJUNTO_PROFICIENCIA.nome: df}
+
+
+# --- DEFINIÇÃO DOS TRABALHOS ---
+
+TELA = Tela(
+    nome="QEdu Aprendizado",
+    url_base=URL_BASE,
+    montar_grade=montar_grade,
+    navegar=navegar,
+    filtros_da_celula=filtros_da_celula,
+    descrever=descrever,
+    filtros_na_tela=filtros_na_tela,
+    descobrir_opcoes=descobrir_opcoes,
+)
+
+APRENDIZADO = Trabalho(
+    nome="aprendizado",
+    descricao="Histórico de Aprendizado Adequado",
+    tela=TELA,
+    extrair_html=extrair_aprendizado,
+    extrair_json=extrair_aprendizado_json,
+    tabelas=tabelas_aprendizado,
+    conjuntos=(CONJUNTO_APRENDIZADO,),
+    arquivo_saida="Dados_QEdu_SJM_Historico.xlsx",
+)
+
+PROFICIENCIA = Trabalho(
+    nome="proficiencia",
+    descricao="Níveis de proficiência",
+    tela=TELA,
+    extrair_html=extrair_proficiencia,
+    extrair_json=extrair_proficiencia_json,
+    tabelas=tabelas_proficiencia,
+    conjuntos=(CONJUNTO_PROFICIENCIA,),
+    arquivo_saida="Dados_QEdu_Proficiencia.xlsx",
+)
@@ -0,0 +1,405 @@
+"""
+Tela do Censo Escolar do QEdu e os dois trabalhos tirados dela:
+  - censo-filtros:    total de escolas + matrículas detalhadas por filtro
+                      (conjuntos censo_escolas e censo_matriculas_detalhadas,
+                      exportados como Censo_Escolar_SJM_Filtros_Detalhados.xlsx);
+  - censo-matriculas: os 6 cards de matrícula por etapa (conjunto
+                      censo_matriculas_etapa, exportado como
+                      Censo_SJM_Matriculas_6_Itens_Garantidos.xlsx).
+
+Os dois usam a mesma grade (filtro x ano), sempre na rede Municipal, e os
+mesmos dropdowns, então cada célula é selecionada uma vez só para os dois.
+No motor HTTP, os cards e as linhas de matrícula saem dos payloads JSON
+gravados da tela (mesmos rótulos, observatorio.payloads).
+"""
+import re
+
+import pandas as pd
+from selenium.webdriver.common.by import By
+
+from observatorio.armazem import Conjunto, em_ordem
+from observatorio.cards import card, ler_cards, ler_cards_html, ler_cards_json, numeros_do_texto
+from observatorio.navegador import SELETOR_DADOS, opcao_do_dropdown, opcoes_do_dropdown, selecionar_dropdown
+from observatorio.parsers import texto_da_regiao
+from observatorio.payloads import pares_dos_payloads, texto_dos_pares
+from observatorio.trabalhos import Tela, Trabalho
+
+# --- CONFIGURAÇÃO ---
+URL_BASE = "https://qedu.org.br/municipio/3305109-sao-joao-de-meriti/censo-escolar"
+
+# Lista de anos decrescente (2024 até 2010)
+ANOS_BUSCA = [str(ano) for ano in range(2024, 2009, -1)]
+
+# Filtros que serão aplicados no SELECT[4]
+FILTROS_MODALIDADE = [
+    "Com Ensino Infantil Regular",
+    "Com Ensino Fundamental Regular"
+]
+
+# Dropdowns da tela
+XPATH_ANO = '//*[@id="main"]/main/div/div[2]/div[1]/div[1]/select[1]'
+XPATH_REDE = '//*[@id="main"]/main/div/div[2]/div[1]/div[1]/select[2]'
+XPATH_FILTRO = '//*[@id="main"]/main/div/div[2]/div[1]/div[1]/select[4]'
+
+# Card do total de escolas: achado pelo rótulo, com o endereço antigo de reserva
+CARD_ESCOLAS = card(
+    "Total Escolas",
+    ["Escolas", "Total de escolas", "Número de escolas"],
+    '//*[@id="main"]/main/div/div[2]/div[1]/div[3]/div[2]/div[1]/div[2]/span[1]',
+)
+
+# Palavras-chave esperadas nos cards, da mais específica para a mais geral:
+# numa linha com "Anos Iniciais ... 1º ano", vale "1º ano"
+TERMOS_MATRICULA = [
+    "1º ano", "2º ano", "3º ano", "4º ano", "5º ano",
+    "6º ano", "7º ano", "8º ano", "9º ano",
+    "Educação Especial", "Anos Iniciais", "Anos Finais",
+    "Pré-escola", "Creche", "EJA",
+]
+ESPECIFICIDADE = {termo: i for i, termo in enumerate(TERMOS_MATRICULA)}
+# Uma única alternação para todos os termos (uma varredura por linha)
+RE_TERMOS_MATRICULA = re.compile(
+    r"(?<!\w)(" + "|".join(re.escape(t) for t in sorted(TERMOS_MATRICULA, key=len, reverse=True)) + r")(?!\w)"
+)
+
+# MAPA DE DIVS FIXAS (reserva para quando o rótulo do card não aparece)
+MAPA_DIVS = {
+    "Creche":            '//*[@id="main"]/main/div/div[2]/div[1]/div[3]/div[2]/div[5]',
+    "Pré-escola":        '//*[@id="main"]/main/div/div[2]/div[1]/div[3]/div[2]/div[6]',
+    "Anos Iniciais":     '//*[@id="main"]/main/div/div[2]/div[1]/div[3]/div[2]/div[7]',
+    "Anos Finais":       '//*[@id="main"]/main/div/div[2]/div[1]/div[3]/div[2]/div[8]',
+    "EJA":               '//*[@id="main"]/main/div/div[2]/div[1]/div[3]/div[2]/div[10]',
+    "Educação Especial": '//*[@id="main"]/main/div/div[2]/div[1]/div[3]/div[2]/div[11]'
+}
+
+# Os cards são achados pelo rótulo; o endereço do MAPA_DIVS fica só de reserva
+ROTULOS_CARDS = {
+    "Creche":            ["Creche"],
+    "Pré-escola":        ["Pré-escola"],
+    "Anos Iniciais":     ["Anos Iniciais"],
+    "Anos Finais":       ["Anos Finais"],
+    "EJA":               ["EJA", "Educação de Jovens e Adultos"],
+    "Educação Especial": ["Educação Especial"],
+}
+CARDS = [card(nome, ROTULOS_CARDS[nome], xpath) for nome, xpath in MAPA_DIVS.items()]
+
+# Ordem dos cards na exportação de matrículas por etapa
+ORDEM_ETAPAS = ["Creche", "Pré-escola", "Anos Iniciais", "Anos Finais", "EJA", "Educação Especial"]
+
+
+def mais_recentes_primeiro(df):
+    """ Ordem da exportação: anos do mais recente ao mais antigo (como a grade) """
+    return df.sort_values("Ano", ascending=False, kind="stable")
+
+
+def ordenar_etapas(df):
+    """ Por filtro, ano (mais recente primeiro) e ordem dos cards """
+    return (df.assign(Etapa=em_ordem(df["Etapa"], ORDEM_ETAPAS))
+              .sort_values(by=["Filtro Geral", "Ano", "Etapa"], ascending=[True, False, True], kind="stable"))
+
+
+# --- CONJUNTOS DE DADOS ---
+
+CONJUNTO_ESCOLAS = Conjunto(
+    nome="censo_escolas",
+    colunas=(("Ano", "inteiro"), ("Filtro Aplicado", "categoria"), ("Total Escolas", "inteiro")),
+    chave=("Ano", "Filtro Aplicado"),
+    coluna_ano="Ano",
+    aba="Qtd_Escolas",
+    ordenar=mais_recentes_primeiro,
+)
+
+CONJUNTO_MATRICULAS_DETALHADAS = Conjunto(
+    nome="censo_matriculas_detalhadas",
+    colunas=(("Ano", "inteiro"), ("Filtro Aplicado", "categoria"), ("Modalidade", "categoria"), ("Matrículas", "inteiro")),
+    chave=("Ano", "Filtro Aplicado", "Modalidade"),
+    coluna_ano="Ano",
+    aba="Matriculas_Detalhadas",
+    ordenar=mais_recentes_primeiro,
+)
+
+CONJUNTO_MATRICULAS_ETAPA = Conjunto(
+    nome="censo_matriculas_etapa",
+    colunas=(("Ano", "inteiro"), ("Filtro Geral", "categoria"), ("Etapa", "categoria"), ("Matrículas", "inteiro")),
+    chave=("Ano", "Filtro Geral", "Etapa"),
+    coluna_ano="Ano",
+    ordenar=ordenar_etapas,
+)
+
+
+# --- TELA ---
+
+def montar_grade():
+    """ Grade completa: (filtro, ano) """
+    return [(nome_filtro, ano) for nome_filtro in FILTROS_MODALIDADE for ano in ANOS_BUSCA]
+
+def navegar(driver, celula, estado):
+    """
+    Seleciona ano, rede Municipal e filtro da célula. Os dropdowns que já
+    estão na opção pedida não são acionados (nem esperados) de novo.
+    """
+    nome_filtro, ano = celula
+    if nome_filtro != estado.get("filtro"):
+        estado["filtro"] = nome_filtro
+        print(f"\n============================================")
+        print(f"📂 [worker {estado['worker']}] INICIANDO FILTRO: {nome_filtro}")
+        print(f"============================================")
+
+    print(f"\n📅 Processando: {ano} ({nome_filtro})")
+
+    # 1. SELECIONAR ANO (Select 1)
+    if not selecionar_dropdown(driver, XPATH_ANO, ano):
+        print(f"   (Ano {ano} indisponível, pulando)")
+        return False
+
+    # 2. SELECIONAR REDE MUNICIPAL (Select 2)
+    selecionar_dropdown(driver, XPATH_REDE, "Municipal")
+
+    # 3. SELECIONAR O FILTRO DA VEZ (Select 4)
+    if not selecionar_dropdown(driver, XPATH_FILTRO, nome_filtro):
+        print("   (Filtro não encontrado neste ano, tentando continuar...)")
+    return True
+
+def descrever(celula):
+    nome_filtro, ano = celula
+    return f"{ano} ({nome_filtro})"
+
+def filtros_da_celula(celula):
+    """ Estado dos filtros da tela (chave da cache de telas) """
+    nome_filtro, ano = celula
+    return {"ano": ano, "rede": "Municipal", "modalidade": nome_filtro}
+
+def filtros_na_tela(driver):
+    """ Opções que os dropdowns mostram (mesmas chaves de filtros_da_celula) """
+    return {
+        "ano": opcao_do_dropdown(driver, XPATH_ANO),
+        "rede": opcao_do_dropdown(driver, XPATH_REDE),
+        "modalidade": opcao_do_dropdown(driver, XPATH_FILTRO),
+    }
+
+def descobrir_opcoes(driver):
+    """
+    Anos e redes dos dropdowns (observatorio.descoberta). As modalidades
+    ficam de fora: a lista muda com o ano e `navegar` já segue sem elas.
+    """
+    return {
+        "ano": opcoes_do_dropdown(driver, XPATH_ANO),
+        "rede": opcoes_do_dropdown(driver, XPATH_REDE),
+    }
+
+
+# --- CENSO POR FILTROS (escolas + matrículas detalhadas) ---
+
+def total_escolas(lido, ano):
+    """ Valor do card de escolas (texto, como antes), ou None se não apareceu """
+    if lido["via"] == "xpath":
+        return (lido["texto"] or "").strip() or None
+    numeros = [n for n in lido["numeros"] if n != int(ano)]
+    return str(max(numeros)) if numeros else None
+
+def classificar_linha(linha):
+    """ (termo mais específico da linha, linha sem os termos) ou (None, linha) """
+    achados = RE_TERMOS_MATRICULA.findall(linha)
+    if not achados:
+        return None, linha
+    termo = min(achados, key=ESPECIFICIDADE.__getitem__)
+    # Tira os termos antes de ler os números ("1º ano" não vira o número 1)
+    return termo, RE_TERMOS_MATRICULA.sub(" ", linha)
+
+def capturar_matriculas_do_texto(texto, ano, nome_filtro):
+    """
+    Matrículas detalhadas a partir do texto do #main (navegador ou cache) ou
+    das linhas "rótulo número" dos payloads JSON (motor HTTP).
+    Um registro por modalidade: vale a primeira linha da tela com número válido.
+    """
+    dados = {}
+    for linha in (texto or "").split("\n"):
+        termo, resto = classificar_linha(linha)
+        if termo is None or termo in dados:
+            continue
+        # Filtra o ano (2024) e números absurdos
+        valores_validos = [v for v in numeros_do_texto(resto) if v != int(ano) and v < 500000]
+        if valores_validos:
+            dados[termo] = {
+                "Ano": ano,
+                "Filtro Aplicado": nome_filtro,
+                "Modalidade": termo,
+                "Matrículas": max(valores_validos)
+            }
+    return list(dados.values())
+
+def montar_resultado_filtros(qtd_escolas, mats, ano, nome_filtro):
+    return {
+        "escolas": {"Ano": ano, "Filtro Aplicado": nome_filtro, "Total Escolas": qtd_escolas or "N/D"},
+        "matriculas": mats,
+    }
+
+def extrair_filtros_navegador(driver, html, celula):
+    """ Escolas (um script na página) e matrículas (texto do #main) da tela aberta """
+    nome_filtro, ano = celula
+
+    # 4. CAPTURAR TOTAL DE ESCOLAS (uma única chamada ao navegador)
+    try:
+        qtd_escolas = total_escolas(ler_cards(driver, [CARD_ESCOLAS], SELETOR_DADOS)["Total Escolas"], ano)
+    except Exception:
+        qtd_escolas = None
+    if qtd_escolas:
+        print(f"   🏫 Escolas: {qtd_escolas}")
+    else:
+        print("   ⚠️ Valor de escolas não visível.")
+
+    # 5. CAPTURAR MATRÍCULAS DA TELA
+    try:
+        mats = capturar_matriculas_do_texto(driver.find_element(By.ID, "main").text, ano, nome_filtro)
+    except Exception:
+        mats = []
+    if mats:
+        print(f"   🔍 Matrículas capturadas: {len(mats)} registros.")
+    else:
+        print("   ⚠️ Nenhuma matrícula específica encontrada na tela.")
+
+    return montar_resultado_filtros(qtd_escolas, mats, ano, nome_filtro)
+
+def extrair_filtros_html(html, celula):
+    """ Mesma leitura a partir de um HTML (cache de telas) """
+    nome_filtro, ano = celula
+    qtd_escolas = total_escolas(ler_cards_html(html, [CARD_ESCOLAS])["Total Escolas"], ano)
+    mats = capturar_matriculas_do_texto(texto_da_regiao(html), ano, nome_filtro)
+    if not qtd_escolas and not mats:
+        return None
+    return montar_resultado_filtros(qtd_escolas, mats, ano, nome_filtro)
+
+def extrair_filtros_json(payloads, celula):
+    """ Mesma leitura a partir dos payloads JSON da célula (motor HTTP) """
+    nome_filtro, ano = celula
+    qtd_escolas = total_escolas(ler_cards_json(payloads, [CARD_ESCOLAS])["Total Escolas"], ano)
+    mats = capturar_matriculas_do_texto(texto_dos_pares(pares_dos_payloads(payloads)), ano, nome_filtro)
+    if not qtd_escolas and not mats:
+        return None
+    return montar_resultado_filtros(qtd_escolas, mats, ano, nome_filtro)
+
+def tabelas_filtros(resultados):
+    todos_dados_escolas = [r["escolas"] for r in resultados if r]
+    todos_dados_matriculas = [m for r in resultados if r for m in r["matriculas"]]
+
+    if not (todos_dados_escolas or todos_dados_matriculas):
+        print("❌ Nenhum dado coletado.")
+        return {}
+
+    tabelas = {}
+    # Escolas ("N/D" fica nulo no esquema)
+    if todos_dados_escolas:
+        tabelas[CONJUNTO_ESCOLAS.nome] = pd.DataFrame(todos_dados_escolas)
+
+    # Matrículas
+    if todos_dados_matriculas:
+        # Remove duplicatas
+        tabelas[CONJUNTO_MATRICULAS_DETALHADAS.nome] = pd.DataFrame(todos_dados_matriculas).drop_duplicates()
+
+    return tabelas
+
+
+# --- MATRÍCULAS POR ETAPA (6 cards) ---
+
+def valores_dos_cards(lidos, ano_ignorar):
+    """ {etapa: maior número plausível do card (0 se não houver)} """
+    return {nome_etapa: maior_numero(lidos[nome_etapa]["numeros"], ano_ignorar) for nome_etapa in MAPA_DIVS}
+
+def maior_numero(numeros, ano_ignorar):
+    """ Maior número plausível de um card (0 se não houver) """
+    # Filtros básicos: o ano selecionado aparece no card e não é contagem
+    validos = [v for v in numeros if v != int(ano_ignorar) and v < 500000]
+    return max(validos) if validos else 0
+
+def linhas_matriculas(valores, celula):
+    nome_filtro, ano = celula
+    return [
+        {
+            "Ano": ano,
+            "Filtro Geral": nome_filtro,
+            "Etapa": nome_etapa,
+            "Matrículas": valor
+        }
+        for nome_etapa, valor in valores.items()
+    ]
+
+def extrair_matriculas_navegador(driver, html, celula):
+    """
+    Lê os 6 cards numa única chamada ao navegador. None se o script falhar
+    ou nenhum card tiver número: seis zeros gravados apagariam as contagens
+    do armazém, e sem resultado a célula é refeita na próxima execução.
+    """
+    nome_filtro, ano = celula
+    try:
+        valores = valores_dos_cards(ler_cards(driver, CARDS, SELETOR_DADOS), ano)
+    except Exception as e:
+        # Script falhou (ex.: página trocando)
+        print(f"   ⚠️ Leitura dos cards falhou ({type(e).__name__}).")
+        return None
+    count = sum(1 for valor in valores.values() if valor > 0)
+    if not count:
+        print("   ⚠️ Nenhum card de matrícula com valor na tela.")
+        return None
+    print(f"   -> {count} valores encontrados (6 linhas geradas).")
+    return linhas_matriculas(valores, celula)
+
+def extrair_matriculas_html(html, celula):
+    """ Mesma leitura por rótulo dos cards, a partir de um HTML """
+    nome_filtro, ano = celula
+    linhas = linhas_matriculas(valores_dos_cards(ler_cards_html(html, CARDS), ano), celula)
+    # Nenhum card encontrado: deixa a célula para o Selenium
+    return linhas if any(linha["Matrículas"] > 0 for linha in linhas) else None
+
+def extrair_matriculas_json(payloads, celula):
+    """ Mesma leitura por rótulo dos cards, a partir dos payloads JSON """
+    nome_filtro, ano = celula
+    linhas = linhas_matriculas(valores_dos_cards(ler_cards_json(payloads, CARDS), ano), celula)
+    # Nenhum card nos payloads: deixa a célula para o Selenium
+    return linhas if any(linha["Matrículas"] > 0 for linha in linhas) else None
+
+def tabelas_matriculas(resultados):
+    todos_dados = [linha for linhas in resultados if linhas for linha in linhas]
+    if not todos_dados:
+        print("❌ Nenhum dado coletado.")
+        return {}
+
+    # A ordenação (filtro, ano, card) é aplicada na exportação (ordenar_etapas)
+    return {CONJUNTO_MATRICULAS_ETAPA.nome: pd.DataFrame(todos_dados)}
+
+
+# --- DEFINIÇÃO DOS TRABALHOS ---
+
+TELA = Tela(
+    nome="QEdu Censo Escolar",
+    url_base=URL_BASE,
+    montar_grade=montar_grade,
+    navegar=navegar,
+    filtros_da_celula=filtros_da_celula,
+    descrever=descrever,
+    filtros_na_tela=filtros_na_tela,
+    descobrir_opcoes=descobrir_opcoes,
+)
+
+CENSO_FILTROS = Trabalho(
+    nome="censo-filtros",
+    descricao="Escolas e matrículas por filtro do Censo Escolar",
+    tela=TELA,
+    extrair_html=extrair_filtros_html,
+    extrair_json=extrair_filtros_json,
+    extrair_navegador=extrair_filtros_navegador,
+    tabelas=tabelas_filtros,
+    conjuntos=(CONJUNTO_ESCOLAS, CONJUNTO_MATRICULAS_DETALHADAS),
+    arquivo_saida="Censo_Escolar_SJM_Filtros_Detalhados.xlsx",
+)
+
+CENSO_MATRICULAS = Trabalho(
+    nome="censo-matriculas",
+    descricao="Matrículas por etapa do Censo Escolar (6 itens)",
+    tela=TELA,
+    extrair_html=extrair_matriculas_html,
+    extrair_json=extrair_matriculas_json,
+    extrair_navegador=extrair_matriculas_navegador,
+    tabelas=tabelas_matriculas,
+    conjuntos=(CONJUNTO_MATRICULAS_ETAPA,),
+    arquivo_saida="Censo_SJM_Matriculas_6_Itens_Garantidos.xlsx",
+)
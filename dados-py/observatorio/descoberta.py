@@ -0,0 +1,121 @@
+"""
+Descoberta das opções de filtro antes da coleta ao vivo.
+
+As grades listam anos às cegas (ANOS_BUSCA vai de 2024 a 2010, ANOS_SAEB é
+fixo). Quando um ano ou filtro não existe na tela, `forcar_clique` e
+`selecionar_dropdown` só descobrem isso depois de esperar o WebDriverWait
+(5 a 10 s por célula).
+
+Aqui a tela é aberta uma vez e a função `descobrir_opcoes` da tela lê, numa
+passada, as opções de cada dropdown e de cada grupo de botões:
+{filtro: [opções]}, com as mesmas chaves de `filtros_da_celula`. As células
+com algum filtro fora das opções saem da grade antes da divisão entre os
+workers, com o motivo impresso e gravado como span "celula_podada" na
+telemetria. Um filtro sem opções lidas (None ou lista vazia) não poda nada.
+
+As opções ficam em <pasta da cache de telas>/opcoes.json por
+VALIDADE_OPCOES: uma leitura por página por dia, não por célula.
+"""
+import json
+import os
+import time
+
+from observatorio.espera import aguardar_estabilizacao
+from observatorio.navegador import abrir_navegador
+from observatorio.telemetria import span
+
+ARQUIVO_OPCOES = "opcoes.json"
+VALIDADE_OPCOES = 24 * 3600
+
+
+def carregar_opcoes(pasta_cache, url, validade=VALIDADE_OPCOES):
+    """ Opções guardadas da tela, se ainda valem """
+    try:
+        with open(os.path.join(pasta_cache, ARQUIVO_OPCOES), encoding="utf-8") as f:
+            guardadas = json.load(f).get(url)
+    except (OSError, ValueError):
+        return None
+    if guardadas and time.time() - guardadas["lido_em"] < validade:
+        return guardadas["opcoes"]
+    return None
+
+
+def guardar_opcoes(pasta_cache, url, opcoes):
+    caminho = os.path.join(pasta_cache, ARQUIVO_OPCOES)
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            todas = json.load(f)
+    except (OSError, ValueError):
+        todas = {}
+    todas[url] = {"lido_em": time.time(), "opcoes": opcoes}
+    os.makedirs(pasta_cache, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(todas, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def ler_opcoes_da_tela(url_base, descobrir_opcoes, headless=False, perfil=None):
+    """ Abre a tela e lê as opções dos filtros; None se não der (a grade segue inteira) """
+    try:
+        with span("descoberta_opcoes", url=url_base):
+            with abrir_navegador(headless, perfil, url_base) as driver:
+                if getattr(driver, "url_aquecida", None) != url_base:
+                    driver.get(url_base)
+                    aguardar_estabilizacao(driver, timeout=20)
+                return descobrir_opcoes(driver)
+    except Exception as e:
+        print(f"⚠️ Não consegui ler as opções da tela ({e}). Seguindo com a grade inteira.")
+        return None
+
+
+def motivo_indisponivel(filtros, opcoes):
+    """ Por que a célula não existe na tela (None se todos os filtros têm opção) """
+    for chave, valor in filtros.items():
+        disponiveis = opcoes.get(chave)
+        if not disponiveis:
+            continue
+        # Mesmo critério flexível dos dropdowns: a opção contém o texto pedido
+        if not any(str(valor).lower() in op.lower() for op in disponiveis):
+            return f"{chave} {valor} indisponível"
+    return None
+
+
+def podar_grade(celulas, filtros_da_celula, opcoes):
+    """ (células disponíveis, {célula: motivo} das que saíram) """
+    disponiveis, podadas = [], {}
+    for celula in celulas:
+        motivo = motivo_indisponivel(filtros_da_celula(celula), opcoes)
+        if motivo:
+            podadas[celula] = motivo
+        else:
+            disponiveis.append(celula)
+    return disponiveis, podadas
+
+
+def so_disponiveis(executar, url_base, filtros_da_celula, descobrir_opcoes, headless=False, perfil=None,
+                   pasta_cache=None):
+    """
+    Envolve `executar(subgrade) -> resultados`: as células sem opção na tela
+    não são executadas e ficam com None (tentadas de novo na próxima coleta).
+    """
+    def executar_disponiveis(subgrade):
+        opcoes = carregar_opcoes(pasta_cache, url_base) if pasta_cache else None
+        if opcoes is None:
+            opcoes = ler_opcoes_da_tela(url_base, descobrir_opcoes, headless, perfil)
+            if opcoes is None:
+                return executar(subgrade)
+            if pasta_cache:
+                guardar_opcoes(pasta_cache, url_base, opcoes)
+
+        disponiveis, podadas = podar_grade(subgrade, filtros_da_celula, opcoes)
+        if podadas:
+            print(f"✂️ {len(podadas)}/{len(subgrade)} células sem opção na tela, puladas sem esperar:")
+            for celula, motivo in podadas.items():
+                print(f"   - {celula}: {motivo}")
+                with span("celula_podada", str(celula)) as medicao:
+                    medicao.resultado, medicao.causa = "podada", motivo
+
+        resultados = dict(zip(disponiveis, executar(disponiveis))) if disponiveis else {}
+        return [resultados.get(celula) for celula in subgrade]
+    return executar_disponiveis
@@ -0,0 +1,77 @@
+"""
+Diário de execução: cada célula concluída vai para o disco na hora.
+
+Se a coleta cair no meio (Chrome travado, queda de luz, Ctrl+C), a próxima
+execução lê o diário e pula as células que já estavam prontas, pagando só
+o que faltou.
+
+O diário é uma pasta com um arquivo JSON Lines por processo (os workers
+paralelos nunca escrevem no mesmo arquivo). Cada linha é gravada com flush
++ fsync; uma última linha truncada pela queda é simplesmente ignorada.
+"""
+import glob
+import json
+import os
+import shutil
+import time
+
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".diarios")
+
+
+def chave_celula(celula):
+    """ Identificador estável da célula (tuplas e listas viram a mesma chave) """
+    return json.dumps(list(celula), ensure_ascii=False)
+
+
+def completo(resultado):
+    """ Célula com dados em todos os trabalhos ({trabalho: dados}) """
+    if isinstance(resultado, dict):
+        return bool(resultado) and all(resultado.values())
+    return bool(resultado)
+
+
+class DiarioExecucao:
+    """ Diário append-only de células concluídas """
+
+    def __init__(self, pasta):
+        self.pasta = pasta
+        self._arquivo = None
+        os.makedirs(pasta, exist_ok=True)
+
+    def registrar(self, celula, resultado):
+        """ Grava a célula concluída (completa) e só retorna depois de chegar ao disco """
+        if self._arquivo is None:
+            caminho = os.path.join(self.pasta, f"diario-{os.getpid()}.jsonl")
+            self._arquivo = open(caminho, "a", encoding="utf-8")
+        linha = {"celula": list(celula), "resultado": resultado, "em": time.time()}
+        self._arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+
+    def concluidas(self):
+        """
+        {chave da célula: resultado} de tudo que já foi gravado. Resultados
+        com algum trabalho vazio (de diários antigos, que gravavam células
+        parciais) não contam como concluídos.
+        """
+        feitas = {}
+        for caminho in sorted(glob.glob(os.path.join(self.pasta, "*.jsonl"))):
+            with open(caminho, encoding="utf-8") as f:
+                for linha in f:
+                    try:
+                        registro = json.loads(linha)
+                    except json.JSONDecodeError:
+                        continue  # Linha cortada no meio da gravação
+                    if completo(registro["resultado"]):
+                        feitas[chave_celula(registro["celula"])] = registro["resultado"]
+        return feitas
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+
+def limpar_diario(pasta):
+    """ Apaga o diário (coleta terminada, próxima execução começa do zero) """
+    shutil.rmtree(pasta, ignore_errors=True)
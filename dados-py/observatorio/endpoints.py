@@ -0,0 +1,227 @@
+"""
+Endpoints JSON do QEdu: as requisições de dados que o front-end faz para
+montar cada tela, gravadas numa coleta pelo navegador e reaproveitadas
+pelo motor HTTP (observatorio.coleta_http).
+
+Gravação (--gravar-endpoints, variável OBSERVATORIO_GRAVAR_ENDPOINTS,
+herdada pelos workers): depois de navegar cada célula, o log de performance
+do Chrome (o mesmo do --medir-rede) é lido e as respostas JSON de
+XHR/fetch a GET daquela navegação são anotadas em .endpoints.sqlite, uma
+linha por (tela, célula, URL). Requisições POST não são reproduzidas.
+
+Atribuição: uma URL vista na navegação de uma célula só é dela. Vista em
+várias (menus e configurações da tela, ou o dado da célula anterior que a
+tela recarrega antes do clique seguinte), vale para a célula cujos filtros
+mais aparecem na URL (parâmetro ou trecho do caminho, como no link direto);
+sem uma única melhor, a URL é da tela, não de uma célula, e fica de fora.
+
+As gravações são por máquina; `exportar`/`importar` levam para outra, e
+`gravar-replay` baixa todos os endpoints para uma pasta do servidor de
+replay (observatorio.servidor_replay).
+
+Uso:
+    python -m observatorio.endpoints situacao
+    python -m observatorio.endpoints exportar ENDPOINTS.json
+    python -m observatorio.endpoints importar ENDPOINTS.json
+    python -m observatorio.endpoints gravar-replay PASTA
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from observatorio.diario import chave_celula
+from observatorio.link_direto import normalizar, slug
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".endpoints.sqlite")
+VARIAVEL_AMBIENTE = "OBSERVATORIO_GRAVAR_ENDPOINTS"
+TIPOS_REQUISICAO = {"XHR", "Fetch"}
+
+
+def gravacao_ligada():
+    return os.environ.get(VARIAVEL_AMBIENTE) == "1"
+
+
+# --- LEITURA DO LOG DO NAVEGADOR ---
+
+def urls_json(driver):
+    """ URLs das respostas JSON (XHR/fetch, GET, 200) desde a última leitura do log """
+    # Import local: o log só existe nos perfis com goog:loggingPrefs
+    from observatorio.perfis import ler_log_performance
+
+    try:
+        mensagens = ler_log_performance(driver)
+    except Exception:
+        return []
+    metodos, urls = {}, []
+    for mensagem in mensagens:
+        parametros = mensagem.get("params", {})
+        if mensagem.get("method") == "Network.requestWillBeSent":
+            metodos[parametros.get("requestId")] = parametros.get("request", {}).get("method")
+        elif mensagem.get("method") == "Network.responseReceived":
+            resposta = parametros.get("response", {})
+            if (parametros.get("type") in TIPOS_REQUISICAO
+                    and "json" in (resposta.get("mimeType") or "")
+                    and resposta.get("status") == 200
+                    and metodos.get(parametros.get("requestId"), "GET") == "GET"
+                    and resposta.get("url") not in urls):
+                urls.append(resposta["url"])
+    return urls
+
+
+# --- ATRIBUIÇÃO ---
+
+def pontuacao(url, filtros):
+    """ Quantos filtros da célula aparecem na URL (valor de parâmetro ou trecho do caminho) """
+    partes = urlsplit(url)
+    trechos = [unquote(segmento) for segmento in partes.path.split("/") if segmento]
+    trechos += [valor for _, valor in parse_qsl(partes.query)]
+    normalizados = {normalizar(trecho) for trecho in trechos} | set(trechos)
+    return sum(1 for valor in filtros.values() if normalizar(valor) in normalizados or slug(valor) in normalizados)
+
+
+def atribuir(vistas, filtros_da_celula):
+    """ {chave da célula: [URLs vistas]} -> {chave da célula: [URLs dela]} """
+    celulas_por_url = {}
+    for chave, urls in vistas.items():
+        for url in urls:
+            celulas_por_url.setdefault(url, []).append(chave)
+
+    dono = {}
+    for url, chaves in celulas_por_url.items():
+        if len(chaves) == 1:
+            dono[url] = chaves[0]
+            continue
+        pontos = {chave: pontuacao(url, filtros_da_celula(tuple(json.loads(chave)))) for chave in chaves}
+        melhor = max(pontos.values())
+        melhores = [chave for chave, ponto in pontos.items() if ponto == melhor]
+        if melhor > 0 and len(melhores) == 1:
+            dono[url] = melhores[0]
+
+    return {
+        chave: [url for url in urls if dono.get(url) == chave]
+        for chave, urls in vistas.items()
+        if any(dono.get(url) == chave for url in urls)
+    }
+
+
+# --- ARMAZENAMENTO ---
+
+class Endpoints:
+    """ URLs JSON vistas na navegação de cada célula, por tela """
+
+    def __init__(self, arquivo=ARQUIVO_PADRAO):
+        self.conexao = sqlite3.connect(arquivo, timeout=30)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("""
+            CREATE TABLE IF NOT EXISTS vistas (
+                tela TEXT NOT NULL,
+                celula TEXT NOT NULL,
+                url TEXT NOT NULL,
+                posicao INTEGER NOT NULL,
+                vista_em REAL NOT NULL,
+                PRIMARY KEY (tela, celula, url)
+            )
+        """)
+        self.conexao.commit()
+
+    def registrar(self, tela, celula, urls):
+        """ Troca as URLs anotadas da célula pelas da última navegação """
+        chave, agora = chave_celula(celula), time.time()
+        with self.conexao:
+            self.conexao.execute("DELETE FROM vistas WHERE tela = ? AND celula = ?", (tela, chave))
+            self.conexao.executemany(
+                "INSERT OR IGNORE INTO vistas VALUES (?, ?, ?, ?, ?)",
+                [(tela, chave, url, posicao, agora) for posicao, url in enumerate(urls)],
+            )
+
+    def vistas(self, tela):
+        """ {chave da célula: [URLs na ordem em que chegaram]} """
+        vistas = {}
+        for chave, url in self.conexao.execute(
+            "SELECT celula, url FROM vistas WHERE tela = ? ORDER BY celula, posicao", (tela,)
+        ):
+            vistas.setdefault(chave, []).append(url)
+        return vistas
+
+    def da_tela(self, tela, filtros_da_celula):
+        """ {chave da célula: [URLs dela]} depois da atribuição """
+        return atribuir(self.vistas(tela), filtros_da_celula)
+
+    def exportar(self):
+        """ {tela: {chave da célula: [URLs]}} de tudo o que foi gravado """
+        telas = [tela for (tela,) in self.conexao.execute("SELECT DISTINCT tela FROM vistas ORDER BY tela")]
+        return {tela: self.vistas(tela) for tela in telas}
+
+    def importar(self, gravacoes):
+        """ Grava as vistas exportadas de outra máquina (as células delas são trocadas) """
+        for tela, vistas in gravacoes.items():
+            for chave, urls in vistas.items():
+                self.registrar(tela, json.loads(chave), urls)
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def endpoints_da_tela(tela, arquivo=ARQUIVO_PADRAO):
+    """ célula -> [URLs JSON dela] ([] se a tela nunca foi gravada) """
+    if not os.path.exists(arquivo):
+        return lambda celula: []
+    endpoints = Endpoints(arquivo)
+    try:
+        por_celula = endpoints.da_tela(tela.nome, tela.filtros_da_celula)
+    finally:
+        endpoints.fechar()
+    return lambda celula: por_celula.get(chave_celula(celula), [])
+
+
+def main():
+    from observatorio.conjuntos import TRABALHOS
+    from observatorio.executor import agrupar_por_tela
+
+    parser = argparse.ArgumentParser(description="Endpoints JSON do QEdu gravados para o motor HTTP.")
+    parser.add_argument("--arquivo", default=ARQUIVO_PADRAO, help="Banco das gravações")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("situacao", help="Células de cada tela com endpoint próprio")
+    p_exportar = sub.add_parser("exportar", help="Grava as vistas num JSON")
+    p_exportar.add_argument("destino")
+    p_importar = sub.add_parser("importar", help="Carrega as vistas de um JSON exportado")
+    p_importar.add_argument("origem")
+    p_replay = sub.add_parser("gravar-replay", help="Baixa os endpoints das telas para uma pasta de replay")
+    p_replay.add_argument("pasta")
+    args = parser.parse_args()
+
+    telas = [tela for tela, _ in agrupar_por_tela(TRABALHOS.values())]
+    endpoints = Endpoints(args.arquivo)
+    try:
+        if args.comando == "situacao":
+            for tela in telas:
+                por_celula = endpoints.da_tela(tela.nome, tela.filtros_da_celula)
+                marca = "✅" if len(por_celula) == len(tela.montar_grade()) else "⚠️"
+                print(f"   {marca} {tela.nome}: {len(por_celula)}/{len(tela.montar_grade())} células com endpoint")
+        elif args.comando == "exportar":
+            with open(args.destino, "w", encoding="utf-8") as f:
+                json.dump(endpoints.exportar(), f, ensure_ascii=False, indent=2)
+            print(f"💾 Endpoints exportados para: {args.destino}")
+        elif args.comando == "importar":
+            with open(args.origem, encoding="utf-8") as f:
+                endpoints.importar(json.load(f))
+            print(f"📥 Endpoints importados de: {args.origem}")
+        else:
+            # Import local: o servidor de replay só é necessário para gravar
+            from observatorio.servidor_replay import gravar_urls
+
+            urls = sorted({
+                url for tela in telas
+                for urls in endpoints.da_tela(tela.nome, tela.filtros_da_celula).values() for url in urls
+            })
+            gravar_urls(args.pasta, urls)
+            print(f"💾 {len(urls)} endpoints gravados em {args.pasta}")
+    finally:
+        endpoints.fechar()
+
+
+if __name__ == "__main__":
+    main()
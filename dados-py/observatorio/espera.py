@@ -0,0 +1,146 @@
+"""
+Espera por eventos da página (substitui os time.sleep fixos).
+
+Depois de um clique ou troca de dropdown, em vez de dormir 3-5 s, observamos
+a própria página até ela "assentar":
+  - nenhuma requisição XHR/fetch pendente;
+  - nenhuma mutação de DOM na região de dados por um curto intervalo;
+  - a impressão digital (hash do textContent) da região já mudou.
+
+Se a impressão não mudar, a espera devolve `mudou=False` para o script
+saber que a tela continua igual (clique sem efeito ou tela velha).
+"""
+import time
+from dataclasses import dataclass
+
+from observatorio.telemetria import span
+
+# --- CONFIGURAÇÃO PADRÃO ---
+SELETOR_PADRAO = "#main"        # Região onde ficam gráficos e cards
+TIMEOUT_PADRAO = 10             # Desiste depois disso (segundos)
+QUIETUDE_PADRAO = 0.4           # Tempo sem mutações/requisições para considerar "assentado"
+TOLERANCIA_SEM_MUDANCA = 1.5    # Quanto esperar pela mudança antes de concluir que nada mudou
+INTERVALO_CONSULTA = 0.1
+
+# Instala (uma vez por página) o monitor de requisições e mutações.
+# Contamos fetch/XHR pendentes e guardamos o instante da última mutação
+# dentro da região observada.
+JS_INSTALAR_MONITOR = """
+const seletor = arguments[0];
+let m = window.__observatorioMonitor;
+if (!m) {
+    m = { pendentes: 0, ultimaMutacao: performance.now(), seletor: seletor };
+    const fetchOriginal = window.fetch;
+    if (fetchOriginal) {
+        window.fetch = function () {
+            m.pendentes++;
+            return fetchOriginal.apply(this, arguments).finally(() => { m.pendentes--; });
+        };
+    }
+    const sendOriginal = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        m.pendentes++;
+        this.addEventListener('loadend', () => { m.pendentes--; }, { once: true });
+        return sendOriginal.apply(this, arguments);
+    };
+    new MutationObserver((registros) => {
+        const regiao = document.querySelector(m.seletor);
+        if (!regiao || registros.some(r => regiao.contains(r.target))) {
+            m.ultimaMutacao = performance.now();
+        }
+    }).observe(document.documentElement, {
+        subtree: true, childList: true, characterData: true, attributes: true
+    });
+    window.__observatorioMonitor = m;
+}
+m.seletor = seletor;
+"""
+
+# Lê o estado atual: requisições pendentes, tempo sem mutações e a
+# impressão digital (FNV-1a + tamanho) do texto da região.
+JS_ESTADO = """
+const m = window.__observatorioMonitor;
+const regiao = document.querySelector(arguments[0]);
+const texto = regiao ? regiao.textContent : '';
+let h = 2166136261;
+for (let i = 0; i < texto.length; i++) {
+    h ^= texto.charCodeAt(i);
+    h = Math.imul(h, 16777619);
+}
+return {
+    instalado: !!m,
+    pronto: document.readyState === 'complete',
+    pendentes: m ? Math.max(0, m.pendentes) : 0,
+    ociosoMs: m ? performance.now() - m.ultimaMutacao : 0,
+    impressao: (h >>> 0).toString(16) + ':' + texto.length
+};
+"""
+
+
+@dataclass
+class Estabilizacao:
+    """ Resultado de uma espera """
+    estavel: bool       # A página assentou antes do timeout
+    mudou: bool         # A região de dados mudou em relação a antes da ação
+    duracao: float      # Segundos gastos esperando
+    impressao: str      # Impressão digital da região ao final da espera
+
+
+def instalar_monitor(driver, seletor=SELETOR_PADRAO):
+    """ Instala o monitor na página atual (não faz nada se já existir) """
+    driver.execute_script(JS_INSTALAR_MONITOR, seletor)
+
+
+def capturar_impressao(driver, seletor=SELETOR_PADRAO):
+    """ Impressão digital do texto da região de dados """
+    return driver.execute_script(JS_ESTADO, seletor)["impressao"]
+
+
+def aguardar_estabilizacao(driver, impressao_anterior=None, seletor=SELETOR_PADRAO,
+                           timeout=TIMEOUT_PADRAO, quietude=QUIETUDE_PADRAO,
+                           tolerancia_sem_mudanca=TOLERANCIA_SEM_MUDANCA):
+    """
+    Espera a página assentar e devolve um Estabilizacao.
+    Com `impressao_anterior`, espera também a região mudar; se ela continuar
+    igual por `tolerancia_sem_mudanca` segundos, retorna com mudou=False.
+    """
+    inicio = time.monotonic()
+    while True:
+        estado = driver.execute_script(JS_ESTADO, seletor)
+        if not estado["instalado"]:
+            # Página recarregou (ou é a primeira consulta): reinstala o monitor
+            instalar_monitor(driver, seletor)
+
+        decorrido = time.monotonic() - inicio
+        quieto = (
+            estado["instalado"]
+            and estado["pronto"]
+            and estado["pendentes"] == 0
+            and estado["ociosoMs"] >= quietude * 1000
+        )
+        mudou = impressao_anterior is None or estado["impressao"] != impressao_anterior
+
+        if quieto and (mudou or decorrido >= tolerancia_sem_mudanca):
+            return Estabilizacao(True, mudou, decorrido, estado["impressao"])
+        if decorrido >= timeout:
+            return Estabilizacao(False, mudou, decorrido, estado["impressao"])
+
+        time.sleep(INTERVALO_CONSULTA)
+
+
+def executar_e_aguardar(driver, acao, seletor=SELETOR_PADRAO, timeout=TIMEOUT_PADRAO):
+    """
+    Roda `acao()` (um clique, um select...) e espera a página assentar.
+    A impressão é tirada antes da ação para sabermos se algo mudou.
+    """
+    instalar_monitor(driver, seletor)
+    impressao_antes = capturar_impressao(driver, seletor)
+    with span("acao"):
+        acao()
+    with span("espera") as medicao:
+        resultado = aguardar_estabilizacao(driver, impressao_antes, seletor, timeout)
+        if not resultado.estavel:
+            medicao.resultado, medicao.causa = "timeout", "tela_nao_assentou"
+        elif not resultado.mudou:
+            medicao.resultado = "sem_mudanca"
+    return resultado
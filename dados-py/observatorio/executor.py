@@ -0,0 +1,264 @@
+"""
+Executor dos trabalhos de coleta (ponto de entrada: python -m observatorio).
+
+Agrupa os trabalhos pela tela de origem e, para cada tela, resolve a grade
+uma única vez (diário, cache, motor ao vivo) com um extrator composto que
+devolve {nome do trabalho: resultado} por célula. Depois cada trabalho
+recebe a sua parte e grava as suas tabelas no armazém (upsert por ano);
+com --excel, a planilha do trabalho é exportada do armazém em seguida.
+
+Sem workers paralelos, todas as telas usam o mesmo Chrome (sessão
+compartilhada): uma atualização completa paga a subida do navegador uma
+vez só.
+"""
+import argparse
+import os
+from contextlib import ExitStack, nullcontext
+from functools import partial
+
+from observatorio.armazem import PASTA_PADRAO as PASTA_ARMAZEM
+from observatorio.armazem import Armazem, resumo_gravacao
+from observatorio.cache_telas import CacheTelas
+from observatorio.coleta import adicionar_argumentos_coleta, coletar_grade, finalizar_coleta, opcoes_coleta
+from observatorio.conjuntos import TRABALHOS
+from observatorio.diario import DiarioExecucao
+from observatorio.endpoints import Endpoints, endpoints_da_tela, gravacao_ligada, urls_json
+from observatorio.espera import aguardar_estabilizacao, capturar_impressao
+from observatorio.link_direto import LinkDireto, link_direto_ligado
+from observatorio.navegador import abrir_navegador, sessao_compartilhada
+from observatorio.perfis import medir_navegacao
+from observatorio.telemetria import encerrar_execucao, pasta_execucao_atual, span
+from observatorio.trabalhos import caminho_saida
+
+
+def agrupar_por_tela(trabalhos):
+    """ [(tela, [trabalhos da tela]), ...] na ordem em que as telas aparecem """
+    grupos = {}
+    for trabalho in trabalhos:
+        grupos.setdefault(trabalho.tela.nome, (trabalho.tela, []))[1].append(trabalho)
+    return list(grupos.values())
+
+
+def extrair_celula_html(html, celula, trabalhos):
+    """ Extrator composto (cache de telas): None se algum trabalho ficar sem dados """
+    resultado = {}
+    for trabalho in trabalhos:
+        parte = trabalho.extrair_html(html, celula)
+        if not parte:
+            return None
+        resultado[trabalho.nome] = parte
+    return resultado
+
+
+def extrair_celula_json(payloads, celula, trabalhos):
+    """ Extrator composto (motor HTTP): None se algum trabalho ficar sem dados """
+    resultado = {}
+    for trabalho in trabalhos:
+        parte = trabalho.extrair_json(payloads, celula)
+        if not parte:
+            return None
+        resultado[trabalho.nome] = parte
+    return resultado
+
+
+def processar_fatia(numero_worker, fatia, tela, trabalhos, headless=False, perfil=None, pasta_cache=None,
+                    pasta_diario=None):
+    """
+    Navega cada célula da fatia uma vez e roda todos os extratores da tela.
+    Recebe [(índice, célula), ...] e devolve [(índice, {trabalho: resultado}), ...].
+    """
+    cache = CacheTelas(pasta_cache) if pasta_cache else None
+    diario = DiarioExecucao(pasta_diario) if pasta_diario else None
+    # --gravar-endpoints: as requisições JSON de cada célula, para o motor HTTP
+    endpoints = Endpoints() if gravacao_ligada() else None
+    resultados = []
+
+    try:
+        with ExitStack() as pilha:
+            with span("abrir_navegador", worker=numero_worker):
+                driver = pilha.enter_context(abrir_navegador(headless, perfil, tela.url_base))
+
+            # Sessão do serviço de navegadores já parada na tela: pula a carga inicial
+            if getattr(driver, "url_aquecida", None) != tela.url_base:
+                with span("carga_inicial", worker=numero_worker):
+                    driver.get(tela.url_base)
+                    aguardar_estabilizacao(driver, seletor=tela.seletor_dados, timeout=20)  # Carregamento inicial
+                informar_rede(f"[worker {numero_worker}] carga inicial", medir_navegacao(driver))
+
+            # Memória da navegação (ex.: ano já selecionado) entre células da fatia
+            estado = {"worker": numero_worker}
+            # --link-direto: um get por célula, conferido com os filtros mostrados
+            navegar = tela.navegar
+            if link_direto_ligado() and tela.filtros_na_tela is not None:
+                navegar = LinkDireto(tela).navegar
+            # Impressão da última tela extraída: se a próxima for igual, a tela
+            # não atualizou e extrair de novo só geraria linhas repetidas.
+            ultima_impressao = None
+            # Rede somada das navegações da fatia (só nos perfis que medem a rede)
+            rede_fatia = None
+
+            for indice, celula in fatia:
+                descricao = tela.descrever(celula)
+                with span("celula", descricao, worker=numero_worker, tela=tela.nome) as medicao_celula:
+                    if endpoints:
+                        urls_json(driver)  # Descarta o que veio antes desta navegação
+                    with span("navegacao", descricao, worker=numero_worker) as medicao:
+                        navegou = navegar(driver, celula, estado)
+                        if not navegou:
+                            medicao.resultado, medicao.causa = "falha", "filtro_indisponivel"
+                        if endpoints:
+                            # Lidas antes da medição, que esvazia o log de performance
+                            urls = urls_json(driver)
+                        rede = medir_navegacao(driver)
+                        if rede:
+                            medicao.atributos.update(bytes_rede=rede["bytes"], respostas=rede["respostas"],
+                                                     carregamento_ms=rede["carregamento_ms"])
+                            rede_fatia = rede_fatia or {"bytes": 0, "respostas": 0}
+                            rede_fatia["bytes"] += rede["bytes"]
+                            rede_fatia["respostas"] += rede["respostas"]
+                    if not navegou:
+                        medicao_celula.resultado, medicao_celula.causa = "falha", "filtro_indisponivel"
+                        continue
+
+                    impressao = capturar_impressao(driver, tela.seletor_dados)
+                    if impressao == ultima_impressao:
+                        print(f"   ⚠️ Tela de {descricao} igual à anterior (não atualizou). Pulando.")
+                        medicao_celula.resultado, medicao_celula.causa = "falha", "tela_repetida"
+                        continue
+                    ultima_impressao = impressao
+
+                    # Uma captura para todos os trabalhos (e para a re-extração offline)
+                    with span("page_source", descricao, worker=numero_worker) as medicao:
+                        html = driver.page_source
+                        medicao.atributos["bytes"] = len(html)
+                    if cache:
+                        with span("cache_gravar", descricao, worker=numero_worker):
+                            cache.guardar(tela.url_base, tela.filtros_da_celula(celula), html)
+                    if endpoints:
+                        # Mais as respostas que chegaram durante a captura
+                        urls += [url for url in urls_json(driver) if url not in urls]
+                        endpoints.registrar(tela.nome, celula, urls)
+                    resultado = {}
+                    for trabalho in trabalhos:
+                        with span("extracao", descricao, worker=numero_worker, trabalho=trabalho.nome) as medicao:
+                            resultado[trabalho.nome] = trabalho.extrair_ao_vivo(driver, html, celula)
+                            if not resultado[trabalho.nome]:
+                                medicao.resultado, medicao.causa = "falha", "sem_dados"
+                    resultados.append((indice, resultado))
+                    if not all(resultado.values()):
+                        # Célula parcial não vai para o diário: a retomada a refaz inteira
+                        medicao_celula.resultado, medicao_celula.causa = "falha", "sem_dados"
+                    elif diario:
+                        diario.registrar(celula, resultado)
+
+            informar_rede(f"[worker {numero_worker}] {len(fatia)} células", rede_fatia)
+
+    except Exception as e:
+        # Devolve o que já foi extraído; as outras fatias seguem normalmente
+        print(f"❌ Erro fatal no worker {numero_worker}: {e}")
+    finally:
+        if cache:
+            cache.fechar()
+        if diario:
+            diario.fechar()
+        if endpoints:
+            endpoints.fechar()
+
+    return resultados
+
+
+def informar_rede(rotulo, medicao):
+    """ Bytes e tempo de uma medição de rede (None: o perfil não mede a rede) """
+    if medicao:
+        tempo = f", página carregada em {medicao['carregamento_ms']} ms" if medicao.get("carregamento_ms") else ""
+        print(f"📶 {rotulo}: {medicao['bytes'] / 1024:.0f} KB em {medicao['respostas']} respostas{tempo}")
+
+
+def gravar_trabalho(trabalho, resultados, armazem, excel=False, pasta_saida=None):
+    """ Tabelas do trabalho no armazém (e, se pedido, a exportação para Excel). True se gravou """
+    tabelas = trabalho.tabelas(resultados)
+    if not tabelas:
+        return False
+    for conjunto in trabalho.conjuntos:
+        if conjunto.nome in tabelas:
+            with span("gravacao", conjunto=conjunto.nome, linhas=len(tabelas[conjunto.nome])):
+                situacao = armazem.gravar(conjunto, tabelas[conjunto.nome])
+            print(resumo_gravacao(conjunto, situacao))
+    if excel:
+        destino = caminho_saida(trabalho.arquivo_saida, pasta_saida)
+        with span("exportacao_excel", trabalho=trabalho.nome):
+            armazem.exportar_excel(trabalho.conjuntos, destino)
+        print(f"📂 Exportado para: {destino}")
+    return True
+
+
+def executar_trabalhos(trabalhos, pasta_saida=None, pasta_armazem=None, excel=False, **opcoes):
+    """
+    Coleta os trabalhos e grava no armazém. `opcoes` são as de coletar_grade
+    (veja observatorio.coleta.opcoes_coleta).
+    """
+    armazem = Armazem(pasta_armazem or PASTA_ARMAZEM)
+    pasta_diario = opcoes.pop("pasta_diario", None)
+    compartilhar = opcoes.get("workers", 1) <= 1 and not opcoes.get("offline")
+
+    with sessao_compartilhada(perfil=opcoes.get("perfil")) if compartilhar else nullcontext():
+        for tela, da_tela in agrupar_por_tela(trabalhos):
+            nomes = [trabalho.nome for trabalho in da_tela]
+            print(f"\n🚀 {tela.nome}: {', '.join(trabalho.descricao for trabalho in da_tela)}")
+
+            # Um diário por conjunto de trabalhos (células de conteúdo diferente)
+            diario_tela = os.path.join(pasta_diario, "+".join(nomes)) if pasta_diario else None
+            opcoes_tela = dict(opcoes, pasta_diario=diario_tela)
+            # Motor HTTP: só se todos os trabalhos da tela sabem ler os payloads JSON
+            http = opcoes.get("motor") == "http" and all(trabalho.extrair_json for trabalho in da_tela)
+            resultados = coletar_grade(
+                tela.montar_grade(),
+                partial(processar_fatia, tela=tela, trabalhos=da_tela),
+                partial(extrair_celula_html, trabalhos=da_tela),
+                tela.url_base, tela.filtros_da_celula,
+                descobrir_opcoes=tela.descobrir_opcoes,
+                endpoints_da_celula=endpoints_da_tela(tela) if http else None,
+                extrair_json=partial(extrair_celula_json, trabalhos=da_tela) if http else None,
+                **opcoes_tela,
+            )
+
+            salvos = 0
+            for trabalho in da_tela:
+                print(f"\n💾 {trabalho.descricao}...")
+                parte = [resultado.get(trabalho.nome) if resultado else None for resultado in resultados]
+                if gravar_trabalho(trabalho, parte, armazem, excel, pasta_saida):
+                    salvos += 1
+            if salvos == len(da_tela):
+                finalizar_coleta(**opcoes_tela)
+
+
+def main(trabalhos_padrao=None, nome_execucao="observatorio", descricao=None):
+    """ Linha de comando comum: `python -m observatorio` e os scripts convert-qedu-*.py """
+    parser = argparse.ArgumentParser(description=descricao or "Coleta os conjuntos de dados do Observatório.")
+    parser.add_argument("trabalhos", nargs="*", metavar="trabalho",
+                        help=f"Trabalhos a rodar: {', '.join(TRABALHOS)} (padrão: {' '.join(trabalhos_padrao or ['todos'])})")
+    parser.add_argument("--listar", action="store_true", help="Mostra os trabalhos disponíveis e sai")
+    parser.add_argument("--pasta-armazem", default=PASTA_ARMAZEM, help="Pasta do armazém Parquet")
+    parser.add_argument("--excel", action="store_true",
+                        help="Exporta a planilha de cada trabalho depois de gravar no armazém")
+    parser.add_argument("--pasta-saida", help="Pasta das planilhas exportadas (padrão: dados-py)")
+    adicionar_argumentos_coleta(parser, nome_execucao)
+    args = parser.parse_args()
+
+    if args.listar:
+        for nome, trabalho in TRABALHOS.items():
+            conjuntos = ", ".join(conjunto.nome for conjunto in trabalho.conjuntos)
+            print(f"   {nome:18s} {trabalho.descricao} -> {conjuntos} ({trabalho.arquivo_saida})")
+        return
+
+    nomes = args.trabalhos or trabalhos_padrao or list(TRABALHOS)
+    desconhecidos = [nome for nome in nomes if nome not in TRABALHOS]
+    if desconhecidos:
+        parser.error(f"trabalho desconhecido: {', '.join(desconhecidos)} (opções: {', '.join(TRABALHOS)})")
+    try:
+        executar_trabalhos([TRABALHOS[nome] for nome in nomes], pasta_saida=args.pasta_saida,
+                           pasta_armazem=args.pasta_armazem, excel=args.excel, **opcoes_coleta(args))
+    finally:
+        # Relatório por fase (e o .prom) mesmo se a execução for interrompida
+        if pasta_execucao_atual():
+            encerrar_execucao(pasta_execucao_atual(), args.prometheus)
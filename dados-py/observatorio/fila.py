@@ -0,0 +1,373 @@
+"""
+Fila de trabalho durável para coletar vários municípios em paralelo.
+
+Cada tarefa é uma célula da grade de uma tela num município (município x
+ano x filtro...). A fila é um SQLite (WAL) que vários processos da mesma
+máquina consomem ao mesmo tempo. O arquivo precisa ficar num disco local:
+o WAL do SQLite depende de memória compartilhada e não funciona em pastas
+de rede (NFS, SMB), então não dá para dividir uma fila entre máquinas:
+
+  - `arrendar` entrega um lote de tarefas do mesmo município e da mesma tela
+    (um Chrome navega o lote em sequência) com prazo; um worker que morre
+    não perde as tarefas, elas voltam para a fila quando o prazo vence;
+  - `concluir` guarda o resultado da célula (o mesmo JSON do diário);
+  - `devolver` recoloca a tarefa na fila até MAX_TENTATIVAS, depois dela a
+    tarefa fica como "falhou" (`reabrir` devolve as falhas para a fila).
+
+`concluir` e `devolver` só valem para o dono atual do arrendamento: um
+worker atrasado, cujo prazo venceu e cuja tarefa já foi arrendada por
+outro, não mexe mais nela.
+
+`consolidar` junta os resultados concluídos nos conjuntos
+<conjunto>_municipios do armazém, com o código IBGE na chave.
+
+Uso:
+    python -m observatorio.fila enfileirar [trabalho ...] --municipios rj
+    python -m observatorio.fila trabalhar --workers 4
+    python -m observatorio.fila situacao
+    python -m observatorio.fila consolidar [--excel]
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from observatorio.armazem import PASTA_PADRAO as PASTA_ARMAZEM
+from observatorio.armazem import Armazem, resumo_gravacao
+from observatorio.diario import chave_celula
+from observatorio.municipios import (
+    UF_PADRAO, Municipio, conjunto_por_municipio, resolver_municipios, tela_do_municipio,
+)
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".fila", "fila.sqlite")
+MAX_TENTATIVAS = 3
+LOTE_PADRAO = 10
+PRAZO_POR_CELULA = 60          # segundos de arrendamento por célula do lote
+
+
+@dataclass(frozen=True)
+class Lote:
+    trabalhos: str                 # nomes dos trabalhos da tela, "aprendizado+proficiencia"
+    municipio: Municipio
+    tarefas: tuple                 # ((id, célula), ...) na ordem de visita
+
+
+class FilaTrabalho:
+    """ Tarefas município x célula com arrendamento e novas tentativas """
+
+    def __init__(self, caminho=ARQUIVO_PADRAO, max_tentativas=MAX_TENTATIVAS):
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self.max_tentativas = max_tentativas
+        # Transações explícitas: o arrendamento precisa de BEGIN IMMEDIATE
+        self.conexao = sqlite3.connect(caminho, timeout=60, isolation_level=None)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS municipios (
+                codigo INTEGER PRIMARY KEY,
+                nome TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tarefas (
+                id INTEGER PRIMARY KEY,
+                trabalhos TEXT NOT NULL,
+                municipio INTEGER NOT NULL REFERENCES municipios (codigo),
+                celula TEXT NOT NULL,
+                indice INTEGER NOT NULL,          -- posição na grade (ordem de visita e das tabelas)
+                estado TEXT NOT NULL DEFAULT 'pendente',
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                dono TEXT,
+                arrendada_ate REAL,
+                resultado TEXT,
+                erro TEXT,
+                atualizado_em REAL,
+                UNIQUE (trabalhos, municipio, celula)
+            );
+            CREATE INDEX IF NOT EXISTS idx_tarefas_estado ON tarefas (estado, trabalhos, municipio, indice);
+        """)
+
+    def _transacao(self, *comandos):
+        self.conexao.execute("BEGIN IMMEDIATE")
+        try:
+            resultados = [self.conexao.execute(sql, parametros).fetchall() for sql, parametros in comandos]
+            self.conexao.execute("COMMIT")
+            return resultados
+        except BaseException:
+            self.conexao.execute("ROLLBACK")
+            raise
+
+    def enfileirar(self, trabalhos, municipio, celulas):
+        """ Acrescenta as células (as que já estão na fila ficam como estão); devolve quantas entraram """
+        agora = time.time()
+        self.conexao.execute("BEGIN IMMEDIATE")
+        try:
+            self.conexao.execute("INSERT OR REPLACE INTO municipios VALUES (?, ?)", (municipio.codigo, municipio.nome))
+            antes = self.conexao.total_changes
+            self.conexao.executemany(
+                "INSERT OR IGNORE INTO tarefas (trabalhos, municipio, celula, indice, atualizado_em) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(trabalhos, municipio.codigo, chave_celula(c), i, agora)
+                 for i, c in enumerate(celulas)],
+            )
+            novas = self.conexao.total_changes - antes
+            self.conexao.execute("COMMIT")
+        except BaseException:
+            self.conexao.execute("ROLLBACK")
+            raise
+        return novas
+
+    def arrendar(self, dono, limite=LOTE_PADRAO, prazo_por_celula=PRAZO_POR_CELULA):
+        """ Próximo lote (mesma tela e município) ou None se não há nada disponível """
+        agora = time.time()
+        disponivel = ("(estado = 'pendente' OR (estado = 'arrendada' AND arrendada_ate < :agora)) "
+                      "AND tentativas < :maximo")
+        parametros = {"agora": agora, "maximo": self.max_tentativas}
+
+        self.conexao.execute("BEGIN IMMEDIATE")
+        try:
+            # Prazo vencido na última tentativa: o worker morreu com ela nas mãos
+            self.conexao.execute(
+                "UPDATE tarefas SET estado = 'falhou', erro = 'prazo do arrendamento venceu', atualizado_em = :agora "
+                "WHERE estado = 'arrendada' AND arrendada_ate < :agora AND tentativas >= :maximo", parametros,
+            )
+            primeira = self.conexao.execute(
+                f"SELECT trabalhos, municipio FROM tarefas WHERE {disponivel} ORDER BY municipio, trabalhos, indice LIMIT 1",
+                parametros,
+            ).fetchone()
+            if primeira is None:
+                self.conexao.execute("COMMIT")
+                return None
+            trabalhos, codigo = primeira
+            tarefas = self.conexao.execute(
+                f"SELECT id, celula FROM tarefas WHERE trabalhos = :trabalhos AND municipio = :municipio "
+                f"AND {disponivel} ORDER BY indice LIMIT :limite",
+                {**parametros, "trabalhos": trabalhos, "municipio": codigo, "limite": limite},
+            ).fetchall()
+            self.conexao.executemany(
+                "UPDATE tarefas SET estado = 'arrendada', dono = ?, arrendada_ate = ?, tentativas = tentativas + 1, "
+                "atualizado_em = ? WHERE id = ?",
+                [(dono, agora + prazo_por_celula * len(tarefas), agora, id_tarefa) for id_tarefa, _ in tarefas],
+            )
+            nome = self.conexao.execute("SELECT nome FROM municipios WHERE codigo = ?", (codigo,)).fetchone()[0]
+            self.conexao.execute("COMMIT")
+        except BaseException:
+            self.conexao.execute("ROLLBACK")
+            raise
+        return Lote(trabalhos, Municipio(codigo, nome),
+                    tuple((id_tarefa, tuple(json.loads(celula))) for id_tarefa, celula in tarefas))
+
+    def _atualizar_arrendada(self, sql, parametros):
+        """ UPDATE numa tarefa ainda arrendada por quem pede; False se o arrendamento já era de outro """
+        antes = self.conexao.total_changes
+        self._transacao((sql, parametros))
+        return self.conexao.total_changes > antes
+
+    def concluir(self, id_tarefa, dono, resultado):
+        """ Guarda o resultado; False se o arrendamento não é mais de `dono` """
+        return self._atualizar_arrendada(
+            "UPDATE tarefas SET estado = 'concluida', resultado = ?, erro = NULL, arrendada_ate = NULL, "
+            "atualizado_em = ? WHERE id = ? AND dono = ? AND estado = 'arrendada'",
+            (json.dumps(resultado, ensure_ascii=False), time.time(), id_tarefa, dono),
+        )
+
+    def devolver(self, id_tarefa, dono, erro):
+        """ De volta para a fila, ou "falhou" se já gastou as tentativas; False se não é mais de `dono` """
+        return self._atualizar_arrendada(
+            "UPDATE tarefas SET estado = CASE WHEN tentativas >= ? THEN 'falhou' ELSE 'pendente' END, "
+            "erro = ?, arrendada_ate = NULL, atualizado_em = ? WHERE id = ? AND dono = ? AND estado = 'arrendada'",
+            (self.max_tentativas, erro, time.time(), id_tarefa, dono),
+        )
+
+    def reabrir(self):
+        """ Falhas voltam para a fila com as tentativas zeradas; devolve quantas """
+        antes = self.conexao.total_changes
+        self._transacao((
+            "UPDATE tarefas SET estado = 'pendente', tentativas = 0, atualizado_em = ? WHERE estado = 'falhou'",
+            (time.time(),),
+        ))
+        return self.conexao.total_changes - antes
+
+    def situacao(self):
+        """ {estado: quantidade} e as causas das falhas """
+        por_estado = dict(self.conexao.execute("SELECT estado, COUNT(*) FROM tarefas GROUP BY estado").fetchall())
+        falhas = self.conexao.execute(
+            "SELECT erro, COUNT(*) FROM tarefas WHERE estado = 'falhou' GROUP BY erro ORDER BY 2 DESC"
+        ).fetchall()
+        return por_estado, falhas
+
+    def concluidas(self, trabalhos):
+        """ {Municipio: [resultado, ...] na ordem da grade} das tarefas concluídas """
+        linhas = self.conexao.execute(
+            "SELECT m.codigo, m.nome, t.resultado FROM tarefas t JOIN municipios m ON m.codigo = t.municipio "
+            "WHERE t.trabalhos = ? AND t.estado = 'concluida' ORDER BY m.codigo, t.indice",
+            (trabalhos,),
+        ).fetchall()
+        por_municipio = {}
+        for codigo, nome, resultado in linhas:
+            por_municipio.setdefault(Municipio(codigo, nome), []).append(json.loads(resultado))
+        return por_municipio
+
+    def fechar(self):
+        self.conexao.close()
+
+
+# --- TRABALHO DOS WORKERS ---
+
+def grupos_de_trabalhos(trabalhos):
+    """ {"aprendizado+proficiencia": (tela, [trabalhos])}, como o executor agrupa """
+    from observatorio.executor import agrupar_por_tela
+    return {"+".join(t.nome for t in da_tela): (tela, da_tela) for tela, da_tela in agrupar_por_tela(trabalhos)}
+
+
+def enfileirar_trabalhos(fila, trabalhos, municipios):
+    """ Grade de cada tela x municípios """
+    total = 0
+    for nomes, (tela, _) in grupos_de_trabalhos(trabalhos).items():
+        grade = tela.montar_grade()
+        for municipio in municipios:
+            total += fila.enfileirar(nomes, municipio, grade)
+    return total
+
+
+def trabalhar(numero_worker, caminho_fila, trabalhos, lote=LOTE_PADRAO, perfil=None, pasta_cache=None):
+    """ Consome lotes até a fila esvaziar; devolve quantas células concluiu """
+    from observatorio.executor import processar_fatia
+
+    fila = FilaTrabalho(caminho_fila)
+    grupos = grupos_de_trabalhos(trabalhos)
+    dono = f"{socket.gethostname()}:{os.getpid()}"
+    concluidas = 0
+    try:
+        while True:
+            arrendado = fila.arrendar(dono, lote)
+            if arrendado is None:
+                break
+            if arrendado.trabalhos not in grupos:
+                # Enfileirado com outro conjunto de trabalhos: este worker não sabe coletar
+                for id_tarefa, _ in arrendado.tarefas:
+                    fila.devolver(id_tarefa, dono, f"trabalhos {arrendado.trabalhos} fora deste worker")
+                continue
+
+            tela, da_tela = grupos[arrendado.trabalhos]
+            print(f"🏙️ [worker {numero_worker}] {arrendado.municipio.nome}: {len(arrendado.tarefas)} células")
+            resultados = dict(processar_fatia(
+                numero_worker, list(arrendado.tarefas), tela_do_municipio(tela, arrendado.municipio), da_tela,
+                headless=True, perfil=perfil, pasta_cache=pasta_cache,
+            ))
+            perdidas = 0
+            for id_tarefa, _ in arrendado.tarefas:
+                resultado = resultados.get(id_tarefa)
+                if resultado and all(resultado.values()):
+                    if fila.concluir(id_tarefa, dono, resultado):
+                        concluidas += 1
+                    else:
+                        perdidas += 1
+                elif not fila.devolver(id_tarefa, dono, "sem_dados" if resultado else "navegacao"):
+                    perdidas += 1
+            if perdidas:
+                print(f"⏰ [worker {numero_worker}] {perdidas} células com o prazo vencido já eram de outro worker.")
+    finally:
+        fila.fechar()
+    return concluidas
+
+
+def consolidar(fila, trabalhos, armazem):
+    """ Resultados concluídos -> conjuntos <conjunto>_municipios; devolve os conjuntos gravados """
+    gravados = []
+    for nomes, (_, da_tela) in grupos_de_trabalhos(trabalhos).items():
+        por_municipio = fila.concluidas(nomes)
+        for trabalho in da_tela:
+            partes = {}
+            for municipio, resultados in por_municipio.items():
+                tabelas = trabalho.tabelas([resultado.get(trabalho.nome) for resultado in resultados])
+                for nome_conjunto, df in tabelas.items():
+                    df = df.copy()
+                    df.insert(0, "Município", municipio.nome)
+                    df.insert(0, "Código IBGE", municipio.codigo)
+                    partes.setdefault(nome_conjunto, []).append(df)
+            for conjunto in trabalho.conjuntos:
+                if conjunto.nome in partes:
+                    consolidado = conjunto_por_municipio(conjunto)
+                    situacao = armazem.gravar(consolidado, pd.concat(partes[conjunto.nome], ignore_index=True))
+                    print(resumo_gravacao(consolidado, situacao))
+                    gravados.append(consolidado)
+    return gravados
+
+
+def main():
+    from observatorio.conjuntos import TRABALHOS
+    from observatorio.perfis import PERFIS, montar_perfil
+    from observatorio.trabalhos import caminho_saida
+
+    parser = argparse.ArgumentParser(description="Fila de coleta de vários municípios (município x célula).")
+    parser.add_argument("--fila", default=ARQUIVO_PADRAO, help="Arquivo SQLite da fila")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_enfileirar = sub.add_parser("enfileirar", help="Coloca as grades dos trabalhos na fila")
+    p_enfileirar.add_argument("trabalhos", nargs="*", help=f"Trabalhos: {', '.join(TRABALHOS)} (padrão: todos)")
+    p_enfileirar.add_argument("--municipios", default="rj",
+                              help='"rj" (todos da UF) ou códigos IBGE separados por vírgula')
+    p_enfileirar.add_argument("--uf", default=UF_PADRAO, help="Código IBGE da UF (padrão: 33, RJ)")
+
+    p_trabalhar = sub.add_parser("trabalhar", help="Consome a fila até esvaziar")
+    p_trabalhar.add_argument("--workers", type=int, default=1, help="Processos (um Chrome cada)")
+    p_trabalhar.add_argument("--lote", type=int, default=LOTE_PADRAO, help="Células arrendadas por vez")
+    p_trabalhar.add_argument("--perfil", choices=list(PERFIS), default="rapido", help="Perfil do Chrome")
+    p_trabalhar.add_argument("--pasta-cache", help="Guarda as capturas nesta cache de telas")
+
+    sub.add_parser("situacao", help="Tarefas por estado e causas das falhas")
+    sub.add_parser("reabrir", help="Devolve as tarefas que falharam para a fila")
+
+    p_consolidar = sub.add_parser("consolidar", help="Grava os resultados nos conjuntos <conjunto>_municipios")
+    p_consolidar.add_argument("--pasta-armazem", default=PASTA_ARMAZEM, help="Pasta do armazém Parquet")
+    p_consolidar.add_argument("--excel", action="store_true", help="Exporta cada trabalho consolidado para Excel")
+
+    args = parser.parse_args()
+    trabalhos = [TRABALHOS[nome] for nome in getattr(args, "trabalhos", None) or TRABALHOS]
+    fila = FilaTrabalho(args.fila)
+
+    if args.comando == "enfileirar":
+        municipios = resolver_municipios(args.municipios, args.uf)
+        novas = enfileirar_trabalhos(fila, trabalhos, municipios)
+        print(f"📥 {novas} tarefas novas na fila ({len(municipios)} municípios).")
+
+    elif args.comando == "trabalhar":
+        fila.fechar()
+        perfil = montar_perfil(args.perfil)
+        print(f"⚡ {args.workers} worker(s) consumindo {args.fila}")
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futuros = [executor.submit(trabalhar, numero, args.fila, trabalhos, args.lote, perfil, args.pasta_cache)
+                       for numero in range(args.workers)]
+            concluidas = sum(futuro.result() for futuro in futuros)
+        print(f"✅ {concluidas} células concluídas.")
+        return
+
+    elif args.comando == "situacao":
+        por_estado, falhas = fila.situacao()
+        for estado in ("pendente", "arrendada", "concluida", "falhou"):
+            print(f"   {estado:10s} {por_estado.get(estado, 0)}")
+        for erro, n in falhas:
+            print(f"   ⚠️ {n}x {erro}")
+
+    elif args.comando == "reabrir":
+        print(f"♻️ {fila.reabrir()} tarefas de volta na fila.")
+
+    else:
+        armazem = Armazem(args.pasta_armazem)
+        gravados = consolidar(fila, trabalhos, armazem)
+        if args.excel and gravados:
+            for trabalho in trabalhos:
+                conjuntos = [conjunto_por_municipio(c) for c in trabalho.conjuntos]
+                destino = caminho_saida(trabalho.arquivo_saida.replace(".xlsx", "_Municipios.xlsx"))
+                if armazem.exportar_excel(conjuntos, destino):
+                    print(f"📂 Exportado para: {destino}")
+
+    fila.fechar()
+
+
+if __name__ == "__main__":
+    main()
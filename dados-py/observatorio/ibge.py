@@ -0,0 +1,228 @@
+"""
+Ingestão das séries do SIDRA/IBGE (API de agregados v3) no armazém.
+
+Substitui as chamadas que atualizador.js / educacao.js faziam uma a uma, sem
+cache: as consultas saem todas juntas por um cliente assíncrono com pool de
+conexões (no máximo `concorrencia` simultâneas) e os validadores de cada URL
+(ETag / Last-Modified) ficam guardados em .cache_ibge/validadores.json.
+
+Na execução seguinte as consultas vão condicionais (If-None-Match /
+If-Modified-Since): o que não mudou volta 304, sem corpo, e não é nem lido
+nem regravado. Um 200 com o mesmo corpo da última vez (hash igual) também
+é pulado. Falha (500, timeout) mantém o que já está no armazém.
+
+As séries vão para o conjunto `sidra_series`, no mesmo armazém dos dados do
+QEdu (observatorio/conjuntos/ibge_sidra.py).
+
+Uso:
+    python -m observatorio.ibge [--series NOME ...] [--base-url URL] [--concorrencia N]
+
+Para testar sem tocar no IBGE, grave as respostas e sirva localmente:
+    python -m observatorio.servidor_replay gravar PASTA URL [URL ...]
+    python -m observatorio.servidor_replay servir PASTA --porta 8765
+    python -m observatorio.ibge --base-url http://127.0.0.1:8765
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+
+import httpx
+import pandas as pd
+
+from observatorio.armazem import PASTA_PADRAO as PASTA_ARMAZEM
+from observatorio.armazem import Armazem, resumo_gravacao
+from observatorio.coleta_http import TENTATIVAS, TIMEOUT_PADRAO, criar_cliente, trocar_origem
+from observatorio.conjuntos.ibge_sidra import CONJUNTO_SIDRA, SERIES
+
+PASTA_CACHE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache_ibge")
+ARQUIVO_VALIDADORES = "validadores.json"
+CONCORRENCIA_PADRAO = 4   # o SIDRA devolve 500 com facilidade; melhor não insistir demais
+
+# Marcadores do SIDRA para valor ausente / sigiloso
+VALORES_AUSENTES = {"...", "..", "-", "X", ""}
+
+
+# --- VALIDADORES ---
+
+def carregar_validadores(pasta=PASTA_CACHE):
+    caminho = os.path.join(pasta, ARQUIVO_VALIDADORES)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def salvar_validadores(validadores, pasta=PASTA_CACHE):
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, ARQUIVO_VALIDADORES)
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(validadores, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def cabecalhos_condicionais(validador):
+    cabecalhos = {}
+    if validador.get("etag"):
+        cabecalhos["If-None-Match"] = validador["etag"]
+    if validador.get("last_modified"):
+        cabecalhos["If-Modified-Since"] = validador["last_modified"]
+    return cabecalhos
+
+
+# --- CONSULTA ---
+
+async def _consultar(cliente, semaforo, url, validador):
+    """ (status, corpo, cabeçalhos) da URL; status None se todas as tentativas falharam """
+    cabecalhos = cabecalhos_condicionais(validador)
+    for tentativa in range(TENTATIVAS):
+        try:
+            async with semaforo:
+                resposta = await cliente.get(url, headers=cabecalhos)
+            if resposta.status_code == 304:
+                return 304, None, {}
+            if resposta.status_code == 200:
+                return 200, resposta.content, resposta.headers
+            if resposta.status_code < 500:
+                return resposta.status_code, None, {}
+        except httpx.HTTPError:
+            pass
+        if tentativa < TENTATIVAS - 1:
+            await asyncio.sleep(0.5 * 2 ** tentativa)
+    return None, None, {}
+
+
+async def consultar_series_async(urls, validadores, concorrencia=CONCORRENCIA_PADRAO, timeout=TIMEOUT_PADRAO):
+    """ {nome: (status, corpo, cabeçalhos)} para {nome: url} e {nome: validador} """
+    semaforo = asyncio.Semaphore(concorrencia)
+    async with criar_cliente(concorrencia, timeout) as cliente:
+        respostas = await asyncio.gather(
+            *(_consultar(cliente, semaforo, url, validadores.get(nome, {})) for nome, url in urls.items())
+        )
+    return dict(zip(urls, respostas))
+
+
+# --- INTERPRETAÇÃO ---
+
+def linhas_da_resposta(nome, agregado, dados):
+    """ Linhas do conjunto sidra_series a partir do JSON da API de agregados """
+    linhas = []
+    for variavel in dados:
+        for resultado in variavel.get("resultados", []):
+            categorias = [
+                nome_categoria
+                for classificacao in resultado.get("classificacoes", [])
+                for nome_categoria in classificacao.get("categoria", {}).values()
+            ]
+            for serie in resultado.get("series", []):
+                for periodo, valor in serie.get("serie", {}).items():
+                    linhas.append({
+                        "Série": nome,
+                        "Agregado": agregado,
+                        "Variável": variavel.get("id"),
+                        "Localidade": serie["localidade"]["id"],
+                        "Categoria": " / ".join(categorias) or "Total",
+                        "Período": periodo,
+                        "Ano": periodo[:4],
+                        "Valor": None if str(valor).strip() in VALORES_AUSENTES else valor,
+                    })
+    return linhas
+
+
+def agregado_da_url(url):
+    """ Número do agregado em .../agregados/<n>/periodos/... """
+    partes = url.split("/agregados/", 1)[1].split("/", 1)
+    return int(partes[0])
+
+
+# --- ATUALIZAÇÃO ---
+
+def atualizar_series(series=None, armazem=None, pasta_cache=PASTA_CACHE, concorrencia=CONCORRENCIA_PADRAO,
+                     base_url=None, condicional=True, timeout=TIMEOUT_PADRAO):
+    """
+    Consulta as séries e grava as que mudaram no armazém.
+    Devolve {nome: "atualizada" | "sem mudança" | "falhou"}.
+    """
+    series = series or SERIES
+    armazem = armazem or Armazem()
+    validadores = carregar_validadores(pasta_cache)
+
+    # Validador só vale se a série ainda está no armazém (senão um 304
+    # deixaria o armazém vazio para sempre)
+    guardadas = set(armazem.ler(CONJUNTO_SIDRA)["Série"].dropna())
+    usados = {
+        nome: validadores[url]
+        for nome, url in series.items()
+        if condicional and nome in guardadas and url in validadores
+    }
+
+    urls = {nome: trocar_origem(url, base_url) for nome, url in series.items()}
+    respostas = asyncio.run(consultar_series_async(urls, usados, concorrencia, timeout))
+
+    situacao, linhas, novos = {}, [], {}
+    for nome, (status, corpo, cabecalhos) in respostas.items():
+        # Validadores guardados pela URL original, valendo para qualquer origem
+        url = series[nome]
+        if status == 304:
+            situacao[nome] = "sem mudança"
+            continue
+        if status != 200:
+            print(f"   ❌ {nome}: {'sem resposta' if status is None else f'erro {status}'}; mantendo os dados guardados.")
+            situacao[nome] = "falhou"
+            continue
+
+        digest = hashlib.sha256(corpo).hexdigest()
+        validador = {
+            "etag": cabecalhos.get("etag"),
+            "last_modified": cabecalhos.get("last-modified"),
+            "sha256": digest,
+        }
+        if nome in usados and usados[nome].get("sha256") == digest:
+            # Servidor sem suporte a 304, mas o corpo é o mesmo
+            situacao[nome], novos[url] = "sem mudança", validador
+            continue
+        try:
+            linhas += linhas_da_resposta(nome, agregado_da_url(series[nome]), json.loads(corpo))
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"   ❌ {nome}: resposta inesperada ({e}); mantendo os dados guardados.")
+            situacao[nome] = "falhou"
+            continue
+        situacao[nome], novos[url] = "atualizada", validador
+
+    if linhas:
+        print(resumo_gravacao(CONJUNTO_SIDRA, armazem.gravar(CONJUNTO_SIDRA, pd.DataFrame(linhas))))
+    # Validadores novos só depois da gravação: se ela falhar, a próxima
+    # execução baixa de novo em vez de receber 304
+    if novos:
+        validadores.update(novos)
+        salvar_validadores(validadores, pasta_cache)
+    return situacao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualiza no armazém as séries do SIDRA/IBGE.")
+    parser.add_argument("--series", nargs="+", choices=sorted(SERIES), help="Séries a consultar (padrão: todas)")
+    parser.add_argument("--base-url", help="Origem alternativa (ex.: servidor de replay local)")
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA_PADRAO,
+                        help=f"Consultas simultâneas (padrão: {CONCORRENCIA_PADRAO})")
+    parser.add_argument("--pasta-armazem", default=PASTA_ARMAZEM, help="Pasta do armazém Parquet")
+    parser.add_argument("--pasta-cache", default=PASTA_CACHE, help="Pasta dos validadores HTTP")
+    parser.add_argument("--sem-validadores", action="store_true",
+                        help="Baixa tudo de novo, ignorando ETag/Last-Modified guardados")
+    args = parser.parse_args()
+
+    series = {nome: SERIES[nome] for nome in args.series} if args.series else SERIES
+    print(f"📡 Consultando {len(series)} séries do SIDRA (até {args.concorrencia} simultâneas)...")
+    situacao = atualizar_series(series, Armazem(args.pasta_armazem), args.pasta_cache, args.concorrencia,
+                                args.base_url, condicional=not args.sem_validadores)
+
+    contagem = {estado: sum(1 for s in situacao.values() if s == estado)
+                for estado in ("atualizada", "sem mudança", "falhou")}
+    print(f"✅ {contagem['atualizada']} atualizadas, {contagem['sem mudança']} sem mudança, "
+          f"{contagem['falhou']} falharam.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Navegação por link direto: um `get` no endereço da célula em vez da
+sequência de cliques e dropdowns (com uma espera cada).
+
+O formato do endereço é aprendido da própria tela: depois de uma navegação
+por cliques, os trechos da URL atual (parâmetros ou partes do caminho) que
+trazem o valor de um filtro da célula viram marcadores, ex.:
+
+    https://qedu.org.br/.../censo-escolar?ano={ano}&rede={rede}&filtro={modalidade}
+
+O modelo aprendido fica em .links_diretos.sqlite (uma linha por tela) e
+vale nas próximas execuções; sem ele, as células são navegadas por cliques
+até a primeira URL dar um modelo. Cada gravação mexe só na linha da sua
+tela, então os workers de telas e municípios diferentes aprendem ao mesmo
+tempo sem sobrescrever o modelo um do outro.
+
+Depois de carregar o link, os filtros que a tela mostra
+(`Tela.filtros_na_tela`) são conferidos com os pedidos. Se não baterem, a
+célula é navegada por cliques como antes; depois de LIMITE_FALHAS links
+errados seguidos o worker desiste do link direto (e esquece o modelo) até
+aprender um novo.
+
+Ligado com --link-direto (variável OBSERVATORIO_LINK_DIRETO, herdada pelos
+workers); só vale para as telas que sabem ler os próprios filtros.
+"""
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from urllib.parse import parse_qsl, quote, unquote, urlsplit, urlunsplit
+
+from observatorio.espera import aguardar_estabilizacao
+from observatorio.telemetria import span
+
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".links_diretos.sqlite")
+VARIAVEL_AMBIENTE = "OBSERVATORIO_LINK_DIRETO"
+LIMITE_FALHAS = 3
+
+RE_MARCADOR = re.compile(r"\{(\w+)(\|slug)?\}")
+
+
+def link_direto_ligado():
+    return os.environ.get(VARIAVEL_AMBIENTE) == "1"
+
+
+def normalizar(valor):
+    return " ".join(str(valor).split()).lower()
+
+
+def slug(valor):
+    """ "Com Ensino Infantil Regular" -> "com-ensino-infantil-regular" """
+    sem_acento = unicodedata.normalize("NFKD", str(valor)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", sem_acento.lower()).strip("-")
+
+
+def _marcador(trecho, filtros, usados):
+    """ Marcador do filtro cujo valor está no trecho da URL, ou None """
+    for chave, valor in filtros.items():
+        if chave in usados:
+            continue
+        if normalizar(unquote(trecho)) == normalizar(valor):
+            return chave, "{" + chave + "}"
+        if trecho == slug(valor):
+            return chave, "{" + chave + "|slug}"
+    return None
+
+
+def aprender_modelo(url, filtros):
+    """
+    Modelo de link a partir da URL de uma tela navegada por cliques e dos
+    filtros dessa tela; None se algum filtro não aparece na URL.
+    """
+    partes = urlsplit(url)
+    usados = set()
+
+    segmentos = []
+    for segmento in partes.path.split("/"):
+        achado = _marcador(segmento, filtros, usados) if segmento else None
+        if achado:
+            usados.add(achado[0])
+            segmentos.append(achado[1])
+        else:
+            segmentos.append(segmento)
+
+    parametros = []
+    for nome, valor in parse_qsl(partes.query, keep_blank_values=True):
+        achado = _marcador(valor, filtros, usados)
+        if achado:
+            usados.add(achado[0])
+            parametros.append(f"{quote(nome)}={achado[1]}")
+        else:
+            parametros.append(f"{quote(nome)}={quote(valor, safe='')}")
+
+    if usados != set(filtros):
+        return None
+    return urlunsplit((partes.scheme, partes.netloc, "/".join(segmentos), "&".join(parametros), ""))
+
+
+def preencher_modelo(modelo, filtros):
+    """ Link de uma célula a partir do modelo aprendido """
+    def valor(marcador):
+        texto = str(filtros[marcador.group(1)])
+        return slug(texto) if marcador.group(2) else quote(texto, safe="")
+    return RE_MARCADOR.sub(valor, modelo)
+
+
+def filtros_divergentes(pedidos, mostrados):
+    """ Filtros pedidos que a tela não mostra (comparação flexível, como nos dropdowns) """
+    return [
+        chave for chave, valor in pedidos.items()
+        if mostrados.get(chave) is None or normalizar(valor) not in normalizar(mostrados[chave])
+    ]
+
+
+def _conectar(arquivo):
+    conexao = sqlite3.connect(arquivo, timeout=30)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("""
+        CREATE TABLE IF NOT EXISTS modelos (
+            tela TEXT PRIMARY KEY,
+            modelo TEXT NOT NULL,
+            atualizado_em REAL NOT NULL
+        )
+    """)
+    return conexao
+
+
+def carregar_modelos(arquivo=ARQUIVO_PADRAO):
+    """ {tela: modelo} de todos os modelos aprendidos """
+    if not os.path.exists(arquivo):
+        return {}
+    conexao = _conectar(arquivo)
+    try:
+        return dict(conexao.execute("SELECT tela, modelo FROM modelos").fetchall())
+    finally:
+        conexao.close()
+
+
+def salvar_modelo(nome_tela, modelo, arquivo=ARQUIVO_PADRAO):
+    """ Grava o modelo da tela (só a linha dela: os das outras telas ficam como estão) """
+    conexao = _conectar(arquivo)
+    try:
+        with conexao:
+            conexao.execute("INSERT OR REPLACE INTO modelos VALUES (?, ?, ?)", (nome_tela, modelo, time.time()))
+    finally:
+        conexao.close()
+
+
+def esquecer_modelo(nome_tela, modelo, arquivo=ARQUIVO_PADRAO):
+    """ Apaga o modelo da tela se ainda for `modelo` (outro worker pode já ter aprendido um novo) """
+    if not os.path.exists(arquivo):
+        return
+    conexao = _conectar(arquivo)
+    try:
+        with conexao:
+            conexao.execute("DELETE FROM modelos WHERE tela = ? AND modelo = ?", (nome_tela, modelo))
+    finally:
+        conexao.close()
+
+
+class LinkDireto:
+    """ Navegação de um worker: link direto conferido, cliques de reserva """
+
+    def __init__(self, tela, arquivo=ARQUIVO_PADRAO):
+        self.tela = tela
+        self.arquivo = arquivo
+        self.modelo = carregar_modelos(arquivo).get(tela.nome)
+        self.falhas_seguidas = 0
+        self.descartados = set()     # modelos que a tela não respeitou
+
+    @property
+    def ativo(self):
+        return self.falhas_seguidas < LIMITE_FALHAS
+
+    def url(self, celula):
+        return preencher_modelo(self.modelo, self.tela.filtros_da_celula(celula))
+
+    def navegar(self, driver, celula, estado):
+        """ Mesmo contrato de Tela.navegar: True se a tela está na célula """
+        if self.ativo and self.modelo:
+            filtros = self.tela.filtros_da_celula(celula)
+            with span("link_direto", self.tela.descrever(celula)) as medicao:
+                driver.get(self.url(celula))
+                aguardar_estabilizacao(driver, seletor=self.tela.seletor_dados, timeout=20)
+                divergentes = filtros_divergentes(filtros, self.tela.filtros_na_tela(driver))
+                if divergentes:
+                    medicao.resultado, medicao.causa = "falha", "filtros_divergentes"
+            # A página foi recarregada: o que `navegar` lembrava dos cliques não vale mais
+            reiniciar_estado(estado)
+            if not divergentes:
+                self.falhas_seguidas = 0
+                print(f"   🔗 Link direto: {self.tela.descrever(celula)}")
+                return True
+
+            self.falhas_seguidas += 1
+            print(f"   ↩️ Link direto não aplicou {', '.join(divergentes)}; navegando pelos filtros.")
+            if not self.ativo:
+                print(f"   ⚠️ {LIMITE_FALHAS} links diretos errados seguidos: desistindo do link neste worker.")
+                self.descartados.add(self.modelo)
+                esquecer_modelo(self.tela.nome, self.modelo, self.arquivo)
+                self.modelo = None
+
+        navegou = self.tela.navegar(driver, celula, estado)
+        if navegou:
+            self.aprender(driver.current_url, self.tela.filtros_da_celula(celula))
+        return navegou
+
+    def aprender(self, url, filtros):
+        """ Tenta tirar o modelo da URL atual; um modelo novo reativa o link direto """
+        modelo = aprender_modelo(url, filtros)
+        if modelo and modelo != self.modelo and modelo not in self.descartados:
+            self.modelo = modelo
+            self.falhas_seguidas = 0
+            salvar_modelo(self.tela.nome, modelo, self.arquivo)
+            print(f"   🔗 Formato do link aprendido: {modelo}")
+
+
+def reiniciar_estado(estado):
+    """ Esquece a navegação por cliques, mantendo a identificação do worker """
+    worker = estado.get("worker")
+    estado.clear()
+    estado["worker"] = worker
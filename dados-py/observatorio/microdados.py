@@ -0,0 +1,92 @@
+"""
+Leitura em blocos dos microdados do INEP (ENEM, Censo Escolar).
+
+Os arquivos nacionais são CSVs de vários GB (separador ";", latin-1), às
+vezes dentro de um .zip com documentação junto. Aqui eles são lidos em
+fluxo, bloco a bloco, pelo leitor CSV do pyarrow:
+
+  - só as colunas pedidas são convertidas (as outras são puladas no parse);
+  - o filtro (ex.: município 3305109) é aplicado em cada bloco, antes de
+    virar DataFrame, então só as linhas do município chegam ao pandas;
+  - o .zip é lido direto do arquivo, sem extrair nada para o disco.
+
+A memória de pico fica em torno de `tamanho_bloco`, qualquer que seja o
+tamanho do arquivo.
+"""
+import fnmatch
+import os
+import zipfile
+from contextlib import contextmanager
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+TAMANHO_BLOCO = 16 * 1024 * 1024   # bytes de CSV por bloco
+CODIGO_MUNICIPIO = 3305109
+
+
+@contextmanager
+def abrir_csv(caminho, padrao="*.csv"):
+    """
+    Arquivo binário do CSV: o próprio caminho ou, se for .zip, o maior
+    membro cujo nome casa com `padrao` (sem extrair para o disco).
+    """
+    if not zipfile.is_zipfile(caminho):
+        with open(caminho, "rb") as f:
+            yield f
+        return
+    with zipfile.ZipFile(caminho) as arquivo_zip:
+        membros = [m for m in arquivo_zip.infolist()
+                   if fnmatch.fnmatch(os.path.basename(m.filename).lower(), padrao.lower())]
+        if not membros:
+            raise FileNotFoundError(f"{caminho}: nenhum arquivo '{padrao}' dentro do zip")
+        membro = max(membros, key=lambda m: m.file_size)
+        with arquivo_zip.open(membro) as f:
+            yield f
+
+
+def cabecalho(caminho, padrao="*.csv", separador=";", encoding="latin1"):
+    """ Nomes das colunas (só a primeira linha é lida) """
+    with abrir_csv(caminho, padrao) as f:
+        linha = f.readline().decode(encoding).strip().lstrip("\ufeff")
+    return [nome.strip('"') for nome in linha.split(separador)]
+
+
+def ler_em_blocos(caminho, colunas, tipos=None, filtro=None, padrao="*.csv", separador=";",
+                  encoding="latin1", tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Gera DataFrames com `colunas`, bloco a bloco, já filtrados.
+
+    `tipos`: {coluna: tipo Arrow} (o resto é inferido);
+    `filtro`: função (RecordBatch) -> máscara booleana do pyarrow.
+    Colunas pedidas que não existem no arquivo vêm nulas.
+    """
+    presentes = set(cabecalho(caminho, padrao, separador, encoding))
+    lidas = [c for c in colunas if c in presentes]
+    tipos = {c: t for c, t in (tipos or {}).items() if c in presentes}
+    with abrir_csv(caminho, padrao) as f:
+        leitor = pacsv.open_csv(
+            f,
+            read_options=pacsv.ReadOptions(encoding=encoding, block_size=tamanho_bloco),
+            parse_options=pacsv.ParseOptions(delimiter=separador),
+            convert_options=pacsv.ConvertOptions(include_columns=lidas, column_types=tipos,
+                                                 strings_can_be_null=True),
+        )
+        for bloco in leitor:
+            if filtro is not None:
+                bloco = bloco.filter(filtro(bloco))
+            if bloco.num_rows == 0:
+                continue
+            df = bloco.to_pandas()
+            for coluna in colunas:
+                if coluna not in df.columns:
+                    df[coluna] = None
+            yield df[list(colunas)]
+
+
+def filtro_municipio(coluna, codigo=CODIGO_MUNICIPIO):
+    """ Filtro de ler_em_blocos: linhas da coluna de município igual a `codigo` """
+    def filtrar(bloco):
+        return pc.fill_null(pc.equal(bloco.column(coluna), pa.scalar(codigo, bloco.schema.field(coluna).type)), False)
+    return filtrar
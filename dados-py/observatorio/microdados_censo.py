@@ -0,0 +1,186 @@
+"""
+Escolas e matrículas por etapa e rede a partir dos microdados do Censo
+Escolar (INEP), sem navegador e sem extrair os .zip.
+
+Cada ano vem num zip do INEP com dados/microdados_ed_basica_<ano>.csv (uma
+linha por escola, já com as matrículas por etapa). O CSV é lido direto de
+dentro do zip, em blocos (observatorio.microdados): só as colunas usadas são
+convertidas e só as escolas do município passam do parse. Os anos rodam em
+processos separados (um arquivo por processo), então os 15 anos de
+2010–2024 saem de uma vez só, com memória limitada ao bloco de cada processo.
+
+Saída (armazém):
+  - censo_inep_escolas:          escolas em atividade por rede e filtro;
+  - censo_inep_matriculas_etapa: Creche, Pré-escola, Anos Iniciais, Anos
+                                 Finais, EJA e Educação Especial por rede e filtro.
+
+Os filtros são os da tela do QEdu ("Com Ensino Infantil Regular", ...) mais
+"Todas as escolas". Com --atualizar-qedu, as linhas da rede Municipal também
+vão para os conjuntos do QEdu (censo_escolas e censo_matriculas_etapa).
+
+Usa o layout dos microdados publicado a partir de 2023 (2007 em diante
+republicados no mesmo formato).
+
+Uso:
+    python -m observatorio.microdados_censo PASTA_OU_ZIP [...] [--processos 4] [--excel ARQUIVO.xlsx]
+"""
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import pyarrow as pa
+
+from observatorio.armazem import PASTA_PADRAO as PASTA_ARMAZEM
+from observatorio.armazem import Armazem, resumo_gravacao
+from observatorio.conjuntos.censo_inep import CONJUNTO_ESCOLAS_REDE, CONJUNTO_MATRICULAS_REDE
+from observatorio.microdados import CODIGO_MUNICIPIO, TAMANHO_BLOCO, filtro_municipio, ler_em_blocos
+
+PADRAO_CSV = "microdados_ed_basica_*.csv"
+
+# Cards do QEdu -> coluna de matrículas nos microdados
+ETAPAS = {
+    "Creche": "QT_MAT_INF_CRE",
+    "Pré-escola": "QT_MAT_INF_PRE",
+    "Anos Iniciais": "QT_MAT_FUND_AI",
+    "Anos Finais": "QT_MAT_FUND_AF",
+    "EJA": "QT_MAT_EJA",
+    "Educação Especial": "QT_MAT_ESP",
+}
+
+# Filtro -> indicadores que a escola precisa ter (todos = 1)
+FILTROS = {
+    "Todas as escolas": (),
+    "Com Ensino Infantil Regular": ("IN_INF", "IN_REGULAR"),
+    "Com Ensino Fundamental Regular": ("IN_FUND", "IN_REGULAR"),
+}
+
+REDES = {1: "Federal", 2: "Estadual", 3: "Municipal", 4: "Privada"}
+
+COLUNAS = (
+    ["NU_ANO_CENSO", "CO_MUNICIPIO", "TP_DEPENDENCIA", "TP_SITUACAO_FUNCIONAMENTO"]
+    + sorted({c for indicadores in FILTROS.values() for c in indicadores})
+    + list(ETAPAS.values())
+)
+TIPOS = {coluna: pa.int64() for coluna in COLUNAS}
+
+EM_ATIVIDADE = 1
+
+
+def contar_escolas(df):
+    """ Escolas e matrículas por (Ano, Rede, Filtro) de um bloco já filtrado no município """
+    df = df[df["TP_SITUACAO_FUNCIONAMENTO"] == EM_ATIVIDADE].assign(Rede=df["TP_DEPENDENCIA"].map(REDES))
+    partes = []
+    for nome_filtro, indicadores in FILTROS.items():
+        selecionadas = df
+        for indicador in indicadores:
+            selecionadas = selecionadas[selecionadas[indicador] == 1]
+        if selecionadas.empty:
+            continue
+        grupos = selecionadas.groupby(["NU_ANO_CENSO", "Rede"])
+        parcial = grupos[list(ETAPAS.values())].sum()
+        parcial["Escolas"] = grupos.size()
+        partes.append(parcial.assign(Filtro=nome_filtro).set_index("Filtro", append=True))
+    return pd.concat(partes) if partes else None
+
+
+def agregar_arquivo(caminho, municipio=CODIGO_MUNICIPIO, tamanho_bloco=TAMANHO_BLOCO):
+    """ Totais de um ano (um arquivo), indexados por (Ano, Rede, Filtro) """
+    parciais = [
+        parcial
+        for df in ler_em_blocos(caminho, COLUNAS, TIPOS, filtro_municipio("CO_MUNICIPIO", municipio),
+                                padrao=PADRAO_CSV, tamanho_bloco=tamanho_bloco)
+        if (parcial := contar_escolas(df)) is not None
+    ]
+    if not parciais:
+        return None
+    return pd.concat(parciais).groupby(level=[0, 1, 2]).sum()
+
+
+def agregar_arquivos(caminhos, municipio=CODIGO_MUNICIPIO, processos=1, tamanho_bloco=TAMANHO_BLOCO):
+    """ Todos os anos, um arquivo por processo """
+    totais = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {executor.submit(agregar_arquivo, c, municipio, tamanho_bloco): c for c in caminhos}
+        for futuro in as_completed(futuros):
+            nome = os.path.basename(futuros[futuro])
+            try:
+                total = futuro.result()
+            except Exception as e:
+                print(f"   ❌ {nome}: {e}")
+                continue
+            if total is None:
+                print(f"   ⚠️ {nome}: nenhuma escola do município.")
+                continue
+            print(f"   📄 {nome}: {int(total.xs('Todas as escolas', level=2)['Escolas'].sum())} escolas do município")
+            totais.append(total)
+    return pd.concat(totais).sort_index() if totais else None
+
+
+def tabelas(totais):
+    """ (escolas, matrículas por etapa) nos esquemas dos conjuntos """
+    totais = totais.rename_axis(["Ano", "Rede", "Filtro"]).reset_index()
+    escolas = totais.rename(columns={"Filtro": "Filtro Aplicado", "Escolas": "Total Escolas"})[
+        [c for c, _ in CONJUNTO_ESCOLAS_REDE.colunas]
+    ]
+    matriculas = (totais.rename(columns={coluna: etapa for etapa, coluna in ETAPAS.items()})
+                        .melt(id_vars=["Ano", "Rede", "Filtro"], value_vars=list(ETAPAS),
+                              var_name="Etapa", value_name="Matrículas")
+                        .rename(columns={"Filtro": "Filtro Geral"}))
+    return escolas, matriculas[[c for c, _ in CONJUNTO_MATRICULAS_REDE.colunas]]
+
+
+def expandir_caminhos(caminhos):
+    """ Pastas viram os .zip/.csv que estão nelas """
+    arquivos = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            arquivos += sorted(glob.glob(os.path.join(caminho, "*.zip")) + glob.glob(os.path.join(caminho, "*.csv")))
+        else:
+            arquivos.append(caminho)
+    return arquivos
+
+
+def main():
+    from observatorio.conjuntos.qedu_censo import CONJUNTO_ESCOLAS, CONJUNTO_MATRICULAS_ETAPA
+
+    parser = argparse.ArgumentParser(description="Escolas e matrículas por rede a partir dos microdados do Censo Escolar.")
+    parser.add_argument("arquivos", nargs="+", help="Zips do INEP (ou os CSVs), ou pastas com eles")
+    parser.add_argument("--municipio", type=int, default=CODIGO_MUNICIPIO, help="Código IBGE do município")
+    parser.add_argument("--processos", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Arquivos lidos ao mesmo tempo (um processo cada)")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO // (1024 * 1024),
+                        help="Tamanho do bloco de leitura em MB")
+    parser.add_argument("--pasta-armazem", default=PASTA_ARMAZEM, help="Pasta do armazém Parquet")
+    parser.add_argument("--atualizar-qedu", action="store_true",
+                        help="Grava também a rede Municipal nos conjuntos da coleta do QEdu")
+    parser.add_argument("--excel", help="Exporta os dois conjuntos para este .xlsx depois de gravar")
+    args = parser.parse_args()
+
+    arquivos = expandir_caminhos(args.arquivos)
+    print(f"📊 Lendo {len(arquivos)} arquivo(s) do Censo Escolar ({args.processos} processos)...")
+    totais = agregar_arquivos(arquivos, args.municipio, args.processos, args.tamanho_bloco * 1024 * 1024)
+    if totais is None:
+        print("❌ Nenhum dado do município nos arquivos.")
+        return
+
+    escolas, matriculas = tabelas(totais)
+    armazem = Armazem(args.pasta_armazem)
+    print(resumo_gravacao(CONJUNTO_ESCOLAS_REDE, armazem.gravar(CONJUNTO_ESCOLAS_REDE, escolas)))
+    print(resumo_gravacao(CONJUNTO_MATRICULAS_REDE, armazem.gravar(CONJUNTO_MATRICULAS_REDE, matriculas)))
+
+    if args.atualizar_qedu:
+        # Mesmos filtros da tela do QEdu, que só mostra a rede Municipal
+        municipal_escolas = escolas[(escolas["Rede"] == "Municipal") & (escolas["Filtro Aplicado"] != "Todas as escolas")]
+        municipal_matriculas = matriculas[(matriculas["Rede"] == "Municipal") & (matriculas["Filtro Geral"] != "Todas as escolas")]
+        print(resumo_gravacao(CONJUNTO_ESCOLAS, armazem.gravar(CONJUNTO_ESCOLAS, municipal_escolas.drop(columns="Rede"))))
+        print(resumo_gravacao(CONJUNTO_MATRICULAS_ETAPA,
+                              armazem.gravar(CONJUNTO_MATRICULAS_ETAPA, municipal_matriculas.drop(columns="Rede"))))
+
+    if args.excel and armazem.exportar_excel([CONJUNTO_ESCOLAS_REDE, CONJUNTO_MATRICULAS_REDE], args.excel):
+        print(f"✅ Arquivo salvo em: {args.excel}")
+
+
+if __name__ == "__main__":
+    main()
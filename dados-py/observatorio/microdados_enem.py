@@ -0,0 +1,141 @@
+"""
+Médias do ENEM em São João de Meriti calculadas direto dos microdados do INEP.
+
+Substitui os números digitados à mão em dados-criados/educacao/enem.py. Cada
+arquivo MICRODADOS_ENEM_<ano>.csv (ou o .zip do INEP, sem extrair) é lido em
+blocos (observatorio.microdados): só as colunas usadas são convertidas, as
+linhas de fora do município são descartadas em cada bloco e as médias são
+acumuladas como somas e contagens. A memória de pico não depende do ano nem
+do tamanho do arquivo.
+
+O resultado tem o esquema de Dados_ENEM_SJM_2017_2023.xlsx (conjunto
+`enem_medias`): Gênero, Localização e Administração da escola × área.
+As médias consideram só as notas presentes (faltosos ficam de fora).
+
+Uso:
+    python -m observatorio.microdados_enem MICRODADOS_ENEM_2023.zip [...] [--excel ARQUIVO.xlsx]
+"""
+import argparse
+import os
+import re
+
+import pandas as pd
+import pyarrow as pa
+
+from observatorio.armazem import PASTA_PADRAO as PASTA_ARMAZEM
+from observatorio.armazem import Armazem, resumo_gravacao
+from observatorio.conjuntos.enem import CONJUNTO_ENEM
+from observatorio.microdados import CODIGO_MUNICIPIO, TAMANHO_BLOCO, filtro_municipio, ler_em_blocos
+
+# Coluna da nota -> coluna da planilha. A planilha chama de "Ciências
+# Sociais" a prova de Ciências da Natureza (NU_NOTA_CN); mantido o nome.
+AREAS = {
+    "NU_NOTA_MT": "Matemática",
+    "NU_NOTA_LC": "Linguagens",
+    "NU_NOTA_CH": "Ciências Humanas",
+    "NU_NOTA_CN": "Ciências Sociais",
+}
+
+# Categoria -> (coluna dos microdados, código -> segmento)
+CATEGORIAS = {
+    "Gênero": ("TP_SEXO", {"M": "Masculino", "F": "Feminino"}),
+    "Localização": ("TP_LOCALIZACAO_ESC", {1: "Urbana", 2: "Rural"}),
+    "Administração": ("TP_DEPENDENCIA_ADM_ESC", {1: "Federal", 2: "Estadual", 3: "Municipal", 4: "Privada"}),
+}
+
+COLUNA_MUNICIPIO = "CO_MUNICIPIO_ESC"   # município da escola; há também _PROVA e _RESIDENCIA
+
+TIPOS = {
+    **{coluna: pa.float64() for coluna in AREAS},
+    "NU_ANO": pa.int64(),
+    "TP_SEXO": pa.string(),
+    "TP_LOCALIZACAO_ESC": pa.int64(),
+    "TP_DEPENDENCIA_ADM_ESC": pa.int64(),
+}
+
+
+def ano_do_arquivo(caminho):
+    """ Ano no nome do arquivo (MICRODADOS_ENEM_2023.csv -> 2023), ou None """
+    encontrado = re.search(r"(20\d{2})", os.path.basename(caminho))
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def somar_bloco(df):
+    """ Somas e contagens de notas por (Ano, Categoria, Segmento) num bloco """
+    partes = []
+    for categoria, (coluna, segmentos) in CATEGORIAS.items():
+        segmento = df[coluna].map(segmentos)
+        notas = df[list(AREAS)].assign(Ano=df["NU_ANO"], Categoria=categoria, Segmento=segmento)
+        notas = notas.dropna(subset=["Segmento"])
+        if notas.empty:
+            continue
+        grupos = notas.groupby(["Ano", "Categoria", "Segmento"])
+        somas = grupos[list(AREAS)].sum().add_prefix("soma_")
+        contagens = grupos[list(AREAS)].count().add_prefix("n_")
+        partes.append(somas.join(contagens))
+    return pd.concat(partes) if partes else None
+
+
+def agregar_arquivo(caminho, acumulado=None, coluna_municipio=COLUNA_MUNICIPIO, municipio=CODIGO_MUNICIPIO,
+                    tamanho_bloco=TAMANHO_BLOCO):
+    """ Acumula as somas/contagens de um arquivo de microdados; devolve o acumulado """
+    colunas = ["NU_ANO", coluna_municipio] + [c for c, _ in CATEGORIAS.values()] + list(AREAS)
+    tipos = {**TIPOS, coluna_municipio: pa.int64()}
+    ano = ano_do_arquivo(caminho)
+
+    linhas = 0
+    for df in ler_em_blocos(caminho, colunas, tipos, filtro_municipio(coluna_municipio, municipio),
+                            padrao="MICRODADOS_ENEM_*.csv", tamanho_bloco=tamanho_bloco):
+        if df["NU_ANO"].isna().all() and ano is not None:
+            df["NU_ANO"] = ano
+        linhas += len(df)
+        parcial = somar_bloco(df)
+        if parcial is not None:
+            acumulado = parcial if acumulado is None else acumulado.add(parcial, fill_value=0)
+    print(f"   📄 {os.path.basename(caminho)}: {linhas} participantes do município")
+    return acumulado
+
+
+def medias(acumulado):
+    """ DataFrame no esquema de enem_medias a partir das somas/contagens """
+    if acumulado is None:
+        return pd.DataFrame(columns=[c for c, _ in CONJUNTO_ENEM.colunas])
+    df = pd.DataFrame(index=acumulado.index)
+    for coluna, area in AREAS.items():
+        contagem = acumulado[f"n_{coluna}"]
+        df[area] = (acumulado[f"soma_{coluna}"] / contagem.where(contagem > 0)).round()
+    df = df.dropna(how="all").reset_index()
+    df["Ano"] = df["Ano"].astype(int)
+    return df[[c for c, _ in CONJUNTO_ENEM.colunas]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Médias do ENEM no município a partir dos microdados do INEP.")
+    parser.add_argument("arquivos", nargs="+", help="MICRODADOS_ENEM_<ano>.csv ou o .zip do INEP")
+    parser.add_argument("--municipio", type=int, default=CODIGO_MUNICIPIO, help="Código IBGE do município")
+    parser.add_argument("--coluna-municipio", default=COLUNA_MUNICIPIO,
+                        help="Coluna do município (CO_MUNICIPIO_ESC, CO_MUNICIPIO_PROVA, ...)")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO // (1024 * 1024),
+                        help="Tamanho do bloco de leitura em MB")
+    parser.add_argument("--pasta-armazem", default=PASTA_ARMAZEM, help="Pasta do armazém Parquet")
+    parser.add_argument("--excel", help="Exporta o conjunto para este .xlsx depois de gravar")
+    args = parser.parse_args()
+
+    print(f"📊 Agregando {len(args.arquivos)} arquivo(s) de microdados do ENEM...")
+    acumulado = None
+    for caminho in args.arquivos:
+        acumulado = agregar_arquivo(caminho, acumulado, args.coluna_municipio, args.municipio,
+                                    args.tamanho_bloco * 1024 * 1024)
+    df = medias(acumulado)
+    if df.empty:
+        print("❌ Nenhum participante do município nos arquivos.")
+        return
+
+    armazem = Armazem(args.pasta_armazem)
+    print(resumo_gravacao(CONJUNTO_ENEM, armazem.gravar(CONJUNTO_ENEM, df)))
+    if args.excel and armazem.exportar_excel([CONJUNTO_ENEM], args.excel):
+        print(f"✅ Arquivo salvo em: {args.excel}")
+
+
+if __name__ == "__main__":
+    main()
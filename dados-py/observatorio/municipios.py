@@ -0,0 +1,109 @@
+"""
+Municípios como dimensão da coleta (comparação de São João de Meriti com os
+92 municípios do RJ).
+
+As telas do QEdu têm o município no caminho da URL
+(/municipio/3305109-sao-joao-de-meriti/...); `tela_do_municipio` troca esse
+trecho em todos os endereços da tela, sem mexer na grade nem nos
+extratores. A lista de municípios vem da API de localidades do IBGE e fica
+guardada em .cache_ibge/municipios-<uf>.json.
+
+Os resultados de vários municípios vão para conjuntos próprios do armazém
+(`conjunto_por_municipio`: <conjunto>_municipios), com o código IBGE na chave.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass, replace
+from functools import partial
+
+from observatorio.armazem import Conjunto
+from observatorio.link_direto import slug
+
+PASTA_CACHE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache_ibge")
+URL_MUNICIPIOS = "https://servicodados.ibge.gov.br/api/v1/localidades/estados/{uf}/municipios"
+UF_PADRAO = "33"  # Rio de Janeiro
+
+RE_MUNICIPIO_URL = re.compile(r"/municipio/\d{7}-[^/?#]+")
+
+
+@dataclass(frozen=True)
+class Municipio:
+    codigo: int
+    nome: str
+
+    @property
+    def slug(self):
+        """ Trecho da URL do QEdu: 3305109-sao-joao-de-meriti """
+        return f"{self.codigo}-{slug(self.nome)}"
+
+
+SAO_JOAO_DE_MERITI = Municipio(3305109, "São João de Meriti")
+
+
+def listar_municipios(uf=UF_PADRAO, pasta_cache=PASTA_CACHE):
+    """ Municípios da UF (código IBGE e nome), da cache ou da API do IBGE """
+    caminho = os.path.join(pasta_cache, f"municipios-{uf}.json")
+    if not os.path.exists(caminho):
+        # Import local: o httpx só é necessário para baixar a lista uma vez
+        import httpx
+        resposta = httpx.get(URL_MUNICIPIOS.format(uf=uf), timeout=30)
+        resposta.raise_for_status()
+        os.makedirs(pasta_cache, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump([{"id": m["id"], "nome": m["nome"]} for m in resposta.json()], f, ensure_ascii=False, indent=1)
+        os.replace(temporario, caminho)
+    with open(caminho, encoding="utf-8") as f:
+        return [Municipio(int(m["id"]), m["nome"]) for m in json.load(f)]
+
+
+def resolver_municipios(especificacao, uf=UF_PADRAO, pasta_cache=PASTA_CACHE):
+    """ "rj" (todos da UF) ou códigos IBGE separados por vírgula -> [Municipio] """
+    if especificacao.strip().lower() in ("rj", "todos"):
+        return listar_municipios(uf, pasta_cache)
+    codigos = [int(codigo) for codigo in especificacao.split(",") if codigo.strip()]
+    if codigos == [SAO_JOAO_DE_MERITI.codigo]:
+        return [SAO_JOAO_DE_MERITI]
+    por_codigo = {m.codigo: m for m in listar_municipios(uf, pasta_cache)}
+    faltando = [str(codigo) for codigo in codigos if codigo not in por_codigo]
+    if faltando:
+        raise ValueError(f"Códigos IBGE fora da UF {uf}: {', '.join(faltando)}")
+    return [por_codigo[codigo] for codigo in codigos]
+
+
+# --- TELAS E CONJUNTOS POR MUNICÍPIO ---
+
+def url_do_municipio(url, municipio):
+    return RE_MUNICIPIO_URL.sub(f"/municipio/{municipio.slug}", url, count=1)
+
+
+def tela_do_municipio(tela, municipio):
+    """
+    A mesma tela apontando para outro município. O nome muda junto: o link
+    direto aprendido, as opções descobertas e os endpoints JSON gravados são
+    guardados por tela.
+    """
+    return replace(
+        tela,
+        nome=f"{tela.nome} - {municipio.codigo}",
+        url_base=url_do_municipio(tela.url_base, municipio),
+    )
+
+
+def _ordenar_por_municipio(ordenar, df):
+    if ordenar is not None:
+        df = ordenar(df)
+    return df.sort_values("Código IBGE", kind="stable")
+
+
+def conjunto_por_municipio(conjunto):
+    """ Esquema consolidado de vários municípios: <nome>_municipios, chave com o código IBGE """
+    return Conjunto(
+        nome=f"{conjunto.nome}_municipios",
+        colunas=(("Código IBGE", "inteiro"), ("Município", "categoria")) + conjunto.colunas,
+        chave=("Código IBGE",) + conjunto.chave,
+        coluna_ano=conjunto.coluna_ano,
+        aba=conjunto.aba,
+        ordenar=partial(_ordenar_por_municipio, conjunto.ordenar),
+    )
@@ -0,0 +1,239 @@
+"""
+Chrome das coletas: configuração do driver, cliques e dropdowns que esperam
+a tela assentar, e a sessão compartilhada.
+
+Com a sessão compartilhada aberta, todos os trabalhos que rodam no mesmo
+processo usam o mesmo Chrome (aberto só quando alguma célula precisa dele),
+em vez de cada um pagar a subida do navegador. Workers paralelos rodam em
+processos próprios e continuam abrindo o seu.
+
+O driver sai de um perfil de desempenho (observatorio.perfis): o padrão é o
+Chrome de sempre; o "rapido" é headless, enxuto e bloqueia recursos inúteis.
+
+Com o serviço de navegadores configurado (observatorio.servico_navegador),
+cada fatia arrenda um Chrome já aquecido em vez de abrir o seu.
+"""
+import os
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select, WebDriverWait
+
+from observatorio.espera import executar_e_aguardar
+from observatorio.perfis import PERFIS, aplicar_perfil, ativar_bloqueios
+
+# Região observada para saber quando a tela terminou de atualizar
+SELETOR_DADOS = "#main"
+TIMEOUT_ESPERA = 10
+
+
+def configurar_driver(headless=False, perfil=None):
+    """ Chrome no perfil pedido (nome ou PerfilNavegador; padrão: "padrao") """
+    if perfil is None or isinstance(perfil, str):
+        perfil = PERFIS[perfil or "padrao"]
+    options = Options()
+    aplicar_perfil(options, perfil, headless)
+    driver = webdriver.Chrome(options=options)
+    ativar_bloqueios(driver, perfil)
+    # Lido por observatorio.perfis.medir_navegacao
+    driver.perfil_observatorio = perfil
+    return driver
+
+
+def forcar_clique(driver, texto_alvo, tentar_scroll=True, seletor=SELETOR_DADOS, timeout=TIMEOUT_ESPERA):
+    """
+    Tenta clicar em um elemento pelo texto e espera a tela assentar.
+    Retorna True se clicou, False se não achou.
+    """
+    try:
+        # XPath busca qualquer elemento que contenha o texto
+        xpath = f"//*[contains(text(), '{texto_alvo}')]"
+
+        # Espera curta para verificar existência
+        elemento = WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.XPATH, xpath))
+        )
+
+        if tentar_scroll:
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elemento)
+
+        # Tenta clique normal e fallback para JS
+        def clicar():
+            try:
+                elemento.click()
+            except:
+                driver.execute_script("arguments[0].click();", elemento)
+
+        # Espera o site atualizar os dados (sai assim que a tela assentar)
+        resultado = executar_e_aguardar(driver, clicar, seletor, timeout)
+        if not resultado.estavel:
+            print(f"      ⏱️ '{texto_alvo}': tela não assentou em {timeout}s.")
+        elif not resultado.mudou:
+            print(f"      ℹ️ '{texto_alvo}': clique não alterou os dados da tela.")
+        return True
+    except:
+        return False
+
+
+def opcao_selecionada(select):
+    """ Texto da opção selecionada no dropdown, ou None """
+    try:
+        return select.first_selected_option.text
+    except Exception:
+        return None
+
+
+def opcao_do_dropdown(driver, xpath):
+    """ Texto da opção que o dropdown mostra (sem esperar), ou None """
+    elementos = driver.find_elements(By.XPATH, xpath)
+    return opcao_selecionada(Select(elementos[0])) if elementos else None
+
+
+def opcoes_do_dropdown(driver, xpath):
+    """ Textos de todas as opções do dropdown (sem esperar), ou None se ele não está na tela """
+    elementos = driver.find_elements(By.XPATH, xpath)
+    return [op.text for op in Select(elementos[0]).options] if elementos else None
+
+
+def selecionar_dropdown(driver, xpath, texto_visivel, seletor=SELETOR_DADOS, timeout=TIMEOUT_ESPERA):
+    """ Seleciona no dropdown a opção que contém o texto e espera a tela assentar """
+    try:
+        elemento = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+
+        # Garante visibilidade
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elemento)
+
+        select = Select(elemento)
+
+        # Às vezes o texto no site tem espaços extras, então vamos ser flexíveis
+        opcoes = [op.text for op in select.options]
+        for op in opcoes:
+            if texto_visivel.lower() in op.lower():
+                if opcao_selecionada(select) == op:
+                    # Já está nessa opção: selecionar de novo só custaria uma espera
+                    return True
+                resultado = executar_e_aguardar(
+                    driver, lambda: select.select_by_visible_text(op), seletor, timeout
+                )
+                if not resultado.estavel:
+                    print(f"      ⏱️ '{texto_visivel}': tela não assentou em {timeout}s.")
+                return True
+
+        print(f"      ⚠️ Opção '{texto_visivel}' não encontrada no menu.")
+        return False
+    except Exception as e:
+        print(f"      ⚠️ Erro no dropdown: {e}")
+        return False
+
+
+# Primeiro dos textos cujo botão/aba aparece marcado como ativo na tela
+JS_BOTAO_MARCADO = """
+const textos = arguments[0];
+const marcado = (el) =>
+    ['aria-pressed', 'aria-selected', 'aria-checked'].some(a => el.getAttribute(a) === 'true')
+    || !['', 'false'].includes(el.getAttribute('aria-current') || '')
+    || /(^|[\\s_-])(active|selected|ativo|selecionad[oa])($|[\\s_-])/i.test(el.getAttribute('class') || '');
+for (const texto of textos) {
+    for (const el of document.querySelectorAll('button, a, [role=tab], [role=button], [role=radio]')) {
+        if ((el.innerText || '').trim() === texto && marcado(el)) return texto;
+    }
+}
+return null;
+"""
+
+
+def botao_marcado(driver, textos):
+    """ Qual dos `textos` está selecionado nos botões da tela (None se nenhum) """
+    try:
+        return driver.execute_script(JS_BOTAO_MARCADO, list(textos))
+    except Exception:
+        return None
+
+
+# Quais textos aparecem em algum elemento (mesmo critério do XPath de forcar_clique)
+JS_TEXTOS_PRESENTES = """
+return arguments[0].filter(texto => document.evaluate(
+    "count(//*[contains(text(), '" + texto + "')])", document, null, XPathResult.NUMBER_TYPE, null
+).numberValue > 0);
+"""
+
+
+def textos_presentes(driver, textos):
+    """ Dos `textos`, os que forcar_clique acharia na tela agora (uma consulta só) """
+    return driver.execute_script(JS_TEXTOS_PRESENTES, list(textos))
+
+
+# --- SESSÃO COMPARTILHADA ---
+
+class SessaoNavegador:
+    """ Um Chrome reaproveitado por todos os trabalhos do processo """
+
+    def __init__(self, headless=False, perfil=None):
+        self.headless = headless
+        self.perfil = perfil
+        self.pid = os.getpid()
+        self._driver = None
+
+    @property
+    def driver(self):
+        # Só abre o Chrome quando alguma célula realmente precisa dele
+        if self._driver is None:
+            print("🌐 Abrindo o navegador compartilhado...")
+            self._driver = configurar_driver(self.headless, self.perfil)
+        return self._driver
+
+    def fechar(self):
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+
+_sessao = None
+
+
+@contextmanager
+def sessao_compartilhada(headless=False, perfil=None):
+    """ Enquanto estiver aberta, `abrir_navegador` devolve sempre o mesmo Chrome """
+    global _sessao
+    anterior, _sessao = _sessao, SessaoNavegador(headless, perfil)
+    try:
+        yield _sessao
+    finally:
+        _sessao.fechar()
+        _sessao = anterior
+
+
+@contextmanager
+def abrir_navegador(headless=False, perfil=None, url=None):
+    """
+    Chrome para uma fatia da grade, nesta ordem: uma sessão arrendada do
+    serviço de navegadores (de preferência já parada em `url`), o da sessão
+    compartilhada, se houver uma aberta neste processo, ou um próprio,
+    fechado no fim.
+    """
+    servico = os.environ.get("OBSERVATORIO_SERVICO_NAVEGADOR")
+    if servico:
+        # Import local: o serviço usa configurar_driver deste módulo
+        from observatorio.servico_navegador import navegador_arrendado, pedir_arrendamento
+        try:
+            arrendamento = pedir_arrendamento(servico, url)
+        except Exception as e:
+            print(f"⚠️ Serviço de navegadores indisponível ({e}). Abrindo um Chrome próprio.")
+        else:
+            with navegador_arrendado(servico, arrendamento) as driver:
+                yield driver
+            return
+
+    # Processos filhos herdam a variável no fork, mas não o Chrome do pai
+    if _sessao is not None and _sessao.pid == os.getpid():
+        yield _sessao.driver
+        return
+
+    driver = configurar_driver(headless, perfil)
+    try:
+        yield driver
+    finally:
+        driver.quit()
@@ -0,0 +1,76 @@
+"""
+Execução da grade de filtros em vários navegadores ao mesmo tempo.
+
+A grade (ex.: ano x etapa x disciplina) é uma lista de células. Ela é
+dividida em fatias contíguas e cada fatia roda num processo próprio, com
+seu próprio Chrome. Os resultados voltam na ordem original da grade, então
+a saída é a mesma do modo sequencial, só que mais rápida.
+
+Cada fatia roda num executor separado: se um worker cair (Chrome travado,
+processo morto), só as células dele se perdem.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+
+def dividir_em_fatias(celulas, n_workers):
+    """ Divide a grade em até `n_workers` fatias contíguas de (índice, célula) """
+    indexadas = list(enumerate(celulas))
+    n = max(1, min(n_workers, len(indexadas)))
+    tamanho, resto = divmod(len(indexadas), n)
+
+    fatias = []
+    inicio = 0
+    for i in range(n):
+        fim = inicio + tamanho + (1 if i < resto else 0)
+        fatias.append(indexadas[inicio:fim])
+        inicio = fim
+    return fatias
+
+
+def executar_grade(celulas, processar_fatia, n_workers=1):
+    """
+    Roda `processar_fatia(numero_worker, fatia)` sobre a grade.
+
+    `processar_fatia` recebe uma lista de (índice, célula) e devolve uma lista
+    de (índice, resultado). O retorno aqui é a lista de resultados na ordem
+    da grade, com None nas células que não produziram nada.
+    """
+    fatias = dividir_em_fatias(celulas, n_workers)
+    resultados = [None] * len(celulas)
+
+    if len(fatias) == 1:
+        # Modo sequencial: roda no próprio processo, sem custo de spawn
+        for indice, resultado in processar_fatia(0, fatias[0]):
+            resultados[indice] = resultado
+        return resultados
+
+    executores = [ProcessPoolExecutor(max_workers=1) for _ in fatias]
+    try:
+        futuros = [
+            executor.submit(processar_fatia, numero, fatia)
+            for numero, (executor, fatia) in enumerate(zip(executores, fatias))
+        ]
+        for numero, (futuro, fatia) in enumerate(zip(futuros, fatias)):
+            try:
+                for indice, resultado in futuro.result():
+                    resultados[indice] = resultado
+            except Exception as e:
+                print(f"❌ Worker {numero} falhou ({len(fatia)} células perdidas): {e}")
+    finally:
+        for executor in executores:
+            executor.shutdown(cancel_futures=True)
+
+    return resultados
+
+
+def completar_resultados(celulas, resultados, executar):
+    """
+    Roda `executar(subgrade)` só nas células ainda sem resultado e preenche a lista.
+    `executar` recebe uma lista de células e devolve os resultados na mesma ordem.
+    """
+    faltando = [i for i, resultado in enumerate(resultados) if resultado is None]
+    if faltando:
+        novos = executar([celulas[i] for i in faltando])
+        for indice, resultado in zip(faltando, novos):
+            resultados[indice] = resultado
+    return resultados
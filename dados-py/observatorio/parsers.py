@@ -0,0 +1,208 @@
+"""
+Backends de leitura de HTML para os extratores do QEdu.
+
+  - "lxml":        BeautifulSoup com o parser em C do lxml (árvore completa);
+  - "html.parser": BeautifulSoup com o parser puro-Python (o mais lento);
+  - "selectolax":  parser em C do selectolax, só texto (sem árvore bs4);
+  - "texto":       sem árvore nenhuma: remove tags por regex e fica com o texto.
+
+Os backends com árvore montam só a região de dados (#main) quando ela
+existe, via SoupStrainer. Os backends só-texto pulam a localização
+estrutural do componente e tokenizam o texto direto.
+
+O padrão é o mais rápido na última medição sobre as telas gravadas na cache
+(`python -m observatorio.parsers medir`), desde que tenha dado o mesmo
+resultado que o html.parser em todas elas. A medição fica sempre em
+ARQUIVO_MEDICAO, qualquer que seja a cache medida. Sem medição, vale lxml se
+estiver instalado, senão html.parser. A variável de ambiente
+OBSERVATORIO_PARSER (ou --parser nos scripts) força um backend.
+"""
+import argparse
+import glob
+import gzip
+import html as html_mod
+import json
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from observatorio.cache_telas import PASTA_PADRAO as PASTA_CACHE_PADRAO
+
+BACKENDS = ["lxml", "html.parser", "selectolax", "texto"]
+BACKENDS_ARVORE = {"lxml", "html.parser"}
+REFERENCIA = "html.parser"
+REGIAO_PADRAO = "main"   # id da região de dados
+ARQUIVO_MEDICAO = os.path.join(PASTA_CACHE_PADRAO, "parsers.json")
+
+RE_DESCARTAVEL = re.compile(
+    r"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL
+)
+RE_TAG = re.compile(r"<[^>]*>")
+
+
+def _instalado(backend):
+    try:
+        if backend == "lxml":
+            import lxml  # noqa: F401
+        elif backend == "selectolax":
+            import selectolax  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def backends_disponiveis():
+    return [backend for backend in BACKENDS if _instalado(backend)]
+
+
+def parser_padrao(arquivo_medicao=ARQUIVO_MEDICAO):
+    """ Backend em uso: variável de ambiente > última medição > preferência fixa """
+    escolhido = os.environ.get("OBSERVATORIO_PARSER")
+    if escolhido:
+        return escolhido
+    try:
+        with open(arquivo_medicao, encoding="utf-8") as f:
+            escolhido = json.load(f).get("padrao")
+        if escolhido and _instalado(escolhido):
+            return escolhido
+    except (OSError, ValueError):
+        pass
+    return "lxml" if _instalado("lxml") else "html.parser"
+
+
+def criar_arvore(html, parser=None, regiao=REGIAO_PADRAO):
+    """
+    Árvore BeautifulSoup (só da região, quando existir) ou None para os
+    backends só-texto.
+    """
+    parser = parser or parser_padrao()
+    if parser not in BACKENDS_ARVORE:
+        return None
+    if regiao:
+        arvore = BeautifulSoup(html, parser, parse_only=SoupStrainer(id=regiao))
+        if arvore.contents:
+            return arvore
+    return BeautifulSoup(html, parser)
+
+
+def texto_sem_arvore(html, separador=" "):
+    """ Texto do HTML sem montar árvore (equivale a get_text(separador, strip=True)) """
+    limpo = RE_DESCARTAVEL.sub(" ", html)
+    partes = (html_mod.unescape(parte).strip() for parte in RE_TAG.split(limpo))
+    return separador.join(parte for parte in partes if parte)
+
+
+def extrair_texto(html, parser=None, separador=" ", regiao=REGIAO_PADRAO):
+    """ Texto da página (ou da região) com o backend escolhido """
+    parser = parser or parser_padrao()
+    if parser == "texto":
+        return texto_sem_arvore(html, separador)
+    if parser == "selectolax":
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:  # selectolax < 0.3.13
+            from selectolax.parser import HTMLParser
+
+        arvore = HTMLParser(html)
+        for descartavel in arvore.css("script, style, noscript, template"):
+            descartavel.decompose()
+        no = (arvore.css_first(f"#{regiao}") if regiao else None) or arvore.body or arvore.root
+        return no.text(separator=separador, strip=True) if no is not None else ""
+    return criar_arvore(html, parser, regiao).get_text(separator=separador, strip=True)
+
+
+def texto_da_regiao(html, regiao=REGIAO_PADRAO, parser=None):
+    """ Texto da região de dados, uma linha por trecho (equivalente ao `.text` do Selenium) """
+    return extrair_texto(html, parser, separador="\n", regiao=regiao)
+
+
+def texto_por_xpath(html, xpath):
+    """ textContent do primeiro elemento do XPath, ou None """
+    # Import local: o lxml só é necessário para os cards lidos por XPath
+    from lxml import html as lxml_html
+
+    elementos = lxml_html.fromstring(html).xpath(xpath)
+    return elementos[0].text_content() if elementos else None
+
+
+def medir_backends(paginas, extrair, repeticoes=3):
+    """
+    Mede páginas/segundo de `extrair(html, parser)` em cada backend disponível
+    e confere o resultado contra o html.parser.
+    Devolve {backend: {"paginas_por_segundo": x, "igual_referencia": bool}};
+    um backend que quebrou fica com paginas_por_segundo None e o "erro".
+    """
+    referencia = [extrair(html, REFERENCIA) for html in paginas]
+    medicao = {}
+    for backend in backends_disponiveis():
+        try:
+            resultados = [extrair(html, backend) for html in paginas]
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                for html in paginas:
+                    extrair(html, backend)
+            duracao = time.perf_counter() - inicio
+        except Exception as e:
+            medicao[backend] = {"paginas_por_segundo": None, "igual_referencia": False, "erro": str(e)}
+            continue
+        medicao[backend] = {
+            "paginas_por_segundo": round(len(paginas) * repeticoes / duracao, 1) if duracao else None,
+            "igual_referencia": resultados == referencia,
+        }
+    return medicao
+
+
+def escolher_padrao(medicao):
+    """ O mais rápido entre os que bateram com a referência """
+    validos = [b for b, m in medicao.items() if m["igual_referencia"] and m["paginas_por_segundo"]]
+    return max(validos, key=lambda b: medicao[b]["paginas_por_segundo"]) if validos else REFERENCIA
+
+
+def carregar_paginas_da_cache(pasta_cache=PASTA_CACHE_PADRAO):
+    """ Todas as telas gravadas na cache (uma vez cada) """
+    paginas = []
+    for caminho in sorted(glob.glob(os.path.join(pasta_cache, "objetos", "*", "*.gz"))):
+        with gzip.open(caminho, "rb") as f:
+            paginas.append(f.read().decode("utf-8"))
+    return paginas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede os backends de HTML nas telas gravadas e escolhe o padrão.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_medir = sub.add_parser("medir")
+    p_medir.add_argument("--pasta-cache", default=PASTA_CACHE_PADRAO, help="Cache de telas a medir")
+    p_medir.add_argument("--arquivo-medicao", default=ARQUIVO_MEDICAO,
+                         help="Onde gravar a medição (é o arquivo que parser_padrao lê)")
+    p_medir.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    # Import local para evitar ciclo (proficiencia usa este módulo)
+    from observatorio.proficiencia import extrair_indicadores
+
+    paginas = carregar_paginas_da_cache(args.pasta_cache)
+    if not paginas:
+        print(f"❌ Nenhuma tela gravada em {args.pasta_cache}. Rode uma coleta antes.")
+        return
+
+    medicao = medir_backends(paginas, lambda html, backend: extrair_indicadores(html, backend), args.repeticoes)
+    padrao = escolher_padrao(medicao)
+    for backend, m in sorted(medicao.items(), key=lambda item: -(item[1]["paginas_por_segundo"] or 0)):
+        if m.get("erro"):
+            marca = f"❌ {m['erro']}"
+        else:
+            marca = "✅" if m["igual_referencia"] else "⚠️ difere da referência"
+        velocidade = "—" if m["paginas_por_segundo"] is None else m["paginas_por_segundo"]
+        print(f"   {backend:12s} {velocidade:>10} páginas/s  {marca}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.arquivo_medicao)), exist_ok=True)
+    with open(args.arquivo_medicao, "w", encoding="utf-8") as f:
+        json.dump({"padrao": padrao, "paginas": len(paginas), "pasta_cache": args.pasta_cache,
+                   "medicao": medicao, "em": time.time()}, f, indent=2)
+    print(f"🏁 Padrão escolhido: {padrao} ({len(paginas)} telas medidas) -> {args.arquivo_medicao}")
+
+
+if __name__ == "__main__":
+    main()
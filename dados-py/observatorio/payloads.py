@@ -0,0 +1,74 @@
+"""
+Leitura genérica dos payloads JSON do QEdu (motor HTTP).
+
+Os endpoints gravados (observatorio.endpoints) devolvem os números das telas
+em JSON, sem o texto em volta. Aqui o JSON é reduzido a pares
+(rótulo, número), que os extratores casam com os mesmos rótulos dos cards e
+dos níveis de proficiência:
+
+  - {"creche": 1204}                          -> ("creche", 1204)
+  - {"nome": "Creche", "total": 1204}         -> ("Creche", 1204)
+  - {"creche": {"total": 1204}}               -> ("creche", 1204)
+  - {"anosIniciais": 5432}                    -> ("anos Iniciais", 5432)
+
+Campos de identificação (id, código, ano...) não viram pares.
+"""
+import re
+
+CAMPOS_ROTULO = ("nome", "rotulo", "label", "titulo", "descricao", "name", "title", "etapa", "nivel")
+CAMPOS_VALOR = ("valor", "value", "total", "quantidade", "qtd", "percentual", "porcentagem", "count")
+CAMPOS_IGNORADOS = {"id", "codigo", "code", "ano", "year", "ibge", "ordem", "posicao", "order", "index"}
+
+RE_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+
+def _numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def rotulo_da_chave(chave):
+    """ "anos_iniciais" / "anosIniciais" -> "anos iniciais" / "anos Iniciais" """
+    return " ".join(RE_CAMEL.sub(" ", str(chave)).replace("_", " ").replace("-", " ").split())
+
+
+def _primeiro(objeto, campos, aceitar):
+    for campo in campos:
+        if campo in objeto and aceitar(objeto[campo]):
+            return objeto[campo]
+    return None
+
+
+def pares_rotulados(payload, rotulo_pai=None):
+    """ [(rótulo, número), ...] na ordem em que aparecem no JSON """
+    pares = []
+    if isinstance(payload, list):
+        for item in payload:
+            pares += pares_rotulados(item, rotulo_pai)
+    elif isinstance(payload, dict):
+        rotulo = _primeiro(payload, CAMPOS_ROTULO, lambda v: isinstance(v, str) and v.strip()) or rotulo_pai
+        valor = _primeiro(payload, CAMPOS_VALOR, _numero)
+        if rotulo and valor is not None:
+            pares.append((rotulo, valor))
+        for chave, item in payload.items():
+            if str(chave).lower() in CAMPOS_IGNORADOS or chave in CAMPOS_ROTULO or chave in CAMPOS_VALOR:
+                continue
+            if _numero(item):
+                pares.append((rotulo_da_chave(chave), item))
+            elif isinstance(item, (dict, list)):
+                pares += pares_rotulados(item, rotulo_da_chave(chave))
+    return pares
+
+
+def pares_dos_payloads(payloads):
+    """ Pares de todos os payloads de uma célula, na ordem dos endpoints """
+    return [par for payload in payloads for par in pares_rotulados(payload)]
+
+
+def formatar_inteiro(numero):
+    """ 1204 -> "1.204" (como nos cards da tela) """
+    return f"{int(numero):,}".replace(",", ".")
+
+
+def texto_dos_pares(pares):
+    """ Uma linha "rótulo 1.204" por par inteiro: o texto que os extratores de tela já leem """
+    return "\n".join(f"{rotulo} {formatar_inteiro(numero)}" for rotulo, numero in pares if float(numero).is_integer())
@@ -0,0 +1,169 @@
+"""
+Perfis de desempenho do Chrome das coletas.
+
+  - "padrao": o navegador de sempre (visível, maximizado, carrega tudo);
+  - "rapido": headless, janela pequena e fixa, cache em disco reaproveitado
+    entre execuções e bloqueio, via DevTools (Network.setBlockedURLs), de
+    imagens, fontes, mídia e dos domínios de analytics/rastreadores.
+
+Nenhum dado extraído depende de imagem, fonte ou rastreador: o que se ganha é
+carregamento mais curto e menos memória por navegador, o que pesa quando
+vários rodam em paralelo.
+
+Com `medir_rede`, cada navegação informa bytes transferidos (somados do log
+de performance do Chrome) e tempo de carregamento (Navigation Timing). O log
+do Chrome só pode ser lido uma vez: quem mais o lê (observatorio.endpoints)
+usa `ler_log_performance`, que deixa as mensagens guardadas para a medição.
+"""
+import json
+import os
+from dataclasses import dataclass, replace
+
+PASTA_CACHE_DISCO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache_navegador")
+
+# Tipos de recurso -> padrões de URL bloqueados (com e sem query string)
+EXTENSOES_POR_TIPO = {
+    "imagem": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"],
+    "fonte": ["woff", "woff2", "ttf", "otf", "eot"],
+    "midia": ["mp4", "webm", "mp3", "ogg", "wav"],
+}
+
+DOMINIOS_RASTREADORES = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "connect.facebook.com", "hotjar.com", "clarity.ms", "segment.io",
+    "mixpanel.com", "newrelic.com", "nr-data.net", "sentry.io",
+]
+
+
+@dataclass(frozen=True)
+class PerfilNavegador:
+    nome: str = "padrao"
+    headless: bool = False
+    janela: tuple = None                 # (largura, altura); None = maximizada
+    pasta_cache_disco: str = None
+    tamanho_cache_disco: int = 200 * 1024 * 1024
+    tipos_bloqueados: tuple = ()         # chaves de EXTENSOES_POR_TIPO
+    dominios_bloqueados: tuple = ()
+    medir_rede: bool = False
+    argumentos_extras: tuple = ()
+
+
+PERFIS = {
+    "padrao": PerfilNavegador(),
+    "rapido": PerfilNavegador(
+        nome="rapido",
+        headless=True,
+        janela=(1280, 900),
+        pasta_cache_disco=PASTA_CACHE_DISCO,
+        tipos_bloqueados=("imagem", "fonte", "midia"),
+        dominios_bloqueados=tuple(DOMINIOS_RASTREADORES),
+        medir_rede=True,
+        argumentos_extras=(
+            "--disable-extensions", "--disable-background-networking", "--no-first-run",
+            "--mute-audio", "--disable-gpu",
+        ),
+    ),
+}
+
+
+def montar_perfil(nome="padrao", tipos=None, dominios=None, medir=None):
+    """ Perfil pelo nome, com bloqueios extras vindos da linha de comando """
+    perfil = PERFIS[nome]
+    if tipos:
+        desconhecidos = set(tipos) - set(EXTENSOES_POR_TIPO)
+        if desconhecidos:
+            raise ValueError(f"Tipos de recurso desconhecidos: {', '.join(sorted(desconhecidos))}")
+        perfil = replace(perfil, tipos_bloqueados=tuple(dict.fromkeys(perfil.tipos_bloqueados + tuple(tipos))))
+    if dominios:
+        perfil = replace(perfil, dominios_bloqueados=tuple(dict.fromkeys(perfil.dominios_bloqueados + tuple(dominios))))
+    if medir is not None:
+        perfil = replace(perfil, medir_rede=medir)
+    return perfil
+
+
+def padroes_bloqueados(perfil):
+    """ Padrões de URL para Network.setBlockedURLs """
+    padroes = []
+    for tipo in perfil.tipos_bloqueados:
+        for extensao in EXTENSOES_POR_TIPO[tipo]:
+            padroes += [f"*.{extensao}", f"*.{extensao}?*"]
+    for dominio in perfil.dominios_bloqueados:
+        padroes.append(f"*{dominio}*")
+    return padroes
+
+
+def aplicar_perfil(options, perfil, headless=False):
+    """ Argumentos e preferências do Chrome para o perfil """
+    if headless or perfil.headless:
+        options.add_argument("--headless=new")
+        largura, altura = perfil.janela or (1920, 1080)
+        options.add_argument(f"--window-size={largura},{altura}")
+    elif perfil.janela:
+        options.add_argument(f"--window-size={perfil.janela[0]},{perfil.janela[1]}")
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument("--ignore-certificate-errors")
+
+    if perfil.pasta_cache_disco:
+        # Várias instâncias na mesma pasta: o Chrome que não conseguir o
+        # lock da cache segue só com a cache em memória
+        os.makedirs(perfil.pasta_cache_disco, exist_ok=True)
+        options.add_argument(f"--disk-cache-dir={perfil.pasta_cache_disco}")
+        options.add_argument(f"--disk-cache-size={perfil.tamanho_cache_disco}")
+    if "imagem" in perfil.tipos_bloqueados:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    for argumento in perfil.argumentos_extras:
+        options.add_argument(argumento)
+    if perfil.medir_rede:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def ativar_bloqueios(driver, perfil):
+    """ Liga o bloqueio de URLs pelo DevTools (vale para todas as navegações) """
+    padroes = padroes_bloqueados(perfil)
+    if padroes:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes})
+
+
+def ler_log_performance(driver):
+    """
+    Mensagens do DevTools desde a última leitura. As de fim de carregamento
+    ficam guardadas no driver até a próxima medição (`consumir_log_rede`),
+    que senão as perderia.
+    """
+    mensagens = [json.loads(entrada["message"])["message"] for entrada in driver.get_log("performance")]
+    driver.mensagens_rede = getattr(driver, "mensagens_rede", []) + [
+        mensagem for mensagem in mensagens if mensagem.get("method") == "Network.loadingFinished"
+    ]
+    return mensagens
+
+
+def consumir_log_rede(driver):
+    """ (bytes, respostas) desde a última leitura do log de performance """
+    total, respostas = 0, 0
+    mensagens = getattr(driver, "mensagens_rede", []) + [
+        json.loads(entrada["message"])["message"] for entrada in driver.get_log("performance")
+    ]
+    driver.mensagens_rede = []
+    for mensagem in mensagens:
+        if mensagem.get("method") == "Network.loadingFinished":
+            total += mensagem["params"].get("encodedDataLength", 0)
+            respostas += 1
+    return total, respostas
+
+
+def medir_navegacao(driver):
+    """
+    {"url", "bytes", "respostas", "carregamento_ms"} da navegação (e cliques)
+    desde a última medição, ou None se o perfil não mede a rede.
+    """
+    perfil = getattr(driver, "perfil_observatorio", None)
+    if perfil is None or not perfil.medir_rede:
+        return None
+    total, respostas = consumir_log_rede(driver)
+    carregamento = driver.execute_script(
+        "const n = performance.getEntriesByType('navigation')[0];"
+        "return n ? Math.round(n.loadEventEnd - n.startTime) : null;"
+    )
+    return {"url": driver.current_url, "bytes": total, "respostas": respostas, "carregamento_ms": carregamento}
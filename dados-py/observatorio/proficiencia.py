@@ -0,0 +1,224 @@
+"""
+Leitura dos indicadores de aprendizado do QEdu, compartilhada pelos
+trabalhos aprendizado e proficiencia (observatorio/conjuntos/qedu_aprendizado.py):
+  - KPI "X% dos alunos têm aprendizado adequado";
+  - níveis de proficiência (Insuficiente, Básico, Proficiente, Avançado).
+
+O texto é percorrido uma única vez por uma regex pré-compilada que reconhece
+dois tipos de token: rótulo de nível e porcentagem. Cada rótulo é ligado à
+porcentagem vizinha (logo depois ou logo antes dele), então o custo é linear
+no tamanho da página e o resultado não depende de backtracking.
+
+No HTML, o componente das barras é localizado pela estrutura: é o menor
+elemento que contém os rótulos de nível que aparecem sozinhos num nó de
+texto (legenda/barra), e só o texto dele é tokenizado.
+
+O HTML é lido pelo backend de observatorio.parsers (lxml, html.parser,
+selectolax ou só-texto); nos backends sem árvore a localização estrutural é
+pulada e o texto da página é tokenizado direto.
+
+`extrair_indicadores_json` devolve o mesmo resultado a partir dos payloads
+JSON da tela (motor HTTP), pelos rótulos dos pares de observatorio.payloads.
+"""
+import re
+import unicodedata
+
+from observatorio.parsers import criar_arvore, extrair_texto
+from observatorio.payloads import pares_dos_payloads
+
+NIVEIS = ["Insuficiente", "Básico", "Proficiente", "Avançado"]
+
+# Distância máxima (em caracteres) entre um rótulo e a sua porcentagem
+DISTANCIA_MAXIMA = 120
+
+RE_TOKEN = re.compile(
+    r"(?P<nivel>\b(?:insuficiente|b[aá]sico|proficiente|avan[cç]ado)\b)"
+    r"|(?P<pct>\b\d{1,3}(?:[.,]\d+)?)\s*%",
+    re.IGNORECASE,
+)
+
+# Nó de texto que é só o rótulo (legenda/barra), e não uma frase explicativa
+RE_ROTULO_ISOLADO = re.compile(
+    r"^\s*(?:insuficiente|b[aá]sico|proficiente|avan[cç]ado)\s*:?\s*$", re.IGNORECASE
+)
+
+RE_ADEQUADO = re.compile(r"(\d{1,3}(?:[.,]\d+)?)\s*%\s*dos alunos têm aprendizado adequado", re.IGNORECASE)
+# Padrão inverso, com distância limitada para não atravessar a página toda
+RE_ADEQUADO_INVERSO = re.compile(
+    r"aprendizado adequado\D{0,80}?(\d{1,3}(?:[.,]\d+)?)\s*%", re.IGNORECASE
+)
+SELETOR_KPI = ".amount, .value, .kpi-value"
+
+# Rótulo de nível num payload JSON ("Básico", "nivel_basico"...), já sem acento
+RE_NIVEL_JSON = re.compile(r"^(?:nivel\s+)?(insuficiente|basico|proficiente|avancado)$")
+
+
+def _sem_acento(texto):
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode().lower()
+
+
+# "basico" -> "Básico", etc.
+_NIVEL_CANONICO = {_sem_acento(nivel): nivel for nivel in NIVEIS}
+
+
+def tokenizar(texto):
+    """ Lista de (tipo, valor, início, fim) com tipo 'nivel' ou 'pct' """
+    tokens = []
+    for m in RE_TOKEN.finditer(texto):
+        if m.group("nivel"):
+            tokens.append(("nivel", _NIVEL_CANONICO[_sem_acento(m.group("nivel"))], m.start(), m.end()))
+        else:
+            tokens.append(("pct", m.group("pct"), m.start(), m.end()))
+    return tokens
+
+
+def extrair_niveis(texto):
+    """
+    {nível: porcentagem como aparece no texto (ex.: "45" ou "45,3")}.
+
+    Se a página escreve "Nível 45%", cada rótulo fica com a porcentagem
+    seguinte; se escreve "45% Nível", com a anterior. A orientação é a que
+    casa mais rótulos na página. Quando um nível aparece mais de uma vez,
+    vale a ocorrência mais colada a uma porcentagem.
+    """
+    tokens = tokenizar(texto)
+
+    # Para cada rótulo: porcentagem imediatamente depois / antes (e a distância)
+    depois, antes = [], []
+    for i, (tipo, nivel, inicio, fim) in enumerate(tokens):
+        if tipo != "nivel":
+            continue
+        if i + 1 < len(tokens) and tokens[i + 1][0] == "pct":
+            distancia = tokens[i + 1][2] - fim
+            if distancia <= DISTANCIA_MAXIMA:
+                depois.append((nivel, distancia, tokens[i + 1][1]))
+        if i > 0 and tokens[i - 1][0] == "pct":
+            distancia = inicio - tokens[i - 1][3]
+            if distancia <= DISTANCIA_MAXIMA:
+                antes.append((nivel, distancia, tokens[i - 1][1]))
+
+    principal, reserva = (depois, antes) if len(depois) >= len(antes) else (antes, depois)
+
+    melhores = {}
+    for ligacoes in (principal, reserva):
+        escolhidos = {}
+        for nivel, distancia, valor in ligacoes:
+            if nivel in melhores:
+                continue
+            if nivel not in escolhidos or distancia < escolhidos[nivel][0]:
+                escolhidos[nivel] = (distancia, valor)
+        melhores.update(escolhidos)
+
+    return {nivel: melhores[nivel][1] for nivel in NIVEIS if nivel in melhores}
+
+
+def _ancestral_comum(nos):
+    """ Elemento mais profundo que contém todos os nós """
+    caminho = []
+    el = nos[0].parent
+    while el is not None:
+        caminho.append(el)
+        el = el.parent
+    profundidade = {id(el): i for i, el in enumerate(caminho)}
+
+    indice = 0
+    for no in nos[1:]:
+        el = no.parent
+        while el is not None and id(el) not in profundidade:
+            el = el.parent
+        if el is None:
+            return None
+        indice = max(indice, profundidade[id(el)])
+    return caminho[indice]
+
+
+def localizar_componente_niveis(soup):
+    """
+    Componente das barras de proficiência: menor elemento que contém um
+    rótulo isolado de cada nível encontrado. None se houver menos de dois.
+    """
+    rotulos = {}
+    for no in soup.find_all(string=RE_ROTULO_ISOLADO):
+        nivel = _NIVEL_CANONICO[_sem_acento(no.strip().rstrip(":").strip())]
+        rotulos.setdefault(nivel, no)
+    if len(rotulos) < 2:
+        return None
+    return _ancestral_comum(list(rotulos.values()))
+
+
+def extrair_niveis_da_pagina(soup, texto_pagina=None):
+    """
+    Níveis de proficiência da tela, um por nível.
+    Usa só o componente das barras; se ele não for achado (ou não render
+    nada), cai no texto da página inteira.
+    """
+    componente = localizar_componente_niveis(soup)
+    if componente is not None:
+        niveis = extrair_niveis(componente.get_text(separator=" | ", strip=True))
+        if niveis:
+            return niveis
+    if texto_pagina is None:
+        texto_pagina = soup.get_text(separator=" | ", strip=True)
+    return extrair_niveis(texto_pagina)
+
+
+def extrair_aprendizado_adequado(soup, texto_pagina=None):
+    """ Valor do KPI de aprendizado adequado (texto, ex.: "45"), ou None """
+    if texto_pagina is None:
+        texto_pagina = soup.get_text(separator=" ", strip=True)
+
+    match = RE_ADEQUADO.search(texto_pagina) or RE_ADEQUADO_INVERSO.search(texto_pagina)
+    if match:
+        return match.group(1)
+
+    # Se não achou via Regex, tenta CSS genérico de destaque (KPIs)
+    for destaque in soup.select(SELETOR_KPI):
+        txt = destaque.get_text(strip=True)
+        if "%" in txt and len(txt) < 8:
+            return txt.replace('%', '').strip()
+    return None
+
+
+def extrair_indicadores(html, parser=None):
+    """
+    {"adequado": valor ou None, "niveis": {nível: valor}} de um HTML,
+    lido com o backend `parser` (padrão: observatorio.parsers.parser_padrao()).
+    """
+    arvore = criar_arvore(html, parser)
+    if arvore is not None:
+        return {
+            "adequado": extrair_aprendizado_adequado(arvore),
+            "niveis": extrair_niveis_da_pagina(arvore),
+        }
+
+    texto = extrair_texto(html, parser)
+    match = RE_ADEQUADO.search(texto) or RE_ADEQUADO_INVERSO.search(texto)
+    return {"adequado": match.group(1) if match else None, "niveis": extrair_niveis(texto)}
+
+
+def _porcentagem(valor):
+    """ 45.25 -> "45,25" (como na tela) """
+    return f"{round(valor, 2):.2f}".rstrip("0").rstrip(".").replace(".", ",")
+
+
+def extrair_indicadores_json(payloads):
+    """
+    Mesmo resultado de `extrair_indicadores`, a partir dos payloads JSON da
+    célula. Frações (níveis somando ~1) viram porcentagem.
+    """
+    adequado, niveis = None, {}
+    for rotulo, valor in pares_dos_payloads(payloads):
+        normalizado = " ".join(_sem_acento(rotulo).split())
+        nivel = RE_NIVEL_JSON.match(normalizado)
+        if nivel:
+            niveis.setdefault(_NIVEL_CANONICO[nivel.group(1)], valor)
+        elif "adequado" in normalizado and adequado is None:
+            adequado = valor
+
+    escala = 100 if niveis and sum(niveis.values()) <= 1.01 else 1
+    if adequado is not None and adequado <= 1 and escala == 100:
+        adequado *= 100
+    return {
+        "adequado": _porcentagem(adequado) if adequado is not None else None,
+        "niveis": {nivel: _porcentagem(niveis[nivel] * escala) for nivel in NIVEIS if nivel in niveis},
+    }
@@ -0,0 +1,261 @@
+"""
+Publicação dos dados do painel de Educação.
+
+Compila os conjuntos (armazém, planilhas de dados-criados/educacao e os KPIs
+de secretarias/educacao/dados_educacao.json) em um JSON pequeno por gráfico:
+
+    secretarias/educacao/publicado/
+        manifesto.json                 <- único arquivo de nome fixo
+        ideb.3f9c2a1b7e.json           <- minificado, nome com hash do conteúdo
+        ideb.3f9c2a1b7e.json.gz        <- variantes pré-comprimidas para servidores
+        ideb.3f9c2a1b7e.json.br           com gzip_static/brotli_static
+        ...
+
+Como o nome muda quando o conteúdo muda, os arquivos de gráfico podem ser
+servidos com cache "immutable"; só o manifesto precisa ser revalidado. O
+painel lê o manifesto e busca os gráficos em paralelo, sem nenhuma chamada
+a APIs de terceiros no navegador.
+
+Cada payload já vem com as chaves que educacao.js usa (ideb_iniciais,
+taxa_distorcao, ...), no formato {labels: ["18", ...], values: [...]}.
+
+Uso:
+    python -m observatorio.publicacao [--destino PASTA] [--pasta-armazem PASTA]
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from observatorio.armazem import PASTA_PADRAO as PASTA_ARMAZEM
+from observatorio.armazem import Armazem
+
+try:
+    import brotli
+except ImportError:  # a variante .br é opcional
+    brotli = None
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PASTA_PLANILHAS = os.path.join(RAIZ, "dados-criados", "educacao")
+JSON_BASE = os.path.join(RAIZ, "secretarias", "educacao", "dados_educacao.json")
+PASTA_DESTINO = os.path.join(RAIZ, "secretarias", "educacao", "publicado")
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+CHAVES_KPI = [
+    "kpi_escolas", "kpi_alunos", "kpi_professores", "kpi_funcionarios", "kpi_turmas",
+    "kpi_responsaveis", "kpi_vagas", "kpi_aulas", "kpi_eventos", "kpi_refeicoes",
+    "kpi_distorcao_ano", "ultima_sincronizacao", "status_das_fontes", "fonte_origem",
+]
+
+
+class Fontes:
+    """ Acesso às origens dos dados (cada uma lida uma vez só) """
+
+    def __init__(self, pasta_armazem=PASTA_ARMAZEM, pasta_planilhas=PASTA_PLANILHAS, json_base=JSON_BASE):
+        self.armazem = Armazem(pasta_armazem)
+        self.pasta_planilhas = pasta_planilhas
+        with open(json_base, encoding="utf-8") as f:
+            self.base = json.load(f)
+        self._planilhas = {}
+
+    def planilha(self, nome):
+        """ Primeira aba de dados-criados/educacao/<nome>.xlsx, ou None """
+        if nome not in self._planilhas:
+            caminho = os.path.join(self.pasta_planilhas, f"{nome}.xlsx")
+            self._planilhas[nome] = pd.read_excel(caminho) if os.path.exists(caminho) else None
+        return self._planilhas[nome]
+
+    def conjunto(self, conjunto):
+        """ Conjunto do armazém, ou None se estiver vazio """
+        df = self.armazem.ler(conjunto)
+        return None if df.empty else df
+
+
+def serie(anos, valores):
+    """ {labels, values} no formato dos gráficos (ano com dois dígitos) """
+    numeros = []
+    for v in valores:
+        v = float(v) if pd.notna(v) else 0.0
+        numeros.append(int(v) if v.is_integer() else round(v, 2))
+    return {"labels": [str(int(ano))[-2:] for ano in anos], "values": numeros}
+
+
+# --- GRÁFICOS ---
+# Cada função devolve o payload do gráfico ou None (vale o que está no JSON base)
+
+def grafico_kpis(fontes):
+    return {chave: fontes.base[chave] for chave in CHAVES_KPI if chave in fontes.base}
+
+
+def grafico_ideb(fontes):
+    df = fontes.planilha("Ideb_fundamental")
+    if df is None:
+        return None
+    df = df.sort_values("Ano")
+    payload = {}
+    for chave, etapa in (("ideb_iniciais", "Anos Iniciais"), ("ideb_finais", "Anos Finais")):
+        linhas = df[df["Tipo de Ensino"].str.contains(etapa)]
+        payload[chave] = serie(linhas["Ano"], linhas["IDEB Porcentagem"])
+    return payload
+
+
+def grafico_taxas(fontes):
+    df = fontes.planilha("Distorcao_Idade_Fundamental")
+    if df is None:
+        return None
+    # Na planilha a coluna da distorção idade-série saiu como "Taxa de Graduação Escolar"
+    linhas = df[df["Education Level"] == "Ensino Fundamental"].sort_values("Ano")
+    return {
+        "taxa_distorcao": serie(linhas["Ano"], linhas["Taxa de Graduação Escolar"]),
+        "taxa_abandono": serie(linhas["Ano"], linhas["Taxa de Abandono Escolar"]),
+    }
+
+
+def grafico_matriculas(fontes):
+    # Evolução na rede municipal: vem do JSON base (a planilha de dados-criados
+    # soma todas as redes e não serve para este gráfico)
+    return {"matriculas": fontes.base["matriculas"]} if "matriculas" in fontes.base else None
+
+
+def grafico_matriculas_nivel(fontes):
+    """
+    Infantil = creche + pré-escola nas escolas com Infantil regular;
+    Fundamental = anos iniciais + finais nas escolas com Fundamental regular.
+    """
+    from observatorio.conjuntos.qedu_censo import CONJUNTO_MATRICULAS_ETAPA
+
+    df = fontes.conjunto(CONJUNTO_MATRICULAS_ETAPA)
+    if df is None:
+        df = fontes.planilha("Censo_SJM_Matriculas")
+        if df is None:
+            return None
+        df = df.rename(columns={"Tipo de Ensino": "Filtro Geral"})
+
+    def somar(filtro, etapas):
+        linhas = df[(df["Filtro Geral"] == filtro) & df["Etapa"].isin(etapas)]
+        return linhas.groupby("Ano")["Matrículas"].sum()
+
+    infantil = somar("Com Ensino Infantil Regular", ["Creche", "Pré-escola"])
+    fundamental = somar("Com Ensino Fundamental Regular", ["Anos Iniciais", "Anos Finais"])
+    # Mesmos anos nas duas séries (o painel soma posição a posição)
+    anos = sorted(set(infantil.index) & set(fundamental.index))
+    return {
+        "mat_infantil": serie(anos, [infantil[ano] for ano in anos]),
+        "mat_fundamental": serie(anos, [fundamental[ano] for ano in anos]),
+    }
+
+
+GRAFICOS = {
+    "kpis": grafico_kpis,
+    "ideb": grafico_ideb,
+    "taxas": grafico_taxas,
+    "matriculas": grafico_matriculas,
+    "matriculas_nivel": grafico_matriculas_nivel,
+}
+
+# Chaves do JSON base usadas quando o gráfico não tem outra fonte
+CHAVES_RESERVA = {
+    "ideb": ["ideb_iniciais", "ideb_finais"],
+    "taxas": ["taxa_distorcao", "taxa_abandono"],
+    "matriculas_nivel": ["mat_infantil", "mat_fundamental"],
+}
+
+
+# --- EMPACOTAMENTO ---
+
+def minificar(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def gravar_variantes(pasta, nome, conteudo):
+    """ Grava nome.<hash>.json (+ .gz e .br) e devolve a entrada do manifesto """
+    digest = hashlib.sha256(conteudo).hexdigest()
+    arquivo = f"{nome}.{digest[:10]}.json"
+    entrada = {"arquivo": arquivo, "sha256": digest, "bytes": len(conteudo)}
+
+    variantes = {arquivo: conteudo}
+    # mtime=0: mesmo conteúdo, mesmo .gz (publicação reprodutível)
+    variantes[arquivo + ".gz"] = gzip.compress(conteudo, compresslevel=9, mtime=0)
+    entrada["gzip"] = len(variantes[arquivo + ".gz"])
+    if brotli is not None:
+        variantes[arquivo + ".br"] = brotli.compress(conteudo, quality=11)
+        entrada["br"] = len(variantes[arquivo + ".br"])
+
+    for nome_arquivo, dados in variantes.items():
+        caminho = os.path.join(pasta, nome_arquivo)
+        if not os.path.exists(caminho):   # nome com hash: se existe, é igual
+            temporario = caminho + ".tmp"
+            with open(temporario, "wb") as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+    return entrada
+
+
+def limpar_antigos(pasta, manter):
+    """ Remove gráficos que não estão no manifesto novo nem no anterior """
+    for caminho in glob.glob(os.path.join(pasta, "*.json*")):
+        nome = os.path.basename(caminho)
+        base = nome[:-3] if nome.endswith((".gz", ".br")) else nome
+        if nome != ARQUIVO_MANIFESTO and base not in manter:
+            os.remove(caminho)
+
+
+def publicar(destino=PASTA_DESTINO, fontes=None):
+    """ Gera os payloads, as variantes e o manifesto. Devolve o manifesto """
+    fontes = fontes or Fontes()
+    os.makedirs(destino, exist_ok=True)
+
+    caminho_manifesto = os.path.join(destino, ARQUIVO_MANIFESTO)
+    anterior = {}
+    if os.path.exists(caminho_manifesto):
+        with open(caminho_manifesto, encoding="utf-8") as f:
+            anterior = json.load(f).get("graficos", {})
+
+    graficos = {}
+    for nome, gerar in GRAFICOS.items():
+        payload = gerar(fontes)
+        if payload is None:
+            payload = {chave: fontes.base[chave] for chave in CHAVES_RESERVA.get(nome, []) if chave in fontes.base}
+            if payload:
+                print(f"   ⚠️ {nome}: sem fonte própria, usando {os.path.basename(JSON_BASE)}")
+        if not payload:
+            print(f"   ⚠️ {nome}: nenhum dado para publicar")
+            continue
+        graficos[nome] = gravar_variantes(destino, nome, minificar(payload))
+
+    manifesto = {
+        "ultima_sincronizacao": fontes.base.get("ultima_sincronizacao"),
+        "graficos": graficos,
+    }
+    temporario = caminho_manifesto + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(minificar(manifesto))
+    os.replace(temporario, caminho_manifesto)
+
+    limpar_antigos(destino, {e["arquivo"] for e in graficos.values()} | {e["arquivo"] for e in anterior.values()})
+    return manifesto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publica os dados do painel de Educação em JSON por gráfico.")
+    parser.add_argument("--destino", default=PASTA_DESTINO, help="Pasta publicada junto com o site")
+    parser.add_argument("--pasta-armazem", default=PASTA_ARMAZEM, help="Pasta do armazém Parquet")
+    args = parser.parse_args()
+
+    manifesto = publicar(args.destino, Fontes(args.pasta_armazem))
+    for nome, entrada in manifesto["graficos"].items():
+        tamanhos = f"{entrada['bytes']} B, gzip {entrada['gzip']} B"
+        if "br" in entrada:
+            tamanhos += f", br {entrada['br']} B"
+        print(f"📦 {nome:18s} {entrada['arquivo']} ({tamanhos})")
+    if brotli is None:
+        print("ℹ️ Pacote 'brotli' não instalado: variantes .br não geradas.")
+    print(f"✅ Manifesto em: {os.path.join(args.destino, ARQUIVO_MANIFESTO)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Verificações de qualidade dos conjuntos do armazém, vetorizadas.
+
+Rodam sobre os DataFrames tipados do armazém (anos inteiros, medidas com
+nulo, dimensões Categorical), com groupby/shift em vez de laços por linha,
+então o histórico inteiro de todos os municípios sai em milissegundos:
+
+  - niveis_somam_100: os níveis de proficiência de cada ano/etapa/disciplina
+    somam ~100% (tolerância TOLERANCIA_SOMA pontos);
+  - salto_anual:      matrículas que variam mais de LIMITE_SALTO (50%) de
+                      um ano para o anterior da mesma série;
+  - zero_suspeito:    0 cercado de valores positivos na mesma série, a marca
+                      do "0 se não houver" da leitura dos cards;
+  - celula_zerada:    todas as etapas de um ano/filtro em 0 (a leitura dos
+                      cards falhou inteira).
+
+Os conjuntos consolidados de vários municípios (<conjunto>_municipios)
+passam pelas mesmas verificações, com o código IBGE entre as dimensões.
+
+Uso:
+    python -m observatorio.qualidade [--pasta-armazem PASTA] [--csv PROBLEMAS.csv]
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from observatorio.armazem import PASTA_PADRAO as PASTA_ARMAZEM
+from observatorio.armazem import Armazem
+
+TOLERANCIA_SOMA = 2.0          # pontos percentuais
+LIMITE_SALTO = 0.5             # variação relativa entre anos
+MINIMO_SALTO = 50              # séries menores que isso oscilam demais para avaliar
+
+COLUNAS_PROBLEMAS = ["Verificação", "Conjunto", "Linha", "Valor", "Detalhe"]
+
+
+def _dimensoes(df, dimensoes):
+    """ Dimensões da série, com o município na frente nos conjuntos consolidados """
+    return (["Código IBGE"] if "Código IBGE" in df.columns else []) + list(dimensoes)
+
+
+def _problemas(verificacao, conjunto, linhas, colunas, valores, detalhes):
+    if linhas.empty:
+        return pd.DataFrame(columns=COLUNAS_PROBLEMAS)
+    partes = [linhas[coluna].astype("string").fillna("∅") for coluna in colunas]
+    descricao = partes[0].str.cat(partes[1:], sep=" | ")
+    return pd.DataFrame({
+        "Verificação": verificacao,
+        "Conjunto": conjunto,
+        "Linha": descricao.to_numpy(),
+        "Valor": pd.Series(valores).to_numpy(),
+        "Detalhe": pd.Series(detalhes).to_numpy(),
+    })
+
+
+def niveis_somam_100(df, conjunto, dimensoes, coluna_valor, tolerancia=TOLERANCIA_SOMA):
+    """ Grupos de níveis cuja soma foge de 100% por mais de `tolerancia` pontos """
+    dimensoes = _dimensoes(df, dimensoes)
+    somas = df.groupby(dimensoes, observed=True)[coluna_valor].sum(min_count=1).reset_index()
+    fora = somas[(somas[coluna_valor] - 100).abs() > tolerancia]
+    return _problemas("niveis_somam_100", conjunto, fora, dimensoes, fora[coluna_valor],
+                      "soma " + fora[coluna_valor].round(1).astype("string") + "%")
+
+
+def _series_por_ano(df, dimensoes, coluna_ano, coluna_valor):
+    """ Linhas ordenadas por série e ano, com o valor do ano anterior e do seguinte na série """
+    ordenado = df.sort_values(dimensoes + [coluna_ano], kind="stable")
+    grupos = ordenado.groupby(dimensoes, observed=True)[coluna_valor]
+    return ordenado.assign(_anterior=grupos.shift(1), _seguinte=grupos.shift(-1))
+
+
+def saltos_anuais(df, conjunto, dimensoes, coluna_ano, coluna_valor, limite=LIMITE_SALTO, minimo=MINIMO_SALTO):
+    """ Variações anuais acima de `limite` (zeros ficam para zeros_suspeitos) """
+    dimensoes = _dimensoes(df, dimensoes)
+    series = _series_por_ano(df, dimensoes, coluna_ano, coluna_valor)
+    atual, anterior = series[coluna_valor].astype("Float64"), series["_anterior"].astype("Float64")
+    variacao = atual / anterior - 1
+    salto = ((atual > 0) & (anterior > 0) & ((atual >= minimo) | (anterior >= minimo))
+             & (variacao.abs() > limite)).fillna(False)
+    fora = series[salto]
+    return _problemas("salto_anual", conjunto, fora, dimensoes + [coluna_ano], fora[coluna_valor],
+                      "anterior " + fora["_anterior"].astype("string") + " ("
+                      + (variacao[salto] * 100).round().astype("Int64").astype("string") + "%)")
+
+
+def zeros_suspeitos(df, conjunto, dimensoes, coluna_ano, coluna_valor):
+    """ Zeros com valor positivo antes e depois na mesma série """
+    dimensoes = _dimensoes(df, dimensoes)
+    series = _series_por_ano(df, dimensoes, coluna_ano, coluna_valor)
+    suspeito = ((series[coluna_valor] == 0) & (series["_anterior"] > 0) & (series["_seguinte"] > 0)).fillna(False)
+    fora = series[suspeito]
+    return _problemas("zero_suspeito", conjunto, fora, dimensoes + [coluna_ano], fora[coluna_valor],
+                      "entre " + fora["_anterior"].astype("string") + " e " + fora["_seguinte"].astype("string"))
+
+
+def celulas_zeradas(df, conjunto, dimensoes_celula, coluna_valor):
+    """ Células (ano + filtro) em que todas as etapas vieram 0 """
+    dimensoes = _dimensoes(df, dimensoes_celula)
+    totais = df.groupby(dimensoes, observed=True)[coluna_valor].agg(["sum", "count"]).reset_index()
+    fora = totais[(totais["sum"] == 0) & (totais["count"] > 0)]
+    return _problemas("celula_zerada", conjunto, fora, dimensoes, fora["sum"],
+                      fora["count"].astype("string") + " etapas em 0")
+
+
+# --- VERIFICAÇÕES POR CONJUNTO ---
+
+def _verificar_proficiencia(df, nome):
+    return [niveis_somam_100(df, nome, ["Ano Calendário", "Etapa", "Disciplina"], "Porcentagem")]
+
+
+def _verificar_aprendizado(df, nome):
+    niveis = df[df["Indicador"].astype("string").str.startswith("Nível - ").fillna(False)]
+    return [niveis_somam_100(niveis, nome, ["Ano Calendário", "Etapa de Ensino", "Ano Escolar", "Disciplina"], "Valor")]
+
+
+def _verificador_matriculas(dimensoes):
+    """ Saltos, zeros isolados e células zeradas de matrículas por etapa """
+    def verificar(df, nome):
+        serie = dimensoes + ["Etapa"]
+        celula = dimensoes + ["Ano"]
+        return [
+            saltos_anuais(df, nome, serie, "Ano", "Matrículas"),
+            zeros_suspeitos(df, nome, serie, "Ano", "Matrículas"),
+            celulas_zeradas(df, nome, celula, "Matrículas"),
+        ]
+    return verificar
+
+
+VERIFICACOES = {
+    "qedu_proficiencia": _verificar_proficiencia,
+    "qedu_aprendizado": _verificar_aprendizado,
+    "censo_matriculas_etapa": _verificador_matriculas(["Filtro Geral"]),
+    "censo_inep_matriculas_etapa": _verificador_matriculas(["Rede", "Filtro Geral"]),
+}
+
+
+def verificar(armazem, conjuntos):
+    """ Problemas de todos os conjuntos com verificação (e seus consolidados) """
+    partes = []
+    for nome, conjunto in conjuntos.items():
+        verificacao = VERIFICACOES.get(nome.removesuffix("_municipios"))
+        if verificacao is None:
+            continue
+        df = armazem.ler(conjunto)
+        if not df.empty:
+            partes += verificacao(df, nome)
+    partes = [p for p in partes if not p.empty]
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=COLUNAS_PROBLEMAS)
+
+
+def main():
+    from observatorio.conjuntos import CONJUNTOS
+
+    parser = argparse.ArgumentParser(description="Verificações de qualidade dos conjuntos do armazém.")
+    parser.add_argument("--pasta-armazem", default=PASTA_ARMAZEM, help="Pasta do armazém Parquet")
+    parser.add_argument("--csv", help="Grava todos os problemas neste arquivo")
+    parser.add_argument("--mostrar", type=int, default=20, help="Problemas listados por verificação")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    problemas = verificar(Armazem(args.pasta_armazem), CONJUNTOS)
+    print(f"🔎 Verificação em {(time.perf_counter() - inicio) * 1000:.0f} ms: {len(problemas)} problemas.")
+    for (verificacao, conjunto), grupo in problemas.groupby(["Verificação", "Conjunto"], sort=True):
+        print(f"\n⚠️ {verificacao} em {conjunto}: {len(grupo)}")
+        for _, problema in grupo.head(args.mostrar).iterrows():
+            print(f"   {problema['Linha']}: {problema['Valor']} ({problema['Detalhe']})")
+    if args.csv:
+        problemas.to_csv(args.csv, index=False)
+        print(f"\n✅ Problemas salvos em: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
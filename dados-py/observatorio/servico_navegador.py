@@ -0,0 +1,474 @@
+"""
+Serviço local de navegadores aquecidos.
+
+Sem ele, cada coleta ao vivo paga a subida do Chrome, a cache fria e a carga
+inicial da tela. O serviço mantém alguns Chromes abertos (no perfil pedido),
+já parados nas telas do QEdu, e as coletas *arrendam* um deles em vez de
+abrir o seu:
+
+  - o arrendamento é exclusivo: dois trabalhos nunca dividem uma aba;
+  - na devolução a sessão volta para a tela de origem e fica livre de novo,
+    ou é reciclada (fechada e reaberta) depois de N navegações, para conter o
+    crescimento de memória do Chrome;
+  - o arrendamento vale por VALIDADE_ARRENDAMENTO desde a última renovação:
+    a coleta renova (/renovar) enquanto navega, no máximo uma vez a cada
+    INTERVALO_RENOVACAO, então uma coleta longa nunca perde a sessão;
+  - uma verificação periódica de saúde recicla sessões que não respondem e
+    recupera só os arrendamentos ociosos, sem renovação dentro da validade
+    (coleta que morreu sem devolver).
+
+A coleta se liga à sessão já aberta pelo protocolo WebDriver (o chromedriver
+de cada sessão fica escutando em localhost), então do lado dela o driver é
+um driver Selenium comum.
+
+Uso:
+    python -m observatorio.servico_navegador iniciar [--porta 8770] [--sessoes 2] [--perfil rapido]
+    python -m observatorio.servico_navegador estado [--servico URL]
+
+As coletas usam o serviço com --servico-navegador URL (ou a variável de
+ambiente OBSERVATORIO_SERVICO_NAVEGADOR).
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.command import Command
+
+from observatorio.espera import aguardar_estabilizacao
+from observatorio.navegador import SELETOR_DADOS, configurar_driver
+from observatorio.perfis import PERFIS, PerfilNavegador
+
+PORTA_PADRAO = 8770
+SERVICO_PADRAO = f"http://127.0.0.1:{PORTA_PADRAO}"
+
+MAX_NAVEGACOES = 300               # reciclagem da sessão
+VALIDADE_ARRENDAMENTO = 30 * 60    # segundos sem renovação até um arrendamento ser dado como abandonado
+INTERVALO_RENOVACAO = 60           # a coleta renova o arrendamento no máximo uma vez por minuto
+INTERVALO_SAUDE = 30               # segundos entre verificações
+ESPERA_ARRENDAMENTO = 120          # quanto a coleta espera por uma sessão livre
+
+# Comandos WebDriver contados como navegação (carregamentos e cliques)
+COMANDOS_NAVEGACAO = {Command.GET, Command.CLICK_ELEMENT}
+
+
+# --- LADO DO SERVIÇO ---
+
+class SessaoAquecida:
+    """ Um Chrome do serviço e o seu estado """
+
+    def __init__(self, numero, url):
+        self.numero = numero
+        self.url = url                 # tela em que a sessão fica parada
+        self.driver = None
+        self.estado = "abrindo"        # abrindo | livre | arrendada | aquecendo | reciclando | verificando
+        self.navegacoes = 0
+        self.arrendamento = None
+        self.validade = None
+
+    def descrever(self):
+        return {
+            "numero": self.numero,
+            "estado": self.estado,
+            "url": self.url,
+            "navegacoes": self.navegacoes,
+            "arrendamento": self.arrendamento,
+            "vence_em": round(self.validade - time.time()) if self.validade else None,
+        }
+
+
+class ServicoNavegador:
+    """
+    Conjunto de sessões aquecidas com arrendamento exclusivo. Os métodos são
+    seguros para chamar de várias threads (uma por requisição HTTP).
+    """
+
+    def __init__(self, urls, sessoes=2, perfil="rapido", max_navegacoes=MAX_NAVEGACOES,
+                 validade=VALIDADE_ARRENDAMENTO, intervalo_saude=INTERVALO_SAUDE):
+        self.perfil = PERFIS[perfil] if isinstance(perfil, str) else perfil
+        self.max_navegacoes = max_navegacoes
+        self.validade = validade
+        self.intervalo_saude = intervalo_saude
+        # Distribui as telas entre as sessões (com 2 telas e 4 sessões, 2 em cada)
+        self.sessoes = [SessaoAquecida(i + 1, urls[i % len(urls)]) for i in range(sessoes)]
+        self.condicao = threading.Condition()
+        self._parar = threading.Event()
+        self._thread_saude = None
+
+    # Preparo das sessões
+
+    def _abrir(self, sessao):
+        """ (Re)abre o Chrome da sessão e deixa ele parado na tela """
+        if sessao.driver is not None:
+            try:
+                sessao.driver.quit()
+            except Exception:
+                pass
+        sessao.driver = configurar_driver(perfil=self.perfil)
+        sessao.navegacoes = 0
+        self._aquecer(sessao)
+
+    def _aquecer(self, sessao):
+        sessao.driver.get(sessao.url)
+        aguardar_estabilizacao(sessao.driver, seletor=SELETOR_DADOS, timeout=20)
+        sessao.navegacoes += 1
+
+    def _preparar(self, sessao, reabrir):
+        """ Roda fora do lock: reabre ou só volta para a tela, e libera a sessão """
+        try:
+            if reabrir or sessao.driver is None:
+                print(f"♻️  Sessão {sessao.numero}: abrindo Chrome em {sessao.url}")
+                self._abrir(sessao)
+            else:
+                self._aquecer(sessao)
+            novo_estado = "livre"
+        except Exception as e:
+            print(f"⚠️ Sessão {sessao.numero}: falha ao preparar ({e}); nova tentativa na próxima verificação")
+            novo_estado = "reciclando"
+        with self.condicao:
+            sessao.estado = novo_estado
+            self.condicao.notify_all()
+
+    def _preparar_em_segundo_plano(self, sessao, reabrir):
+        threading.Thread(target=self._preparar, args=(sessao, reabrir), daemon=True).start()
+
+    # Arrendamento
+
+    def arrendar(self, url=None, espera=ESPERA_ARRENDAMENTO):
+        """
+        Reserva uma sessão livre (de preferência já parada em `url`) e devolve
+        os dados para a coleta se ligar a ela, ou None se nenhuma ficou livre
+        dentro da espera.
+        """
+        limite = time.time() + espera
+        with self.condicao:
+            while True:
+                livres = [s for s in self.sessoes if s.estado == "livre"]
+                if livres:
+                    sessao = next((s for s in livres if s.url == url), livres[0])
+                    break
+                restante = limite - time.time()
+                if restante <= 0:
+                    return None
+                self.condicao.wait(restante)
+
+            sessao.estado = "arrendada"
+            sessao.arrendamento = uuid.uuid4().hex
+            sessao.validade = time.time() + self.validade
+            mudar_de_tela = url is not None and url != sessao.url
+
+        if mudar_de_tela:
+            # A sessão passa a morar na tela pedida
+            sessao.url = url
+            try:
+                self._aquecer(sessao)
+            except Exception:
+                self.devolver(sessao.arrendamento, descartar=True)
+                raise
+
+        return {
+            "arrendamento": sessao.arrendamento,
+            "sessao": sessao.numero,
+            "executor": sessao.driver.service.service_url,
+            "id_sessao": sessao.driver.session_id,
+            "url": sessao.url,
+            "perfil": asdict(self.perfil),
+        }
+
+    def renovar(self, arrendamento):
+        """ Estende a validade (a coleta segue usando a sessão); False se já venceu """
+        with self.condicao:
+            sessao = next((s for s in self.sessoes if s.arrendamento == arrendamento), None)
+            if sessao is None:
+                return False
+            sessao.validade = time.time() + self.validade
+            return True
+
+    def devolver(self, arrendamento, navegacoes=0, descartar=False):
+        """ Libera a sessão; False se o arrendamento não existe (já venceu) """
+        with self.condicao:
+            sessao = next((s for s in self.sessoes if s.arrendamento == arrendamento), None)
+            if sessao is None:
+                return False
+            sessao.navegacoes += navegacoes
+            sessao.arrendamento = None
+            sessao.validade = None
+            reabrir = descartar or sessao.navegacoes >= self.max_navegacoes
+            sessao.estado = "reciclando" if reabrir else "aquecendo"
+        self._preparar_em_segundo_plano(sessao, reabrir)
+        return True
+
+    # Saúde
+
+    def verificar_saude(self):
+        """ Recupera arrendamentos ociosos, testa as sessões livres e reabre as quebradas """
+        agora = time.time()
+        testar, reabrir = [], []
+        with self.condicao:
+            for sessao in self.sessoes:
+                if sessao.estado == "arrendada" and sessao.validade < agora:
+                    print(f"⏰ Sessão {sessao.numero}: arrendamento sem renovação, reciclando")
+                    sessao.arrendamento = sessao.validade = None
+                    sessao.estado = "reciclando"
+                    reabrir.append(sessao)
+                elif sessao.estado == "livre":
+                    sessao.estado = "verificando"
+                    testar.append(sessao)
+                elif sessao.estado == "reciclando" and sessao not in reabrir:
+                    # Preparo anterior falhou
+                    reabrir.append(sessao)
+
+        for sessao in testar:
+            try:
+                sessao.driver.execute_script("return document.readyState")
+                saudavel = sessao.driver.current_url.startswith(sessao.url)
+            except Exception:
+                saudavel = False
+            if saudavel:
+                with self.condicao:
+                    sessao.estado = "livre"
+                    self.condicao.notify_all()
+            else:
+                print(f"🩺 Sessão {sessao.numero}: não respondeu, reciclando")
+                with self.condicao:
+                    sessao.estado = "reciclando"
+                reabrir.append(sessao)
+
+        for sessao in reabrir:
+            self._preparar_em_segundo_plano(sessao, reabrir=True)
+
+    def _laco_saude(self):
+        while not self._parar.wait(self.intervalo_saude):
+            self.verificar_saude()
+
+    def estado(self):
+        with self.condicao:
+            sessoes = [sessao.descrever() for sessao in self.sessoes]
+        return {
+            "perfil": self.perfil.nome,
+            "livres": sum(1 for s in sessoes if s["estado"] == "livre"),
+            "max_navegacoes": self.max_navegacoes,
+            "sessoes": sessoes,
+        }
+
+    # Ciclo de vida
+
+    def iniciar(self):
+        """ Abre todas as sessões (em paralelo) e liga a verificação de saúde """
+        threads = [threading.Thread(target=self._preparar, args=(s, True)) for s in self.sessoes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._thread_saude = threading.Thread(target=self._laco_saude, daemon=True)
+        self._thread_saude.start()
+
+    def parar(self):
+        self._parar.set()
+        for sessao in self.sessoes:
+            if sessao.driver is not None:
+                try:
+                    sessao.driver.quit()
+                except Exception:
+                    pass
+                sessao.driver = None
+
+
+def _criar_handler(servico):
+    class ServicoHandler(BaseHTTPRequestHandler):
+        def _responder(self, status, corpo):
+            dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def do_GET(self):
+            if self.path == "/saude":
+                self._responder(200, servico.estado())
+            else:
+                self._responder(404, {"erro": "rota desconhecida"})
+
+        def do_POST(self):
+            tamanho = int(self.headers.get("Content-Length") or 0)
+            pedido = json.loads(self.rfile.read(tamanho) or b"{}")
+            try:
+                if self.path == "/arrendar":
+                    resposta = servico.arrendar(pedido.get("url"), pedido.get("espera", ESPERA_ARRENDAMENTO))
+                    if resposta is None:
+                        self._responder(503, {"erro": "nenhuma sessão livre"})
+                    else:
+                        self._responder(200, resposta)
+                elif self.path == "/renovar":
+                    ok = servico.renovar(pedido["arrendamento"])
+                    self._responder(200 if ok else 410, {"renovado": ok})
+                elif self.path == "/devolver":
+                    ok = servico.devolver(pedido["arrendamento"], pedido.get("navegacoes", 0),
+                                          pedido.get("descartar", False))
+                    self._responder(200 if ok else 410, {"devolvido": ok})
+                else:
+                    self._responder(404, {"erro": "rota desconhecida"})
+            except Exception as e:
+                self._responder(500, {"erro": str(e)})
+
+        def log_message(self, formato, *args):
+            pass
+
+    return ServicoHandler
+
+
+# --- LADO DA COLETA ---
+
+class DriverArrendado(webdriver.Remote):
+    """
+    Driver ligado a uma sessão já aberta pelo serviço. `quit()` não fecha o
+    Chrome (ele é do serviço); as navegações são contadas para a reciclagem
+    e renovam o arrendamento (os comandos vão direto ao chromedriver, o
+    serviço só sabe que a coleta está viva por aqui).
+    """
+
+    def __init__(self, executor, id_sessao, perfil=None, servico=None, arrendamento=None):
+        self._id_sessao = id_sessao
+        self.navegacoes = 0
+        self.servico = servico
+        self.arrendamento = arrendamento
+        self.renovado_em = time.time()
+        super().__init__(command_executor=executor, options=Options())
+        # Lido por observatorio.perfis.medir_navegacao
+        self.perfil_observatorio = perfil
+
+    def start_session(self, capabilities):
+        self.session_id = self._id_sessao
+
+    def execute(self, driver_command, params=None):
+        if driver_command in COMANDOS_NAVEGACAO:
+            self.navegacoes += 1
+            self._renovar()
+        return super().execute(driver_command, params)
+
+    def _renovar(self):
+        if self.servico is None or time.time() - self.renovado_em < INTERVALO_RENOVACAO:
+            return
+        self.renovado_em = time.time()
+        try:
+            status, _ = _chamar(self.servico, "/renovar", {"arrendamento": self.arrendamento})
+        except URLError as e:
+            print(f"⚠️ Não foi possível renovar o arrendamento: {e}")
+            return
+        if status == 410:
+            print("⚠️ Arrendamento vencido no serviço: a sessão pode ser reciclada durante a coleta")
+
+    def get_log(self, log_type):
+        return self.execute(Command.GET_LOG, {"type": log_type})["value"]
+
+    def quit(self):
+        pass
+
+
+def _chamar(servico, rota, corpo=None, timeout=10):
+    """ Requisição JSON ao serviço: (status, corpo da resposta) """
+    dados = None if corpo is None else json.dumps(corpo).encode("utf-8")
+    pedido = Request(servico.rstrip("/") + rota, data=dados, headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(pedido, timeout=timeout) as resposta:
+            return resposta.status, json.loads(resposta.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def _perfil_do_servico(dados):
+    return PerfilNavegador(**{campo: tuple(v) if isinstance(v, list) else v for campo, v in dados.items()})
+
+
+def pedir_arrendamento(servico, url=None, espera=ESPERA_ARRENDAMENTO):
+    """ Reserva uma sessão do serviço (de preferência já parada em `url`) """
+    status, resposta = _chamar(servico, "/arrendar", {"url": url, "espera": espera}, timeout=espera + 30)
+    if status != 200:
+        raise RuntimeError(f"serviço de navegadores: {resposta.get('erro', status)}")
+    return resposta
+
+
+@contextmanager
+def navegador_arrendado(servico, arrendamento):
+    """
+    Driver da sessão arrendada, devolvida no fim. Se a coleta sair com erro,
+    a sessão é descartada (reaberta pelo serviço), porque o estado da aba é
+    desconhecido.
+
+    O driver tem `url_aquecida`: a tela em que a sessão já está parada.
+    """
+    driver = DriverArrendado(arrendamento["executor"], arrendamento["id_sessao"],
+                             _perfil_do_servico(arrendamento["perfil"]),
+                             servico=servico, arrendamento=arrendamento["arrendamento"])
+    driver.url_aquecida = arrendamento["url"]
+    print(f"🔗 Sessão {arrendamento['sessao']} do serviço de navegadores arrendada")
+    descartar = False
+    try:
+        yield driver
+    except BaseException:
+        descartar = True
+        raise
+    finally:
+        try:
+            _chamar(servico, "/devolver", {
+                "arrendamento": arrendamento["arrendamento"],
+                "navegacoes": driver.navegacoes,
+                "descartar": descartar,
+            })
+        except URLError as e:
+            print(f"⚠️ Não foi possível devolver a sessão {arrendamento['sessao']}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantém Chromes aquecidos nas telas do QEdu para as coletas.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_iniciar = sub.add_parser("iniciar", help="Sobe o serviço (Ctrl+C para sair)")
+    p_iniciar.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    p_iniciar.add_argument("--sessoes", type=int, default=2, help="Quantidade de Chromes aquecidos")
+    p_iniciar.add_argument("--perfil", choices=list(PERFIS), default="rapido")
+    p_iniciar.add_argument("--max-navegacoes", type=int, default=MAX_NAVEGACOES,
+                           help="Navegações até a sessão ser reciclada")
+    p_iniciar.add_argument("--validade", type=int, default=VALIDADE_ARRENDAMENTO,
+                           help="Segundos sem renovação até um arrendamento não devolvido ser recuperado")
+    p_iniciar.add_argument("--intervalo-saude", type=int, default=INTERVALO_SAUDE)
+
+    p_estado = sub.add_parser("estado", help="Mostra as sessões do serviço")
+    p_estado.add_argument("--servico", default=SERVICO_PADRAO)
+
+    args = parser.parse_args()
+    if args.comando == "estado":
+        _, estado = _chamar(args.servico, "/saude")
+        print(json.dumps(estado, ensure_ascii=False, indent=2))
+        return
+
+    from observatorio.conjuntos import TRABALHOS
+
+    # Uma tela por conjunto de trabalhos (aprendizado, censo escolar)
+    urls = list(dict.fromkeys(trabalho.tela.url_base for trabalho in TRABALHOS.values()))
+    servico = ServicoNavegador(urls, args.sessoes, args.perfil, args.max_navegacoes,
+                               args.validade, args.intervalo_saude)
+    print(f"🌐 Aquecendo {args.sessoes} sessões no perfil '{args.perfil}'...")
+    servico.iniciar()
+    servidor = ThreadingHTTPServer(("127.0.0.1", args.porta), _criar_handler(servico))
+    print(f"🔥 Serviço de navegadores em http://127.0.0.1:{args.porta} (Ctrl+C para sair)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servico.parar()
+
+
+if __name__ == "__main__":
+    main()
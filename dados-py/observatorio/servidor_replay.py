@@ -0,0 +1,182 @@
+"""
+Servidor local que devolve respostas gravadas do QEdu e do IBGE.
+
+Serve para testar o motor HTTP sem tocar no site: gravamos as respostas uma
+vez e depois apontamos os scripts para cá (--base-url http://127.0.0.1:PORTA).
+
+Como as APIs do IBGE, cada resposta sai com ETag (hash do corpo) e
+Last-Modified (data do arquivo gravado) e as requisições condicionais
+(If-None-Match / If-Modified-Since) recebem 304 quando nada mudou. O
+servidor anota (caminho, status) de cada resposta em `respostas`, para os
+testes conferirem o que o cliente pediu.
+
+Uso:
+    python -m observatorio.servidor_replay gravar PASTA URL [URL ...]
+    python -m observatorio.servidor_replay servir PASTA [--porta 8765]
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+ARQUIVO_INDICE = "indice.json"
+
+
+def chave_requisicao(url):
+    """ Caminho + query, que é o que identifica a resposta """
+    partes = urlsplit(url)
+    return partes.path + ("?" + partes.query if partes.query else "")
+
+
+def carregar_indice(pasta):
+    caminho = os.path.join(pasta, ARQUIVO_INDICE)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def gravar_resposta(pasta, url, corpo, tipo="text/html; charset=utf-8", status=200):
+    """ Guarda uma resposta (corpo em arquivo próprio + entrada no índice) """
+    os.makedirs(pasta, exist_ok=True)
+    chave = chave_requisicao(url)
+    nome = hashlib.sha1(chave.encode()).hexdigest() + ".resp"
+    with open(os.path.join(pasta, nome), "wb") as f:
+        f.write(corpo if isinstance(corpo, bytes) else corpo.encode("utf-8"))
+
+    indice = carregar_indice(pasta)
+    indice[chave] = {"arquivo": nome, "tipo": tipo, "status": status}
+    with open(os.path.join(pasta, ARQUIVO_INDICE), "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+
+
+def gravar_urls(pasta, urls):
+    """ Baixa as URLs do site real e grava para replay """
+    import httpx
+    from observatorio.coleta_http import CABECALHOS
+
+    with httpx.Client(headers=CABECALHOS, follow_redirects=True, timeout=30) as cliente:
+        for url in urls:
+            resposta = cliente.get(url)
+            gravar_resposta(pasta, url, resposta.content,
+                            resposta.headers.get("content-type", "text/html"), resposta.status_code)
+            print(f"💾 {resposta.status_code} {url}")
+
+
+def _nao_modificado(cabecalhos, etag, modificado):
+    """ A requisição condicional bate com a versão gravada? """
+    if "If-None-Match" in cabecalhos:
+        return etag in [v.strip() for v in cabecalhos["If-None-Match"].split(",")]
+    if "If-Modified-Since" in cabecalhos:
+        try:
+            return int(modificado) <= parsedate_to_datetime(cabecalhos["If-Modified-Since"]).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _criar_handler(pasta, indice, respostas):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, como o site real
+
+        def do_GET(self):
+            entrada = indice.get(self.path)
+            validadores = {}
+            if entrada is None:
+                corpo, tipo, status = b"nao gravado", "text/plain", 404
+            else:
+                caminho = os.path.join(pasta, entrada["arquivo"])
+                with open(caminho, "rb") as f:
+                    corpo = f.read()
+                tipo, status = entrada["tipo"], entrada["status"]
+                if status == 200:
+                    modificado = os.path.getmtime(caminho)
+                    validadores = {
+                        "ETag": '"' + hashlib.sha1(corpo).hexdigest() + '"',
+                        "Last-Modified": formatdate(modificado, usegmt=True),
+                    }
+                    if _nao_modificado(self.headers, validadores["ETag"], modificado):
+                        corpo, status = b"", 304
+            respostas.append((self.path, status))
+            self.send_response(status)
+            for nome, valor in validadores.items():
+                self.send_header(nome, valor)
+            if status != 304:
+                self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return ReplayHandler
+
+
+class ServidorReplay:
+    """
+    Servidor de replay numa thread. Use como context manager:
+
+        with ServidorReplay("gravacoes") as base_url:
+            ...
+    """
+
+    def __init__(self, pasta, porta=0):
+        self.pasta = pasta
+        self.respostas = []     # (caminho, status) na ordem em que saíram
+        self.servidor = ThreadingHTTPServer(
+            ("127.0.0.1", porta), _criar_handler(pasta, carregar_indice(pasta), self.respostas)
+        )
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, porta = self.servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar(self):
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava e serve respostas do QEdu e do IBGE para replay local.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_gravar = sub.add_parser("gravar", help="Baixa URLs reais e grava na pasta")
+    p_gravar.add_argument("pasta")
+    p_gravar.add_argument("urls", nargs="+")
+
+    p_servir = sub.add_parser("servir", help="Serve as respostas gravadas")
+    p_servir.add_argument("pasta")
+    p_servir.add_argument("--porta", type=int, default=8765)
+
+    args = parser.parse_args()
+    if args.comando == "gravar":
+        gravar_urls(args.pasta, args.urls)
+    else:
+        servidor = ServidorReplay(args.pasta, args.porta)
+        print(f"🔁 Servindo {args.pasta} em {servidor.base_url} (Ctrl+C para sair)")
+        try:
+            servidor.servidor.serve_forever()
+        except KeyboardInterrupt:
+            servidor.parar()
+
+
+if __name__ == "__main__":
+    main()
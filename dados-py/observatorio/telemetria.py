@@ -0,0 +1,267 @@
+"""
+Medição por fase das coletas: spans em JSON lines e resumo para o Prometheus.
+
+Cada fase de cada célula (navegação, espera da tela, page_source, extração,
+gravação no armazém...) vira um span com início, duração e desfecho:
+
+    {"fase": "navegacao", "celula": "2023 (Com Ensino Infantil Regular)",
+     "worker": 0, "inicio": 1718000000.1, "duracao_s": 2.41,
+     "resultado": "ok", "causa": null, ...}
+
+Os spans vão para <pasta da execução>/spans-<pid>.jsonl (um arquivo por
+processo, então os workers paralelos não disputam o arquivo). A pasta vem
+da variável OBSERVATORIO_TELEMETRIA, herdada pelos processos dos workers;
+sem ela, `span` não faz nada.
+
+No fim da execução, `resumir` junta os spans e grava metricas.prom no
+formato textfile do node_exporter: p50/p95 por fase, células por minuto e
+falhas por causa, e `imprimir_relatorio` mostra o mesmo resumo no terminal.
+
+Uso (relatório de uma execução já feita):
+    python -m observatorio.telemetria PASTA_DA_EXECUCAO [--prometheus ARQUIVO.prom]
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".telemetria")
+VARIAVEL_AMBIENTE = "OBSERVATORIO_TELEMETRIA"
+ARQUIVO_PROMETHEUS = "metricas.prom"
+
+# Desfechos que contam como falha no resumo ("sem_mudanca" e afins são só informativos)
+RESULTADOS_FALHA = {"erro", "timeout", "falha"}
+
+
+class Span:
+    """ Um trecho medido; `resultado` e `causa` podem ser ajustados dentro do bloco """
+
+    def __init__(self, fase, celula=None, **atributos):
+        self.fase = fase
+        self.celula = celula
+        self.atributos = atributos
+        self.resultado = "ok"
+        self.causa = None
+
+    def __enter__(self):
+        self.inicio = time.time()
+        self._relogio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, _):
+        duracao = time.perf_counter() - self._relogio
+        if erro is not None:
+            self.resultado, self.causa = "erro", tipo.__name__
+        registro = _registro_ativo()
+        if registro is not None:
+            registro.gravar({
+                "fase": self.fase,
+                "celula": self.celula,
+                "inicio": round(self.inicio, 3),
+                "duracao_s": round(duracao, 4),
+                "resultado": self.resultado,
+                "causa": self.causa,
+                **self.atributos,
+            })
+        return False
+
+
+class RegistroSpans:
+    """ Arquivo de spans deste processo """
+
+    def __init__(self, pasta):
+        os.makedirs(pasta, exist_ok=True)
+        self.pid = os.getpid()
+        self._arquivo = open(os.path.join(pasta, f"spans-{self.pid}.jsonl"), "a", encoding="utf-8")
+        self._trava = threading.Lock()
+
+    def gravar(self, span):
+        linha = json.dumps({**span, "pid": self.pid}, ensure_ascii=False)
+        with self._trava:
+            self._arquivo.write(linha + "\n")
+            self._arquivo.flush()
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+_registro = None
+
+
+def _registro_ativo():
+    """ Registro do processo atual (aberto na primeira gravação), ou None sem telemetria """
+    global _registro
+    pasta = os.environ.get(VARIAVEL_AMBIENTE)
+    if not pasta:
+        return None
+    # Processos filhos herdam o objeto no fork, mas precisam do próprio arquivo
+    if _registro is None or _registro.pid != os.getpid():
+        _registro = RegistroSpans(pasta)
+    return _registro
+
+
+def span(fase, celula=None, **atributos):
+    """ `with span("navegacao", celula) as s: ...` (s.resultado / s.causa ajustáveis) """
+    return Span(fase, celula, **atributos)
+
+
+def iniciar_execucao(pasta):
+    """
+    Liga a telemetria (para este processo e os workers) numa subpasta nova
+    de `pasta` (ex.: .telemetria/<execução>) e devolve a subpasta.
+    """
+    pasta_execucao = os.path.join(pasta, time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(pasta_execucao, exist_ok=True)
+    os.environ[VARIAVEL_AMBIENTE] = pasta_execucao
+    return pasta_execucao
+
+
+def pasta_execucao_atual():
+    return os.environ.get(VARIAVEL_AMBIENTE)
+
+
+# --- RESUMO ---
+
+def carregar_spans(pasta_execucao):
+    spans = []
+    for caminho in sorted(glob.glob(os.path.join(pasta_execucao, "spans-*.jsonl"))):
+        with open(caminho, encoding="utf-8") as f:
+            for linha in f:
+                if linha.strip():
+                    spans.append(json.loads(linha))
+    return spans
+
+
+def percentil(valores, p):
+    """ Percentil pelo método do posto mais próximo (valores ordenados) """
+    if not valores:
+        return None
+    return valores[max(0, math.ceil(p * len(valores)) - 1)]
+
+
+def resumir(spans):
+    """ {"fases": {fase: {...}}, "celulas", "celulas_por_minuto", "falhas": {(fase, causa): n}} """
+    duracoes = defaultdict(list)
+    falhas = Counter()
+    for s in spans:
+        duracoes[s["fase"]].append(s["duracao_s"])
+        if s["resultado"] in RESULTADOS_FALHA:
+            falhas[(s["fase"], s.get("causa") or s["resultado"])] += 1
+
+    fases = {}
+    for fase, valores in duracoes.items():
+        valores.sort()
+        fases[fase] = {
+            "contagem": len(valores),
+            "total_s": round(sum(valores), 3),
+            "p50_s": percentil(valores, 0.5),
+            "p95_s": percentil(valores, 0.95),
+        }
+
+    # Células concluídas por minuto de relógio (do primeiro ao último span)
+    celulas = [s for s in spans if s["fase"] == "celula"]
+    concluidas = sum(1 for s in celulas if s["resultado"] == "ok")
+    por_minuto = None
+    if spans:
+        inicio = min(s["inicio"] for s in spans)
+        fim = max(s["inicio"] + s["duracao_s"] for s in spans)
+        if fim > inicio:
+            por_minuto = round(concluidas / (fim - inicio) * 60, 2)
+
+    return {
+        "fases": fases,
+        "celulas": len(celulas),
+        "celulas_concluidas": concluidas,
+        "celulas_por_minuto": por_minuto,
+        "falhas": dict(falhas),
+    }
+
+
+def _rotulos(**rotulos):
+    texto = ",".join(f'{nome}="{str(valor).replace(chr(34), chr(39))}"' for nome, valor in rotulos.items())
+    return "{" + texto + "}"
+
+
+def formatar_prometheus(resumo, execucao):
+    """ Texto no formato textfile do node_exporter """
+    linhas = [
+        "# HELP observatorio_fase_segundos Duração das fases da coleta por célula.",
+        "# TYPE observatorio_fase_segundos summary",
+    ]
+    for fase, m in sorted(resumo["fases"].items()):
+        linhas.append(f"observatorio_fase_segundos{_rotulos(execucao=execucao, fase=fase, quantile='0.5')} {m['p50_s']}")
+        linhas.append(f"observatorio_fase_segundos{_rotulos(execucao=execucao, fase=fase, quantile='0.95')} {m['p95_s']}")
+        linhas.append(f"observatorio_fase_segundos_sum{_rotulos(execucao=execucao, fase=fase)} {m['total_s']}")
+        linhas.append(f"observatorio_fase_segundos_count{_rotulos(execucao=execucao, fase=fase)} {m['contagem']}")
+
+    linhas += [
+        "# HELP observatorio_celulas_por_minuto Células concluídas por minuto na execução.",
+        "# TYPE observatorio_celulas_por_minuto gauge",
+        f"observatorio_celulas_por_minuto{_rotulos(execucao=execucao)} {resumo['celulas_por_minuto'] or 0}",
+        "# HELP observatorio_celulas_total Células tentadas ao vivo, por desfecho.",
+        "# TYPE observatorio_celulas_total counter",
+        f"observatorio_celulas_total{_rotulos(execucao=execucao, resultado='ok')} {resumo['celulas_concluidas']}",
+        f"observatorio_celulas_total{_rotulos(execucao=execucao, resultado='falha')} "
+        f"{resumo['celulas'] - resumo['celulas_concluidas']}",
+        "# HELP observatorio_falhas_total Spans que não terminaram em ok, por fase e causa.",
+        "# TYPE observatorio_falhas_total counter",
+    ]
+    for (fase, causa), n in sorted(resumo["falhas"].items()):
+        linhas.append(f"observatorio_falhas_total{_rotulos(execucao=execucao, fase=fase, causa=causa)} {n}")
+    return "\n".join(linhas) + "\n"
+
+
+def gravar_prometheus(resumo, execucao, caminho):
+    """ Gravação atômica (o node_exporter pode ler a qualquer momento) """
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(formatar_prometheus(resumo, execucao))
+    os.replace(temporario, caminho)
+
+
+def imprimir_relatorio(resumo):
+    print("\n⏱️ Tempo por fase:")
+    print(f"   {'fase':22s} {'n':>6s} {'total':>10s} {'p50':>9s} {'p95':>9s}")
+    for fase, m in sorted(resumo["fases"].items(), key=lambda item: -item[1]["total_s"]):
+        print(f"   {fase:22s} {m['contagem']:>6d} {m['total_s']:>9.1f}s {m['p50_s']:>8.2f}s {m['p95_s']:>8.2f}s")
+    if resumo["celulas"]:
+        print(f"   📈 {resumo['celulas_concluidas']}/{resumo['celulas']} células concluídas, "
+              f"{resumo['celulas_por_minuto']} por minuto")
+    for (fase, causa), n in sorted(resumo["falhas"].items(), key=lambda item: -item[1]):
+        print(f"   ⚠️ {fase}: {n}x {causa}")
+
+
+def encerrar_execucao(pasta_execucao, prometheus=None):
+    """ Resume os spans da execução, grava o .prom e imprime o relatório """
+    global _registro
+    if _registro is not None and _registro.pid == os.getpid():
+        _registro.fechar()
+        _registro = None
+    spans = carregar_spans(pasta_execucao)
+    if not spans:
+        return None
+    resumo = resumir(spans)
+    execucao = os.path.basename(os.path.dirname(pasta_execucao))
+    gravar_prometheus(resumo, execucao, os.path.join(pasta_execucao, ARQUIVO_PROMETHEUS))
+    if prometheus:
+        gravar_prometheus(resumo, execucao, prometheus)
+    imprimir_relatorio(resumo)
+    print(f"   🧾 Spans e métricas em: {pasta_execucao}")
+    return resumo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumo por fase de uma execução de coleta.")
+    parser.add_argument("pasta", help="Pasta da execução (.telemetria/<execução>/<data>)")
+    parser.add_argument("--prometheus", help="Grava também neste arquivo .prom (textfile collector)")
+    args = parser.parse_args()
+    if encerrar_execucao(args.pasta, args.prometheus) is None:
+        print(f"❌ Nenhum span em {args.pasta}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Definição declarativa dos trabalhos de coleta.
+
+Uma `Tela` descreve uma página do QEdu: endereço, grade de filtros e como
+chegar em cada célula. Um `Trabalho` descreve os dados tirados dessa tela:
+extratores (HTML, navegador e JSON do motor HTTP), tabelas geradas
+(gravadas no armazém, observatorio.armazem) e o arquivo da exportação para
+Excel.
+
+Trabalhos da mesma tela (ex.: aprendizado adequado e proficiência) são
+coletados juntos: cada célula é navegada uma vez só e todos os extratores
+leem a mesma captura.
+"""
+import os
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Exportações para Excel: a própria pasta dados-py (onde sempre ficaram os .xlsx)
+PASTA_SAIDA_PADRAO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass(frozen=True)
+class Tela:
+    nome: str
+    url_base: str
+    montar_grade: Callable           # () -> [célula, ...]
+    navegar: Callable                # (driver, célula, estado) -> True se a tela está pronta
+    filtros_da_celula: Callable      # célula -> dict (chave da cache de telas)
+    descrever: Callable = str        # célula -> texto para os avisos
+    seletor_dados: str = "#main"
+    # driver -> dict com os filtros que a tela mostra (confere o link direto)
+    filtros_na_tela: Optional[Callable] = None
+    # driver -> {filtro: [opções na tela]} (poda da grade antes da coleta)
+    descobrir_opcoes: Optional[Callable] = None
+
+
+@dataclass(frozen=True)
+class Trabalho:
+    nome: str
+    descricao: str
+    tela: Tela
+    extrair_html: Callable           # (html, célula) -> resultado (vazio/None = sem dados)
+    tabelas: Callable                # resultados na ordem da grade -> {nome do conjunto: DataFrame}
+    conjuntos: tuple                 # Conjuntos (observatorio.armazem) que o trabalho grava
+    arquivo_saida: str               # exportação para Excel
+    # (driver, html, célula) -> resultado; sem ele, vale extrair_html na captura
+    extrair_navegador: Optional[Callable] = None
+    # (payloads JSON da célula, célula) -> resultado; sem ele, a tela não usa o motor HTTP
+    extrair_json: Optional[Callable] = None
+
+    def extrair_ao_vivo(self, driver, html, celula):
+        if self.extrair_navegador is not None:
+            return self.extrair_navegador(driver, html, celula)
+        return self.extrair_html(html, celula)
+
+
+def caminho_saida(arquivo, pasta_saida=None):
+    """ Caminho da exportação para Excel (cria a pasta se preciso) """
+    pasta = pasta_saida or PASTA_SAIDA_PADRAO
+    os.makedirs(pasta, exist_ok=True)
+    return os.path.join(pasta, arquivo)
@@ -0,0 +1,56 @@
+"""
+Armazém Parquet (observatorio.armazem): upsert pela chave, só nas partições
+dos anos gravados, e regravação idêntica sem tocar no arquivo.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from observatorio.armazem import Armazem, Conjunto
+
+MATRICULAS = Conjunto(
+    nome="teste_matriculas",
+    colunas=(("Ano", "inteiro"), ("Etapa", "categoria"), ("Matrículas", "inteiro")),
+    chave=("Ano", "Etapa"),
+    coluna_ano="Ano",
+)
+INICIAL = pd.DataFrame({
+    "Ano": [2023, 2023, 2024],
+    "Etapa": ["Creche", "Pré-escola", "Creche"],
+    "Matrículas": ["3045", 4188, 3120],
+})
+
+
+@pytest.fixture
+def armazem(tmp_path):
+    armazem = Armazem(str(tmp_path))
+    assert armazem.gravar(MATRICULAS, INICIAL) == {2023: "nova", 2024: "nova"}
+    return armazem
+
+
+def _mtime(armazem, ano):
+    return os.stat(armazem.caminho(MATRICULAS, ano)).st_mtime_ns
+
+
+def _particao(armazem, ano):
+    df = armazem.ler(MATRICULAS, anos=[ano])
+    return dict(zip(df["Etapa"].astype(str), df["Matrículas"].astype(int)))
+
+
+def test_upsert_troca_a_linha_da_chave_e_acrescenta_a_nova(armazem):
+    mtime_2024 = _mtime(armazem, 2024)
+    mudancas = pd.DataFrame({"Ano": [2023, 2023], "Etapa": ["Creche", "EJA"], "Matrículas": [3100, 2230]})
+
+    assert armazem.gravar(MATRICULAS, mudancas) == {2023: "atualizada"}
+    assert _particao(armazem, 2023) == {"Creche": 3100, "Pré-escola": 4188, "EJA": 2230}
+    # Ano ausente do DataFrame: partição intocada
+    assert _mtime(armazem, 2024) == mtime_2024
+
+
+def test_regravar_o_mesmo_conteudo_nao_reescreve(armazem):
+    antes = {ano: _mtime(armazem, ano) for ano in (2023, 2024)}
+
+    assert armazem.gravar(MATRICULAS, INICIAL) == {2023: "igual", 2024: "igual"}
+    assert {ano: _mtime(armazem, ano) for ano in (2023, 2024)} == antes
+    assert _particao(armazem, 2023) == {"Creche": 3045, "Pré-escola": 4188}
@@ -0,0 +1,24 @@
+"""
+Benchmark dos extratores (observatorio.benchmark) sobre o corpus versionado:
+cobre todas as células das grades do QEdu e bate com o ouro num checkout novo.
+"""
+from observatorio.benchmark import carregar_corpus, carregar_ouro, medir
+from observatorio.conjuntos import TRABALHOS
+from observatorio.executor import agrupar_por_tela
+
+
+def test_corpus_cobre_as_grades():
+    celulas = {(e["tela"], tuple(e["celula"])) for e, _ in carregar_corpus()}
+    for tela, _ in agrupar_por_tela(TRABALHOS.values()):
+        assert {(tela.nome, celula) for celula in tela.montar_grade()} <= celulas
+
+
+def test_medir_confere_todos_os_trabalhos_com_o_ouro():
+    resultado = medir(list(TRABALHOS.values()), carregar_corpus(), carregar_ouro(), repeticoes=1)
+
+    # O corpus versionado é montado à mão: o resultado precisa dizer isso
+    assert resultado["corpus"]["sinteticas"] == resultado["corpus"]["telas"]
+    assert set(resultado["trabalhos"]) == {"aprendizado", "proficiencia", "censo-filtros", "censo-matriculas"}
+    for nome, medicao in resultado["trabalhos"].items():
+        assert medicao["conferidas"] == medicao["paginas"], nome
+        assert medicao["acertos"] == medicao["conferidas"], (nome, medicao["divergencias"])
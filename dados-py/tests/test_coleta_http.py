@@ -0,0 +1,140 @@
+"""
+Motor HTTP (observatorio.coleta_http) sobre os endpoints JSON gravados, contra
+o servidor de replay local: atribuição das URLs às células, leitura dos
+payloads com os extratores das telas e Selenium só onde faltou endpoint.
+"""
+import json
+import os
+from functools import partial
+
+import pytest
+
+from observatorio.conjuntos import qedu_aprendizado, qedu_censo
+from observatorio.coleta_http import executar_grade_http, executar_grade_hibrida
+from observatorio.endpoints import Endpoints, atribuir, endpoints_da_tela, urls_json
+from observatorio.executor import extrair_celula_json
+from observatorio.servidor_replay import ServidorReplay
+
+PASTA_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "qedu_json")
+LP = ("2023", "5º ano", "Língua Portuguesa")
+MAT = ("2023", "5º ano", "Matemática")
+INFANTIL_2024 = ("Com Ensino Infantil Regular", "2024")
+INFANTIL_2023 = ("Com Ensino Infantil Regular", "2023")
+FUNDAMENTAL_2024 = ("Com Ensino Fundamental Regular", "2024")
+
+
+@pytest.fixture
+def arquivo_endpoints(tmp_path):
+    """ Banco de endpoints com as vistas da fixture importadas """
+    arquivo = str(tmp_path / "endpoints.sqlite")
+    with open(os.path.join(PASTA_FIXTURE, "endpoints.json"), encoding="utf-8") as f:
+        vistas = json.load(f)
+    endpoints = Endpoints(arquivo)
+    endpoints.importar(vistas)
+    endpoints.fechar()
+    return arquivo
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    with ServidorReplay(os.path.join(PASTA_FIXTURE, "replay")) as url:
+        yield url
+
+
+def test_atribuicao_descarta_urls_da_tela_e_respostas_atrasadas(arquivo_endpoints):
+    por_celula = endpoints_da_tela(qedu_aprendizado.TELA, arquivo_endpoints)
+
+    assert [url.split("?")[1] for url in por_celula(LP)] == ["ano=2023&etapa=5o-ano&disciplina=lingua-portuguesa"]
+    assert [url.split("?")[1] for url in por_celula(MAT)] == ["ano=2023&etapa=5o-ano&disciplina=matematica"]
+    assert por_celula(("2021", "9º ano", "Matemática")) == []
+
+
+class DriverComLog:
+    """ Só o log de performance do Chrome (entradas como as do chromedriver) """
+
+    def __init__(self, mensagens):
+        self.entradas = [{"message": json.dumps({"message": m})} for m in mensagens]
+
+    def get_log(self, tipo):
+        entradas, self.entradas = self.entradas, []
+        return entradas
+
+
+def _resposta(id_requisicao, url, tipo="XHR", mime="application/json", status=200):
+    return {"method": "Network.responseReceived", "params": {
+        "requestId": id_requisicao, "type": tipo,
+        "response": {"url": url, "mimeType": mime, "status": status},
+    }}
+
+
+def test_urls_json_do_log_de_performance():
+    driver = DriverComLog([
+        {"method": "Network.requestWillBeSent", "params": {"requestId": "1", "request": {"method": "GET"}}},
+        _resposta("1", "https://qedu.org.br/api/dados?ano=2023"),
+        {"method": "Network.requestWillBeSent", "params": {"requestId": "2", "request": {"method": "POST"}}},
+        _resposta("2", "https://qedu.org.br/api/eventos"),
+        _resposta("3", "https://qedu.org.br/app.js", tipo="Script", mime="text/javascript"),
+        _resposta("4", "https://qedu.org.br/api/erro", status=500),
+        {"method": "Network.loadingFinished", "params": {"requestId": "1", "encodedDataLength": 512}},
+    ])
+
+    assert urls_json(driver) == ["https://qedu.org.br/api/dados?ano=2023"]
+    # O fim de carregamento fica para a medição de rede
+    assert [m["method"] for m in driver.mensagens_rede] == ["Network.loadingFinished"]
+    assert urls_json(driver) == []
+
+
+def test_atribuicao_sem_filtro_na_url_fica_sem_dono():
+    vistas = {'["a"]': ["https://x/comum", "https://x/so-a"], '["b"]': ["https://x/comum"]}
+    assert atribuir(vistas, lambda celula: {"filtro": celula[0]}) == {'["a"]': ["https://x/so-a"]}
+
+
+def test_aprendizado_e_proficiencia_dos_payloads(arquivo_endpoints, base_url):
+    trabalhos = [qedu_aprendizado.APRENDIZADO, qedu_aprendizado.PROFICIENCIA]
+    resultados = executar_grade_http(
+        [LP, MAT], endpoints_da_tela(qedu_aprendizado.TELA, arquivo_endpoints),
+        partial(extrair_celula_json, trabalhos=trabalhos), base_url=base_url,
+    )
+
+    aprendizado = {r["Indicador"]: r["Valor"] for r in resultados[0]["aprendizado"]}
+    assert aprendizado == {
+        "Aprendizado Adequado": "41", "Nível - Insuficiente": "12", "Nível - Básico": "47",
+        "Nível - Proficiente": "31", "Nível - Avançado": "10",
+    }
+    proficiencia = {r["Nível de Proficiência"]: r["Porcentagem"] for r in resultados[1]["proficiencia"]}
+    assert proficiencia == {"Insuficiente": 21.0, "Básico": 46.0, "Proficiente": 25.0, "Avançado": 8.0}
+
+
+def test_censo_dos_payloads(arquivo_endpoints, base_url):
+    trabalhos = [qedu_censo.CENSO_FILTROS, qedu_censo.CENSO_MATRICULAS]
+    resultados = executar_grade_http(
+        [INFANTIL_2024, INFANTIL_2023], endpoints_da_tela(qedu_censo.TELA, arquivo_endpoints),
+        partial(extrair_celula_json, trabalhos=trabalhos), base_url=base_url,
+    )
+
+    filtros = resultados[0]["censo-filtros"]
+    assert filtros["escolas"]["Total Escolas"] == "48"
+    assert {m["Modalidade"]: m["Matrículas"] for m in filtros["matriculas"]}["Anos Iniciais"] == 15230
+    matriculas = {linha["Etapa"]: linha["Matrículas"] for linha in resultados[1]["censo-matriculas"]}
+    assert matriculas == {
+        "Creche": 3045, "Pré-escola": 4188, "Anos Iniciais": 15402,
+        "Anos Finais": 11650, "EJA": 2230, "Educação Especial": 912,
+    }
+
+
+def test_hibrido_so_navega_celulas_sem_endpoint(arquivo_endpoints, base_url):
+    navegadas = []
+
+    def processar_fatia(numero_worker, fatia):
+        navegadas.extend(celula for _, celula in fatia)
+        return [(indice, {"selenium": True}) for indice, _ in fatia]
+
+    trabalhos = [qedu_censo.CENSO_FILTROS, qedu_censo.CENSO_MATRICULAS]
+    resultados = executar_grade_hibrida(
+        [INFANTIL_2024, FUNDAMENTAL_2024, INFANTIL_2023], endpoints_da_tela(qedu_censo.TELA, arquivo_endpoints),
+        partial(extrair_celula_json, trabalhos=trabalhos), processar_fatia, base_url=base_url,
+    )
+
+    assert navegadas == [FUNDAMENTAL_2024]
+    assert resultados[1] == {"selenium": True}
+    assert "censo-filtros" in resultados[0] and "censo-filtros" in resultados[2]
@@ -0,0 +1,15 @@
+"""
+Diário de execução (observatorio.diario): só células completas contam como
+concluídas na retomada.
+"""
+from observatorio.diario import DiarioExecucao
+
+
+def test_celula_parcial_nao_conta_como_concluida(tmp_path):
+    diario = DiarioExecucao(str(tmp_path))
+    diario.registrar(("2023", "5º ano"), {"aprendizado": [{"Valor": "41"}], "proficiencia": [{"Nível": "Básico"}]})
+    # Linha de um diário antigo, que gravava a célula mesmo com um trabalho vazio
+    diario.registrar(("2023", "9º ano"), {"aprendizado": [{"Valor": "30"}], "proficiencia": None})
+    diario.fechar()
+
+    assert list(DiarioExecucao(str(tmp_path)).concluidas()) == ['["2023", "5º ano"]']
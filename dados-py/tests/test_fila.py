@@ -0,0 +1,61 @@
+"""
+Fila de trabalho (observatorio.fila) sobre um SQLite temporário: arrendamento
+exclusivo, prazo vencido, dono errado e novas tentativas.
+"""
+import pytest
+
+from observatorio.fila import FilaTrabalho
+from observatorio.municipios import Municipio
+
+TRABALHOS = "censo-filtros+censo-matriculas"
+MERITI = Municipio(3305109, "São João de Meriti")
+CELULAS = [("Com Ensino Infantil Regular", "2024"), ("Com Ensino Infantil Regular", "2023")]
+RESULTADO = {"censo-filtros": {"escolas": {"Total Escolas": "48"}}, "censo-matriculas": [{"Matrículas": 3045}]}
+
+
+@pytest.fixture
+def fila(tmp_path):
+    fila = FilaTrabalho(str(tmp_path / "fila.sqlite"), max_tentativas=2)
+    fila.enfileirar(TRABALHOS, MERITI, CELULAS)
+    yield fila
+    fila.fechar()
+
+
+def test_arrendamento_e_exclusivo(fila):
+    lote = fila.arrendar("worker-a")
+
+    assert lote.trabalhos == TRABALHOS and lote.municipio == MERITI
+    assert [celula for _, celula in lote.tarefas] == CELULAS
+    assert fila.arrendar("worker-b") is None
+    assert fila.enfileirar(TRABALHOS, MERITI, CELULAS) == 0
+
+
+def test_prazo_vencido_volta_para_a_fila_e_dono_antigo_perde_a_tarefa(fila):
+    atrasado = fila.arrendar("worker-a", limite=1, prazo_por_celula=-1)
+    (id_tarefa, _), = atrasado.tarefas
+
+    novo = fila.arrendar("worker-b", limite=1)
+    assert novo.tarefas == atrasado.tarefas
+
+    # O worker atrasado não conclui nem devolve a tarefa que agora é de outro
+    assert not fila.concluir(id_tarefa, "worker-a", RESULTADO)
+    assert not fila.devolver(id_tarefa, "worker-a", "navegacao")
+    assert fila.concluir(id_tarefa, "worker-b", RESULTADO)
+    assert fila.concluidas(TRABALHOS) == {MERITI: [RESULTADO]}
+
+
+def test_devolucao_tenta_de_novo_ate_o_limite(fila):
+    (id_tarefa, _), = fila.arrendar("worker-a", limite=1).tarefas
+    assert fila.devolver(id_tarefa, "worker-a", "sem_dados")
+
+    # Mesma célula de novo (segunda e última tentativa)
+    (de_novo, _), = fila.arrendar("worker-b", limite=1).tarefas
+    assert de_novo == id_tarefa
+    assert fila.devolver(id_tarefa, "worker-b", "sem_dados")
+
+    por_estado, falhas = fila.situacao()
+    assert por_estado == {"falhou": 1, "pendente": 1}
+    assert falhas == [("sem_dados", 1)]
+
+    assert fila.reabrir() == 1
+    assert fila.situacao()[0] == {"pendente": 2}
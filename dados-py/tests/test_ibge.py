@@ -0,0 +1,111 @@
+"""
+Ingestão do SIDRA (observatorio.ibge) contra o servidor de replay local, sem
+tocar no IBGE: validadores no primeiro 200, 304 sem regravar o armazém na
+segunda consulta, e falhas (5xx, timeout) sem estragar a .cache_ibge.
+"""
+import json
+import os
+import socket
+
+import pytest
+
+from observatorio.armazem import Armazem
+from observatorio.conjuntos.ibge_sidra import CONJUNTO_SIDRA, SERIES
+from observatorio.ibge import ARQUIVO_VALIDADORES, atualizar_series, carregar_validadores
+from observatorio.servidor_replay import ServidorReplay, gravar_resposta
+
+NOME = "ideb_iniciais"
+URL = SERIES[NOME]
+RESPOSTA_SIDRA = [{
+    "id": "63",
+    "variavel": "IDEB - Anos iniciais do ensino fundamental",
+    "resultados": [{
+        "classificacoes": [],
+        "series": [{"localidade": {"id": "3305109"}, "serie": {"2019": "5.1", "2021": "4.9", "2023": "..."}}],
+    }],
+}]
+
+
+@pytest.fixture
+def pastas(tmp_path):
+    """ Gravações (200 e 500 para a mesma URL), armazém e cache de validadores """
+    gravar_resposta(tmp_path / "ok", URL, json.dumps(RESPOSTA_SIDRA), "application/json")
+    gravar_resposta(tmp_path / "erro", URL, "erro interno", "text/plain", status=500)
+    return {
+        "ok": str(tmp_path / "ok"),
+        "erro": str(tmp_path / "erro"),
+        "armazem": str(tmp_path / "armazem"),
+        "cache": str(tmp_path / "cache_ibge"),
+    }
+
+
+def atualizar(pastas, base_url, **opcoes):
+    return atualizar_series({NOME: URL}, Armazem(pastas["armazem"]), pastas["cache"], base_url=base_url, **opcoes)
+
+
+def retrato(pasta):
+    """ {arquivo: (tamanho, mtime)} de tudo na pasta """
+    return {
+        os.path.join(raiz, nome): (os.stat(os.path.join(raiz, nome)).st_size,
+                                   os.stat(os.path.join(raiz, nome)).st_mtime_ns)
+        for raiz, _, nomes in os.walk(pasta) for nome in nomes
+    }
+
+
+def test_primeira_consulta_grava_serie_e_validadores(pastas):
+    with ServidorReplay(pastas["ok"]) as base_url:
+        assert atualizar(pastas, base_url) == {NOME: "atualizada"}
+
+    validador = carregar_validadores(pastas["cache"])[URL]
+    assert validador["etag"] and validador["last_modified"] and validador["sha256"]
+
+    df = Armazem(pastas["armazem"]).ler(CONJUNTO_SIDRA)
+    assert sorted(df["Período"]) == ["2019", "2021", "2023"]
+    assert df.loc[df["Período"] == "2023", "Valor"].isna().all()
+
+
+def test_segunda_consulta_304_nao_regrava(pastas):
+    servidor = ServidorReplay(pastas["ok"])
+    with servidor as base_url:
+        atualizar(pastas, base_url)
+        antes_armazem, antes_cache = retrato(pastas["armazem"]), retrato(pastas["cache"])
+
+        assert atualizar(pastas, base_url) == {NOME: "sem mudança"}
+
+    assert [status for _, status in servidor.respostas] == [200, 304]
+    assert retrato(pastas["armazem"]) == antes_armazem
+    assert retrato(pastas["cache"]) == antes_cache
+
+
+@pytest.fixture
+def sem_resposta():
+    """ Origem que aceita a conexão e nunca responde (timeout de leitura) """
+    with socket.socket() as ouvinte:
+        ouvinte.bind(("127.0.0.1", 0))
+        ouvinte.listen()
+        host, porta = ouvinte.getsockname()
+        yield f"http://{host}:{porta}"
+
+
+@pytest.mark.parametrize("falha", ["5xx", "timeout"])
+def test_falha_mantem_cache_e_armazem(pastas, sem_resposta, falha):
+    with ServidorReplay(pastas["ok"]) as base_url:
+        atualizar(pastas, base_url)
+    validadores = os.path.join(pastas["cache"], ARQUIVO_VALIDADORES)
+    with open(validadores, "rb") as f:
+        antes_validadores = f.read()
+    antes_dados = Armazem(pastas["armazem"]).ler(CONJUNTO_SIDRA)
+
+    if falha == "5xx":
+        servidor = ServidorReplay(pastas["erro"])
+        with servidor as base_url:
+            situacao = atualizar(pastas, base_url)
+        assert {status for _, status in servidor.respostas} == {500}
+    else:
+        situacao = atualizar(pastas, sem_resposta, timeout=0.2)
+
+    assert situacao == {NOME: "falhou"}
+    with open(validadores, "rb") as f:
+        assert f.read() == antes_validadores
+    assert sorted(os.listdir(pastas["cache"])) == [ARQUIVO_VALIDADORES]
+    assert Armazem(pastas["armazem"]).ler(CONJUNTO_SIDRA).equals(antes_dados)
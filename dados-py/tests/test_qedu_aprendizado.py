@@ -0,0 +1,28 @@
+"""
+Tela de Aprendizado (observatorio.conjuntos.qedu_aprendizado): aprendizado e
+proficiência saem de uma única leitura dos indicadores por captura.
+"""
+import gzip
+import os
+
+from observatorio.conjuntos import qedu_aprendizado
+from observatorio.executor import extrair_celula_html
+
+PASTA_CORPUS = os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmark", "corpus")
+CELULA = ("2023", "5º ano", "Língua Portuguesa")
+
+
+def test_indicadores_lidos_uma_vez_por_captura(monkeypatch):
+    with gzip.open(os.path.join(PASTA_CORPUS, "qedu_aprendizado", "3bb7f38f8acef494.html.gz"), "rt",
+                   encoding="utf-8") as f:
+        html = f.read()
+    leituras = []
+    extrair = qedu_aprendizado.extrair_indicadores
+    monkeypatch.setattr(qedu_aprendizado, "extrair_indicadores",
+                        lambda captura, parser=None: leituras.append(parser) or extrair(captura, parser))
+
+    trabalhos = [qedu_aprendizado.APRENDIZADO, qedu_aprendizado.PROFICIENCIA]
+    resultado = extrair_celula_html(html, CELULA, trabalhos)
+
+    assert resultado["aprendizado"] and resultado["proficiencia"]
+    assert len(leituras) == 1
@@ -0,0 +1,40 @@
+"""
+Leitura dos cards de matrícula do Censo (observatorio.conjuntos.qedu_censo):
+falha ou tela sem valores não vira uma célula de zeros.
+"""
+import pytest
+
+from observatorio.conjuntos.qedu_censo import MAPA_DIVS, extrair_matriculas_navegador
+
+CELULA = ("Com Ensino Infantil Regular", "2024")
+
+
+class DriverCards:
+    """ Só o execute_script do JS_LER_CARDS: devolve `cards` ou levanta `erro` """
+
+    def __init__(self, cards=None, erro=None):
+        self.cards, self.erro = cards, erro
+
+    def execute_script(self, script, *argumentos):
+        if self.erro:
+            raise self.erro
+        return self.cards
+
+
+def _lidos(numeros):
+    return {nome: {"via": "rotulo", "rotulo": nome, "texto": None, "numeros": numeros.get(nome, [2024])}
+            for nome in MAPA_DIVS}
+
+
+@pytest.mark.parametrize("driver", [
+    DriverCards(erro=RuntimeError("página trocando")),
+    DriverCards(cards=_lidos({})),
+], ids=["script_falhou", "tudo_zero"])
+def test_sem_valores_devolve_none(driver):
+    assert extrair_matriculas_navegador(driver, "", CELULA) is None
+
+
+def test_cards_lidos_geram_seis_linhas():
+    linhas = extrair_matriculas_navegador(DriverCards(cards=_lidos({"Creche": [3120, 2024]})), "", CELULA)
+    assert {linha["Etapa"]: linha["Matrículas"] for linha in linhas}["Creche"] == 3120
+    assert len(linhas) == 6
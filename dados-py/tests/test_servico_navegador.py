@@ -0,0 +1,42 @@
+"""
+Arrendamento do serviço de navegadores (observatorio.servico_navegador):
+a renovação mantém a sessão da coleta viva, e só o arrendamento ocioso é
+recuperado. Sem Chrome: as sessões são marcadas à mão e o preparo é anotado.
+"""
+import time
+
+import pytest
+
+from observatorio.servico_navegador import ServicoNavegador
+
+
+@pytest.fixture
+def servico(monkeypatch):
+    servico = ServicoNavegador(["https://qedu.org.br/tela"], sessoes=2, validade=60)
+    servico.preparadas = []
+    monkeypatch.setattr(servico, "_preparar_em_segundo_plano",
+                        lambda sessao, reabrir: servico.preparadas.append(sessao.numero))
+    for sessao, arrendamento in zip(servico.sessoes, ["ativo", "ocioso"]):
+        sessao.estado, sessao.arrendamento = "arrendada", arrendamento
+        sessao.validade = time.time() + 60
+    return servico
+
+
+def test_so_o_arrendamento_ocioso_e_recuperado(servico):
+    # As duas passaram da validade original; só a coleta ativa renovou
+    for sessao in servico.sessoes:
+        sessao.validade = time.time() - 1
+    assert servico.renovar("ativo")
+
+    servico.verificar_saude()
+
+    assert [(s.estado, s.arrendamento) for s in servico.sessoes] == [("arrendada", "ativo"), ("reciclando", None)]
+    assert servico.preparadas == [2]
+
+
+def test_renovar_arrendamento_recuperado_falha(servico):
+    servico.sessoes[1].validade = time.time() - 1
+    servico.verificar_saude()
+
+    assert not servico.renovar("ocioso")
+    assert not servico.devolver("ocioso")
@@ -7,15 +7,9 @@ if (typeof ChartDataLabels !== 'undefined') {
     Chart.register(ChartDataLabels);
 }
 
-const SIDRA_URLS = {
-    ideb_iniciais: "https://servicodados.ibge.gov.br/api/v3/agregados/5938/periodos/2005|2007|2009|2011|2013|2015|2017|2019|2021|2023/variaveis/63?localidades=N6[3305109]",
-    ideb_finais: "https://servicodados.ibge.gov.br/api/v3/agregados/5938/periodos/2005%7C2007%7C2009%7C2011%7C2013%7C2015%7C2017%7C2019%7C2021%7C2023/variaveis/63?localidades=N6%5B3305109%5D&classificacao=12030%5B115175%5D",
-    matriculas: "https://servicodados.ibge.gov.br/api/v3/agregados/5930/periodos/2018|2019|2020|2021|2022/variaveis/1000096?localidades=N6[3305109]",
-    taxa_abandono: "https://servicodados.ibge.gov.br/api/v3/agregados/5935/periodos/2018|2019|2020|2021|2022/variaveis/64?localidades=N6[3305109]",
-    taxa_distorcao: "https://servicodados.ibge.gov.br/api/v3/agregados/5936/periodos/2018|2019|2020|2021|2022/variaveis/1000096?localidades=N6[3305109]",
-    mat_infantil: "https://servicodados.ibge.gov.br/api/v3/agregados/5929/periodos/2018|2019|2020|2021|2022/variaveis/1000096?localidades=N6[3305109]",
-    mat_fundamental: "https://servicodados.ibge.gov.br/api/v3/agregados/5930/periodos/2018|2019|2020|2021|2022/variaveis/1000096?localidades=N6[3305109]"
-};
+// Dados publicados por dados-py (python -m observatorio.publicacao): um JSON
+// por gráfico, com hash no nome; só o manifesto precisa ser revalidado
+const PASTA_PUBLICADO = './publicado/';
 
 const FALLBACK_DATA = {
     ideb_iniciais: { labels: ['05','07','09','11','13','15','17','19','21','23'], values: [3.7, 3.6, 4.0, 4.2, 4.5, 4.5, 4.6, 4.9, 4.6, 4.9] },
@@ -34,17 +28,29 @@ document.addEventListener('DOMContentLoaded', () => {
     initAllCharts();
 });
 
-async function fetchSidraData(url) {
+async function carregarDadosPublicados() {
+    const resManifesto = await fetch(PASTA_PUBLICADO + 'manifesto.json', { cache: 'no-cache' });
+    if (!resManifesto.ok) throw new Error("Manifesto indisponível");
+    const manifesto = await resManifesto.json();
+
+    // Arquivos imutáveis (nome muda com o conteúdo): cache do navegador vale sempre
+    const payloads = await Promise.all(Object.values(manifesto.graficos).map(async (entrada) => {
+        const res = await fetch(PASTA_PUBLICADO + entrada.arquivo, { cache: 'force-cache' });
+        if (!res.ok) throw new Error("Erro ao carregar " + entrada.arquivo);
+        return res.json();
+    }));
+    return Object.assign({}, ...payloads);
+}
+
+async function carregarDados() {
     try {
-        const response = await fetch(url);
-        if (!response.ok) throw new Error("Erro API");
-        const json = await response.json();
-        const resultados = json[0].resultados[0].series[0].serie;
-        return {
-            labels: Object.keys(resultados).map(ano => ano.slice(-2)),
-            values: Object.values(resultados).map(v => (v === "..." || v === "-") ? 0 : parseFloat(v))
-        };
-    } catch (e) { return null; }
+        return await carregarDadosPublicados();
+    } catch (e) {
+        // Publicação ainda não gerada: base local completa
+        const response = await fetch('./dados_educacao.json');
+        if (!response.ok) throw new Error("Erro ao carregar JSON");
+        return response.json();
+    }
 }
 
 /* --- MOTOR DE INICIALIZAÇÃO COM LOADER TECNOLÓGICO --- */
@@ -64,9 +70,7 @@ async function initAllCharts() {
     });
 
     try {
-        const response = await fetch('./dados_educacao.json');
-        if (!response.ok) throw new Error("Erro ao carregar JSON");
-        const bd = await response.json();
+        const bd = await carregarDados();
 
         // --- PARTE 1: ATUALIZAÇÃO DOS KPIS ---
         const kpiMap = {
@@ -291,83 +295,6 @@ function updateChartDynamic(chart, label, data, color) {
     chart.update();
 }
 
-/* --- INICIALIZAÇÕES --- */
-
-async function initIdebChart() {
-    const resInit = await fetchSidraData(SIDRA_URLS.ideb_iniciais);
-    const resEnd = await fetchSidraData(SIDRA_URLS.ideb_finais);
-    const dInit = resInit || FALLBACK_DATA.ideb_iniciais;
-    const dEnd = resEnd || FALLBACK_DATA.ideb_finais;
-
-    const chart = createChart('chartIdeb', 'bar', {
-        labels: dInit.labels,
-        datasets: [{ label: 'Nota', data: dInit.values, backgroundColor: COLORS.yellow, borderRadius: 4 }]
-    });
-
-    document.getElementById('filterIdebType')?.addEventListener('change', function() {
-        const isInit = this.value === 'iniciais';
-        updateChartDynamic(chart, isInit ? 'Anos Iniciais' : 'Anos Finais', isInit ? dInit : dEnd, isInit ? COLORS.blue : COLORS.blue);
-    });
-}
-
-async function initEvolucaoMatriculas() {
-    const apiMat = await fetchSidraData(SIDRA_URLS.matriculas);
-    const dMat = apiMat || FALLBACK_DATA.matriculas;
-    // Gráfico de linha terá a grade ajustada, mas sem números no topo
-    createChart('chartEvolucaoMatriculas', 'line', {
-        labels: dMat.labels,
-        datasets: [{ label: 'Matrículas', data: dMat.values, borderColor: COLORS.blue, fill: true, tension: 0.4 }]
-    });
-}
-
-async function initTaxasChart() {
-    const resDist = await fetchSidraData(SIDRA_URLS.taxa_distorcao);
-    const resAban = await fetchSidraData(SIDRA_URLS.taxa_abandono);
-    const dDist = resDist || FALLBACK_DATA.taxas_distorcao;
-    const dAban = resAban || FALLBACK_DATA.taxas_abandono;
-
-    const chart = createChart('chartTaxasRendimento', 'bar', {
-        labels: dDist.labels,
-        datasets: [{ label: 'Valor', data: dDist.values, backgroundColor: COLORS.green, borderRadius: 4 }]
-    });
-
-    document.getElementById('filterTaxasType')?.addEventListener('change', function() {
-        const isDist = this.value === 'distorcao';
-        const data = isDist ? dDist : dAban;
-        updateChartDynamic(chart, isDist ? 'Distorção (%)' : 'Abandono (%)', data, isDist ? COLORS.green : COLORS.pink);
-    });
-}
-
-async function initMatriculasNivelChart() {
-    const resInf = await fetchSidraData(SIDRA_URLS.mat_infantil);
-    const resFund = await fetchSidraData(SIDRA_URLS.mat_fundamental);
-    const dInf = resInf || FALLBACK_DATA.mat_infantil;
-    const dFund = resFund || FALLBACK_DATA.mat_fundamental;
-    const dTotal = { labels: dInf.labels, values: dInf.values.map((val, i) => val + (dFund.values[i] || 0)) };
-
-    const chart = createChart('chartMatriculas', 'bar', {
-        labels: dTotal.labels,
-        datasets: [{ label: 'Total', data: dTotal.values, backgroundColor: 'yellow', borderRadius: 4 }]
-    });
-
-    document.getElementById('filterMatriculasType')?.addEventListener('change', function() {
-        let targetData, label, color;
-        if (this.value === 'total') { targetData = dTotal; label = 'Total'; color = '#009039'; }
-        else if (this.value === 'infantil') { targetData = dInf; label = 'Infantil'; color = COLORS.blue; }
-        else { targetData = dFund; label = 'Fundamental'; color = COLORS.purple; }
-        updateChartDynamic(chart, label, targetData, color);
-    });
-}
-
-async function initDistribGeralNovo() {
-    const resInf = await fetchSidraData(SIDRA_URLS.mat_infantil);
-    const dInf = resInf || FALLBACK_DATA.mat_infantil;
-    createChart('chartDistribGeral', 'bar', {
-        labels: dInf.labels,
-        datasets: [{ label: 'Matrículas', data: dInf.values, backgroundColor: COLORS.green, borderRadius: 4 }]
-    });
-}
-
 window.addEventListener('themeChanged', (e) => {
     const isLight = e.detail.theme === 'light';
     const textColor = isLight ? '#000000' : '#FFFFFF';